@@ -0,0 +1,99 @@
+import argparse
+import tempfile
+import numpy                as np
+from   time                 import perf_counter
+from   models.ann_index     import (BruteForceIndex,
+                                    create_index,
+                                    hnswlib)
+from   models.segment_store import normalize_rows
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="ANN 인덱스 recall@k / 쿼리 지연 시간 벤치마크 (final_project 폴더에서 python -m benchmarks.ann_index)")
+
+    parser.add_argument("--sizes",     type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="세그먼트 개수 목록")
+    parser.add_argument("--dim",       type=int, default=1024,
+                        help="임베딩 차원 (UAE-Large = 1024)")
+    parser.add_argument("--queries",   type=int, default=200,
+                        help="쿼리 개수")
+    parser.add_argument("--top_k",     type=int, default=5)
+    parser.add_argument("--nprobe",    type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--ef",        type=int, nargs="+", default=[16, 64, 128])
+    parser.add_argument("--clusters",  type=int, default=2000,
+                        help="합성 데이터의 클러스터 개수")
+    parser.add_argument("--seed",      type=int, default=0)
+
+    return parser.parse_args()
+
+def make_dataset(n, dim, n_clusters, n_queries, rng):
+    centers    = normalize_rows(rng.standard_normal((n_clusters, dim), dtype = np.float32))
+    labels     = rng.integers(0, n_clusters, size = n)
+    embeddings = np.empty((n, dim), dtype = np.float32)
+
+    for start in range(0, n, 65536):
+        end                     = min(n, start + 65536)
+        noise                   = rng.standard_normal((end - start, dim), dtype = np.float32) * 0.05
+        embeddings[start : end] = normalize_rows(centers[labels[start : end]] + noise)
+
+    query_ids = rng.choice(n, size = n_queries, replace = False)
+    queries   = normalize_rows(embeddings[query_ids] + rng.standard_normal((n_queries, dim), dtype = np.float32) * 0.05)
+    return embeddings, queries
+
+def run_queries(index, queries, top_k, **search_params):
+    results   = []
+    latencies = []
+
+    for query in queries:
+        start      = perf_counter()
+        indices, _ = index.search(query, top_k, **search_params)
+        latencies.append((perf_counter() - start) * 1000)
+        results.append(indices)
+
+    return results, np.array(latencies)
+
+def recall_at_k(results, ground_truth, top_k):
+    hits = [len(set(r[:top_k].tolist()) & set(g[:top_k].tolist())) for r, g in zip(results, ground_truth)]
+    return float(np.mean(hits)) / top_k
+
+def report(name, n, recall, latencies, build_time = None):
+    build = f"{build_time:8.2f}s" if build_time is not None else "       -"
+    print(f"{n:>9} | {name:<18} | build {build} | recall@k {recall:.3f} | "
+          f"p50 {np.percentile(latencies, 50):8.3f}ms | p95 {np.percentile(latencies, 95):8.3f}ms")
+
+def main():
+    args = parse_args()
+    rng  = np.random.default_rng(args.seed)
+
+    for n in args.sizes:
+        embeddings, queries = make_dataset(n, args.dim, min(args.clusters, n), args.queries, rng)
+
+        brute               = BruteForceIndex().build(embeddings)
+        ground_truth, lat   = run_queries(brute, queries, args.top_k)
+        report("brute", n, 1.0, lat)
+
+        start               = perf_counter()
+        ivf                 = create_index("ivf").build(embeddings)
+        build_time          = perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as index_dir:
+            ivf.save(index_dir)
+            ivf = create_index("ivf").attach(embeddings).load(index_dir)
+
+            for nprobe in args.nprobe:
+                results, lat = run_queries(ivf, queries, args.top_k, nprobe = nprobe)
+                report(f"ivf nprobe={nprobe}", n, recall_at_k(results, ground_truth, args.top_k), lat, build_time)
+
+        if hnswlib is None:
+            print(f"{n:>9} | hnsw               | hnswlib 미설치로 건너뜀")
+            continue
+
+        start               = perf_counter()
+        hnsw                = create_index("hnsw").build(embeddings)
+        build_time          = perf_counter() - start
+
+        for ef in args.ef:
+            results, lat = run_queries(hnsw, queries, args.top_k, ef = ef)
+            report(f"hnsw ef={ef}", n, recall_at_k(results, ground_truth, args.top_k), lat, build_time)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import glob
+import json
+import random
+import argparse
+from   time                 import perf_counter
+from   angle_emb            import AnglE, Prompts
+from   models.add_embedding import encode_sentences
+
+WORDS = ("man woman walks runs looks table door car street room light dark window holds smiles "
+         "talks slowly quickly behind front wearing jacket shirt hair camera scene outside inside").split()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="캡션 인코딩 처리량 벤치마크 (CPU, final_project 폴더에서 python -m benchmarks.caption_encoding)")
+
+    parser.add_argument("--model_name",  type=str, default="WhereIsAI/UAE-Large-V1")
+    parser.add_argument("--json_folder", type=str, default=None,
+                        help="실제 캡션 JSON 폴더 (없으면 합성 문장 사용)")
+    parser.add_argument("--num",         type=int, default=256,
+                        help="인코딩할 문장 개수")
+    parser.add_argument("--batch_sizes", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--seed",        type=int, default=0)
+
+    return parser.parse_args()
+
+def load_sentences(json_folder, num, rng):
+    if json_folder:
+        sentences = []
+        for json_file in sorted(glob.glob(os.path.join(json_folder, "*.json"))):
+            with open(json_file, "r", encoding="utf-8") as f:
+                for content in json.load(f).values():
+                    sentences.extend(content.get("sentences", []))
+        return sentences[:num]
+
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 300))) for _ in range(num)]
+
+def main():
+    args      = parse_args()
+    rng       = random.Random(args.seed)
+    sentences = load_sentences(args.json_folder, args.num, rng)
+    angle     = AnglE.from_pretrained(args.model_name, pooling_strategy="cls")
+
+    angle.encode([{'text': sentences[0]}], to_numpy=True, prompt=Prompts.C)
+
+    start = perf_counter()
+    for sentence in sentences:
+        angle.encode({'text': sentence}, to_numpy=True, prompt=Prompts.C)
+    elapsed = perf_counter() - start
+    print(f"per-sentence         : {len(sentences) / elapsed:8.2f} sentences/sec ({elapsed:.2f}s)")
+
+    for batch_size in args.batch_sizes:
+        start   = perf_counter()
+        encode_sentences(angle, sentences, batch_size)
+        elapsed = perf_counter() - start
+        print(f"batched (bs={batch_size:>3})    : {len(sentences) / elapsed:8.2f} sentences/sec ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import argparse
+import tempfile
+import numpy                as np
+from   time                 import perf_counter
+from   models.ann_index     import (exact_rerank,
+                                    top_k_order)
+from   models.quantization  import (CODEC_TYPES,
+                                    open_codec)
+from   models.segment_store import (SegmentStore,
+                                    ShardedSegmentStore,
+                                    normalize_rows,
+                                    open_store)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="압축 인코딩별 메모리 / 로드 시간 / recall@k 리포트 (final_project 폴더에서 python -m benchmarks.embedding_compression)")
+
+    parser.add_argument("--store",         type=str, default=None,
+                        help="실제 스토어 폴더 혹은 NPZ 경로 (없으면 합성 데이터 사용)")
+    parser.add_argument("--num",           type=int, default=50000,
+                        help="합성 세그먼트 개수")
+    parser.add_argument("--dim",           type=int, default=1024)
+    parser.add_argument("--queries",       type=int, default=200)
+    parser.add_argument("--top_k",         type=int, default=5)
+    parser.add_argument("--rerank_factor", type=int, default=4)
+    parser.add_argument("--seed",          type=int, default=0)
+
+    return parser.parse_args()
+
+def load_embeddings(args, rng):
+    if args.store:
+        store = open_store(args.store)
+
+        if isinstance(store, ShardedSegmentStore):
+            store = SegmentStore.concat(store.shards)
+
+        return np.ascontiguousarray(store.embeddings, dtype = np.float32)
+
+    centers = normalize_rows(rng.standard_normal((max(1, args.num // 20), args.dim), dtype = np.float32))
+    labels  = rng.integers(0, centers.shape[0], size = args.num)
+    return normalize_rows(centers[labels] + rng.standard_normal((args.num, args.dim), dtype = np.float32) * 0.05)
+
+def recall(results, ground_truth, top_k):
+    return float(np.mean([len(set(r[:top_k].tolist()) & set(g[:top_k].tolist())) for r, g in zip(results, ground_truth)])) / top_k
+
+def main():
+    args       = parse_args()
+    rng        = np.random.default_rng(args.seed)
+    embeddings = load_embeddings(args, rng)
+    query_ids  = rng.choice(embeddings.shape[0], size = min(args.queries, embeddings.shape[0]), replace = False)
+    queries    = normalize_rows(embeddings[query_ids] + rng.standard_normal((len(query_ids), embeddings.shape[1]), dtype = np.float32) * 0.05)
+
+    ground_truth = [top_k_order(embeddings @ q, args.top_k) for q in queries]
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        raw_path = os.path.join(store_dir, "embeddings.npy")
+        np.save(raw_path, embeddings)
+
+        start     = perf_counter()
+        np.load(raw_path)
+        load_time = perf_counter() - start
+
+        print(f"{'encoding':<8} | {'memory':>10} | {'load':>8} | {'recall@k':>8} | {'recall@k+rerank':>15} | {'p50 query':>10}")
+        print(f"{'float32':<8} | {embeddings.nbytes / 2**20:8.1f}MB | {load_time * 1000:6.1f}ms | {1.0:8.3f} | {1.0:15.3f} | {'-':>10}")
+
+        for encoding in CODEC_TYPES:
+            open_codec(store_dir, embeddings, encoding)
+
+            start     = perf_counter()
+            codec     = open_codec(store_dir, embeddings, encoding)
+            load_time = perf_counter() - start
+
+            plain     = []
+            reranked  = []
+            latencies = []
+
+            for q in queries:
+                start  = perf_counter()
+                scores = codec.scores(q)
+                plain.append(top_k_order(scores, args.top_k))
+                reranked.append(exact_rerank(embeddings, q, top_k_order(scores, args.top_k * args.rerank_factor), args.top_k)[0])
+                latencies.append((perf_counter() - start) * 1000)
+
+            print(f"{encoding:<8} | {codec.nbytes() / 2**20:8.1f}MB | {load_time * 1000:6.1f}ms | "
+                  f"{recall(plain, ground_truth, args.top_k):8.3f} | {recall(reranked, ground_truth, args.top_k):15.3f} | "
+                  f"{np.percentile(latencies, 50):8.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import os
+import cv2
+import random
+import argparse
+import tempfile
+import numpy                   as np
+from   time                    import perf_counter
+from   models.frame_sampler    import (FrameSampler,
+                                       VideoReader)
+from   models.interval_planner import plan_sample_times
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="구간 프레임 샘플링 속도 비교: seek 루프 vs 순차 샘플러 (final_project 폴더에서 python -m benchmarks.frame_sampling)")
+
+    parser.add_argument("--videos",            type=str, nargs="*", default=None,
+                        help="실제 영상 경로 목록 (없으면 합성 영상 생성)")
+    parser.add_argument("--num_videos",        type=int, default=3)
+    parser.add_argument("--duration",          type=int, default=60,
+                        help="합성 영상 길이 (초)")
+    parser.add_argument("--fps",               type=int, default=30)
+    parser.add_argument("--width",             type=int, default=640)
+    parser.add_argument("--height",            type=int, default=360)
+    parser.add_argument("--intervals",         type=int, default=5,
+                        help="영상당 top-k 구간 개수")
+    parser.add_argument("--interval_length",   type=int, default=10000,
+                        help="구간 길이 (ms)")
+    parser.add_argument("--sampling_interval", type=int, default=500)
+    parser.add_argument("--seed",              type=int, default=0)
+
+    return parser.parse_args()
+
+def make_video(path, duration, fps, width, height, rng):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    base   = rng.integers(0, 255, size = (height // 8, width // 8, 3), dtype = np.uint8)
+
+    for i in range(duration * fps):
+        frame = cv2.resize(np.roll(base, i, axis = 1), (width, height), interpolation = cv2.INTER_NEAREST)
+        cv2.putText(frame, str(i), (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        writer.write(frame)
+
+    writer.release()
+    return path
+
+def seek_loop(video_file, sample_times):
+    cap    = cv2.VideoCapture(video_file)
+    frames = []
+
+    for t in sample_times:
+        cap.set(cv2.CAP_PROP_POS_MSEC, t)
+        ret, frame = cap.read()
+
+        if ret:
+            frames.append(frame)
+
+    cap.release()
+    return frames
+
+def sampler_loop(video_file, sample_times, backend):
+    sampler = FrameSampler(video_file, backend)
+    sampler.open()
+    frames  = [frame for _, frame in sampler.sample(sample_times)]
+    sampler.close()
+    return frames
+
+def main():
+    args     = parse_args()
+    rng      = np.random.default_rng(args.seed)
+    rand     = random.Random(args.seed)
+    backends = ["opencv"] + (["decord"] if VideoReader is not None else [])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        videos = args.videos or [make_video(os.path.join(tmp_dir, f"clip_{i}.mp4"), args.duration, args.fps, args.width, args.height, rng)
+                                 for i in range(args.num_videos)]
+        totals = {name: [0, 0.0] for name in ["seek"] + backends}
+
+        for video_file in videos:
+            cap         = cv2.VideoCapture(video_file)
+            duration_ms = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) / (cap.get(cv2.CAP_PROP_FPS) or 30.0) * 1000)
+            cap.release()
+
+            starts       = [rand.randint(0, max(0, duration_ms - args.interval_length)) for _ in range(args.intervals)]
+            sample_times = plan_sample_times([(start, start + args.interval_length) for start in starts], args.sampling_interval)
+
+            start      = perf_counter()
+            reference  = seek_loop(video_file, sample_times)
+            totals["seek"][0] += len(reference)
+            totals["seek"][1] += perf_counter() - start
+
+            for backend in backends:
+                start  = perf_counter()
+                frames = sampler_loop(video_file, sample_times, backend)
+                totals[backend][0] += len(frames)
+                totals[backend][1] += perf_counter() - start
+
+                diff = np.mean([np.abs(a.astype(np.int16) - b.astype(np.int16)).mean() for a, b in zip(reference, frames)]) if frames else float("nan")
+                print(f"{os.path.basename(video_file)} | {backend:<6} | 프레임 {len(frames)}/{len(reference)} | seek 대비 평균 픽셀 차이 {diff:.2f}")
+
+        print(f"{'method':<8} | {'frames':>7} | {'time':>8} | {'frames/sec':>10} | {'speedup':>7}")
+
+        for name, (count, elapsed) in totals.items():
+            print(f"{name:<8} | {count:>7} | {elapsed:7.2f}s | {count / max(elapsed, 1e-9):10.1f} | "
+                  f"{totals['seek'][1] / max(elapsed, 1e-9):6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import cv2
+import random
+import argparse
+import tempfile
+import numpy                     as np
+from   time                      import perf_counter
+from   benchmarks.frame_sampling import (make_video,
+                                         sampler_loop)
+from   models.clip_similarity    import (KEYFRAME_WINDOW,
+                                         MAX_KEYFRAME_GAP,
+                                         ClipVideoProcessor)
+from   models.frame_sampler      import sample_keyframes
+from   models.interval_planner   import plan_sample_times
+from   models.video_catalog      import VIDEO_EXTENSIONS
+
+MOVIECLIP_DIR = "/data/ephemeral/home/videos_movieclips"
+TEXTS         = ["a man walking down the street", "two people talking at a table", "a car driving at night", "a close-up of a smiling woman"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="키프레임 탐색 모드 비교: exhaustive vs keyframe (final_project 폴더에서 python -m benchmarks.keyframe_search)")
+
+    parser.add_argument("--video_dir",         type=str, default=MOVIECLIP_DIR,
+                        help="movieclip 영상 폴더 (없으면 합성 영상 생성)")
+    parser.add_argument("--num_videos",        type=int, default=3)
+    parser.add_argument("--duration",          type=int, default=120,
+                        help="합성 영상 길이 (초)")
+    parser.add_argument("--texts",             type=str, nargs="+", default=TEXTS)
+    parser.add_argument("--interval_lengths",  type=int, nargs="+", default=[5000, 15000, 30000, 60000],
+                        help="구간 길이 목록 (ms)")
+    parser.add_argument("--sampling_interval", type=int, default=500)
+    parser.add_argument("--max_keyframe_gap",  type=int, default=MAX_KEYFRAME_GAP)
+    parser.add_argument("--keyframe_window",   type=int, default=KEYFRAME_WINDOW,
+                        help="최적 키프레임 주변 전체 디코딩 범위 (ms, 0이면 생략)")
+    parser.add_argument("--decode_only",       action="store_true",
+                        help="CLIP 없이 디코딩 속도만 비교합니다.")
+    parser.add_argument("--seed",              type=int, default=0)
+
+    return parser.parse_args()
+
+def run(processor, video_file, targets, sampling_interval):
+    start   = perf_counter()
+    results = processor.find_best_frames_in_video(video_file, targets, sampling_interval)
+    return results, processor.last_decoded_frames, perf_counter() - start
+
+def decode_only(video_file, intervals, sampling_interval):
+    start     = perf_counter()
+    uniform   = sampler_loop(video_file, plan_sample_times(intervals, sampling_interval), "auto")
+    mid       = perf_counter()
+    keyframes = list(sample_keyframes(video_file, intervals))
+    return len(uniform), mid - start, len(keyframes), perf_counter() - mid
+
+def main():
+    args = parse_args()
+    rng  = np.random.default_rng(args.seed)
+    rand = random.Random(args.seed)
+
+    if not args.decode_only:
+        exhaustive = ClipVideoProcessor(search_mode = "exhaustive")
+        keyframe   = ClipVideoProcessor(search_mode      = "keyframe",
+                                        max_keyframe_gap = args.max_keyframe_gap,
+                                        keyframe_window  = args.keyframe_window)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if os.path.isdir(args.video_dir):
+            videos = [os.path.join(args.video_dir, name) for name in sorted(os.listdir(args.video_dir))
+                      if name.lower().endswith(VIDEO_EXTENSIONS)][: args.num_videos]
+        else:
+            videos = [make_video(os.path.join(tmp_dir, f"clip_{i}.mp4"), args.duration, 30, 640, 360, rng)
+                      for i in range(args.num_videos)]
+
+        if args.decode_only:
+            print(f"{'video':<16} | {'length':>7} | {'frames (uni/kf)':>15} | {'time (uni/kf)':>17} | {'speedup':>7}")
+        else:
+            print(f"{'video':<16} | {'length':>7} | {'frames (ex/kf)':>14} | {'time (ex/kf)':>15} | {'same':>4} | {'|dt|':>7} | {'sim gap':>8}")
+
+        for video_file in videos:
+            cap         = cv2.VideoCapture(video_file)
+            duration_ms = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) / (cap.get(cv2.CAP_PROP_FPS) or 30.0) * 1000)
+            cap.release()
+
+            for length in args.interval_lengths:
+                start   = float(rand.randint(0, max(0, duration_ms - length)))
+                targets = [(start, start + length, text) for text in args.texts]
+
+                if args.decode_only:
+                    uni_frames, uni_time, kf_frames, kf_time = decode_only(video_file, [(start, start + length)], args.sampling_interval)
+                    print(f"{os.path.basename(video_file)[:16]:<16} | {length / 1000:6.0f}s | {uni_frames:>7} / {kf_frames:<5} | "
+                          f"{uni_time:6.2f}s / {kf_time:6.2f}s | {uni_time / max(kf_time, 1e-9):6.2f}x")
+                    continue
+
+                ex_results, ex_frames, ex_time = run(exhaustive, video_file, targets, args.sampling_interval)
+                kf_results, kf_frames, kf_time = run(keyframe,   video_file, targets, args.sampling_interval)
+
+                pairs = [(ex, kf) for ex, kf in zip(ex_results, kf_results) if ex[1] is not None and kf[1] is not None]
+                same  = sum(ex[1] == kf[1] for ex, kf in pairs)
+                dt    = np.mean([abs(ex[1] - kf[1]) for ex, kf in pairs]) if pairs else float("nan")
+                gap   = np.mean([ex[2] - kf[2] for ex, kf in pairs]) if pairs else float("nan")
+
+                print(f"{os.path.basename(video_file)[:16]:<16} | {length / 1000:6.0f}s | {ex_frames:>6} / {kf_frames:<6} | "
+                      f"{ex_time:6.2f}s / {kf_time:6.2f}s | {same}/{len(pairs)} | {dt:6.0f}ms | {gap:8.4f}")
+
+if __name__ == "__main__":
+    main()
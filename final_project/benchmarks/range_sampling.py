@@ -0,0 +1,205 @@
+import os
+import cv2
+import torch
+import argparse
+import tempfile
+import numpy                              as np
+import torchvision.transforms             as T
+from   PIL                                import Image
+from   time                               import perf_counter
+from   decord                             import (VideoReader,
+                                                  cpu)
+from   torchvision.transforms.functional  import InterpolationMode
+from   benchmarks.frame_sampling          import make_video
+from   models.range_sampler               import (IMAGENET_MEAN,
+                                                  IMAGENET_STD,
+                                                  RangeSampler,
+                                                  default_device)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="구간 프레임 로더 비교: 기존 AnalyzeVideo/Pseudo_labeling 로더(decord + PIL + torchvision) vs RangeSampler (final_project 폴더에서 python -m benchmarks.range_sampling)")
+
+    parser.add_argument("--videos",             type=str, nargs="*", default=None,
+                        help="실제 영상 경로 목록 (없으면 합성 영상 생성)")
+    parser.add_argument("--num_videos",         type=int, default=3)
+    parser.add_argument("--duration",           type=int, default=60,
+                        help="합성 영상 길이 (초)")
+    parser.add_argument("--num_seg",            type=int, default=32,
+                        help="영상 전체 균등 샘플링 프레임 수 (load_video)")
+    parser.add_argument("--segments",           type=int, default=13)
+    parser.add_argument("--frames_per_segment", type=int, default=3)
+    parser.add_argument("--scene_length",       type=float, default=4.0,
+                        help="장면 길이 (초, load_frames)")
+    parser.add_argument("--num_segments",       type=int, default=8,
+                        help="장면당 샘플링 프레임 수 (load_frames)")
+    parser.add_argument("--input_size",         type=int, default=448)
+    parser.add_argument("--device",             type=str, default=None)
+    parser.add_argument("--seed",               type=int, default=0)
+
+    return parser.parse_args()
+
+def build_transform(input_size):
+    return T.Compose([
+           T.Resize((input_size, input_size),
+                     interpolation = T.InterpolationMode.BICUBIC),
+           T.ToTensor(),
+           T.Normalize(mean = IMAGENET_MEAN,
+                       std  = IMAGENET_STD)
+           ])
+
+def get_index(num_seg, bound = None, fps = 64, max_frame = 0, first_idx = 0):
+    start, end = bound if bound else (-100000, 100000)
+
+    start_idx  = max(first_idx, round(start * fps))
+    end_idx    = min(round(end * fps), max_frame)
+    seg_size   = (end_idx - start_idx) / num_seg
+
+    return np.linspace(start_idx + (seg_size / 2),
+                       end_idx - (seg_size / 2),
+                       num_seg,
+                       dtype = int)
+
+def legacy_load_video(video_file, args):
+    vr            = VideoReader(video_file, ctx = cpu(0), num_threads = 1)
+    max_frame     = len(vr) - 1
+    fps           = float(vr.get_avg_fps())
+
+    transform     = build_transform(args.input_size)
+    frame_indices = get_index(args.num_seg, fps = fps, max_frame = max_frame)
+    frames        = vr.get_batch(frame_indices).asnumpy()
+
+    return torch.stack([transform(Image.fromarray(frame_np)) for frame_np in frames])
+
+def legacy_load_video_gpu(video_file, args):
+    vr            = VideoReader(video_file, ctx = cpu(0), num_threads = 1)
+    max_frame     = len(vr) - 1
+    seg_size      = max_frame / args.num_seg
+    frame_indices = np.linspace(seg_size / 2, max_frame - seg_size / 2, args.num_seg, dtype = int)
+    frames_np     = vr.get_batch(frame_indices).asnumpy()
+
+    frames        = torch.from_numpy(frames_np).to(torch.bfloat16).div(255.0)
+    frames        = frames.permute(0, 3, 1, 2).to(args.device)
+    frames        = torch.nn.functional.interpolate(frames, size = (args.input_size, args.input_size), mode = "bicubic", align_corners = False)
+    mean          = torch.tensor(IMAGENET_MEAN, device = frames.device).view(1, 3, 1, 1)
+    std           = torch.tensor(IMAGENET_STD, device = frames.device).view(1, 3, 1, 1)
+    return (frames - mean) / std
+
+def segment_bounds(video_file, args):
+    cap          = cv2.VideoCapture(video_file)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps          = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+
+    return [(int(total_frames * i / args.segments), int(total_frames * (i + 1) / args.segments)) for i in range(args.segments)], fps
+
+def legacy_extract_segments(video_file, args):
+    cap       = cv2.VideoCapture(video_file)
+    bounds, _ = segment_bounds(video_file, args)
+    transform = build_transform(args.input_size)
+    segments  = []
+
+    for seg_start, seg_end in bounds:
+        frames = []
+
+        for idx in np.linspace(seg_start, seg_end - 1, args.frames_per_segment, dtype = int):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+            ret, frame = cap.read()
+
+            if ret:
+                frames.append(transform(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))))
+
+        segments.append(torch.stack(frames))
+
+    cap.release()
+    return segments
+
+def scene_ranges(video_file, args):
+    cap      = cv2.VideoCapture(video_file)
+    duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / (cap.get(cv2.CAP_PROP_FPS) or 30.0)
+    cap.release()
+
+    starts   = np.arange(0.0, duration - args.scene_length / 2, args.scene_length)
+    return [(start, min(start + args.scene_length, duration), args.num_segments) for start in starts]
+
+def scene_transform(input_size):
+    return T.Compose([
+        T.Lambda(lambda img: img.convert('RGB') if img.mode != 'RGB' else img),
+        T.Resize((input_size, input_size), interpolation = InterpolationMode.BICUBIC),
+        T.ToTensor(),
+        T.Normalize(mean = IMAGENET_MEAN, std = IMAGENET_STD),
+        T.ConvertImageDtype(torch.bfloat16)
+    ])
+
+def scene_index(start_sec, end_sec, fps, num_segments = 8):
+    start_frame = int(start_sec * fps)
+    end_frame   = int(end_sec * fps)
+    seg_size    = float(end_frame - start_frame) / num_segments
+    return [int(start_frame + (seg_size / 2) + round(seg_size * idx)) for idx in range(num_segments)]
+
+def legacy_load_frames(video_file, args):
+    vr        = VideoReader(video_file, ctx = cpu(0), num_threads = 1)
+    fps       = float(vr.get_avg_fps())
+    transform = scene_transform(args.input_size)
+    scenes    = []
+
+    for start_sec, end_sec, num_segments in scene_ranges(video_file, args):
+        vr     = VideoReader(video_file, ctx = cpu(0), num_threads = 1)
+        frames = [transform(Image.fromarray(vr[idx].asnumpy()))
+                  for idx in scene_index(start_sec, end_sec, fps, num_segments) if 0 <= idx < len(vr)]
+        scenes.append(torch.stack(frames))
+
+    return scenes
+
+def engine_load_video(sampler, video_file, args):
+    return sampler.sample(video_file, [(0, None, args.num_seg)])[0]
+
+def engine_extract_segments(sampler, video_file, args):
+    bounds, fps = segment_bounds(video_file, args)
+    return sampler.sample(video_file, [(seg_start / fps, seg_end / fps, args.frames_per_segment) for seg_start, seg_end in bounds], mode = "span")[0]
+
+def engine_load_frames(sampler, video_file, args):
+    return sampler.sample(video_file, scene_ranges(video_file, args), mode = "stride")[0]
+
+def timed(fn, videos):
+    start = perf_counter()
+    out   = [fn(video_file) for video_file in videos]
+
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+
+    return out, perf_counter() - start
+
+def mean_abs_diff(legacy, engine):
+    legacy = torch.cat([t.reshape(-1).float().cpu() for t in legacy]) if isinstance(legacy, list) else legacy.reshape(-1).float().cpu()
+    engine = torch.cat([t.reshape(-1).float().cpu() for t in engine]) if isinstance(engine, list) else engine.reshape(-1).float().cpu()
+    return float((legacy - engine).abs().mean()) if legacy.shape == engine.shape else float("nan")
+
+def main():
+    args        = parse_args()
+    args.device = args.device or default_device()
+    rng         = np.random.default_rng(args.seed)
+    float_eng   = RangeSampler(input_size = args.input_size, device = args.device)
+    bf16_eng    = RangeSampler(input_size = args.input_size, device = args.device, dtype = torch.bfloat16)
+    loaders     = [
+                   ("load_video",       lambda v: legacy_load_video(v, args),       lambda v: engine_load_video(float_eng, v, args)),
+                   ("load_video_gpu",   lambda v: legacy_load_video_gpu(v, args),   lambda v: engine_load_video(bf16_eng, v, args)),
+                   ("extract_segments", lambda v: legacy_extract_segments(v, args), lambda v: engine_extract_segments(float_eng, v, args)),
+                   ("load_frames",      lambda v: legacy_load_frames(v, args),      lambda v: engine_load_frames(bf16_eng, v, args)),
+                  ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        videos = args.videos or [make_video(os.path.join(tmp_dir, f"clip_{i}.mp4"), args.duration, 30, 640, 360, rng)
+                                 for i in range(args.num_videos)]
+
+        print(f"영상 {len(videos)}개, device={args.device}")
+        print(f"{'loader':<16} | {'legacy':>8} | {'engine':>8} | {'speedup':>7} | {'mean |diff|':>11}")
+
+        for name, legacy_fn, engine_fn in loaders:
+            legacy, legacy_time = timed(legacy_fn, videos)
+            engine, engine_time = timed(engine_fn, videos)
+            diff                = np.mean([mean_abs_diff(a, b) for a, b in zip(legacy, engine)])
+
+            print(f"{name:<16} | {legacy_time:7.2f}s | {engine_time:7.2f}s | {legacy_time / max(engine_time, 1e-9):6.2f}x | {diff:11.4f}")
+
+if __name__ == "__main__":
+    main()
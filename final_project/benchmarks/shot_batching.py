@@ -0,0 +1,83 @@
+import argparse
+import torch
+import numpy                 as np
+from   models.shot_batcher   import (TOKENS_PER_FRAME,
+                                     ShotBatcher)
+from   models.shot_detector  import ShotDetector
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="batch_chat 배치 구성 비교: 영상별 배치 vs 영상 간 동적 배치 (final_project 폴더에서 python -m benchmarks.shot_batching)")
+
+    parser.add_argument("--videos",          type=str, nargs="*", default=None,
+                        help="실제 영상 경로 목록 (없으면 짧은 클립의 샷 수를 무작위 생성)")
+    parser.add_argument("--num_videos",      type=int, default=20)
+    parser.add_argument("--shots",           type=int, nargs=2, default=[1, 15],
+                        help="합성 영상당 샷 수 범위")
+    parser.add_argument("--frames_per_shot", type=int, nargs=2, default=[3, 3],
+                        help="샷당 프레임 수 범위")
+    parser.add_argument("--batch_size",      type=int, default=11)
+    parser.add_argument("--max_tokens",      type=int, default=None,
+                        help="배치당 시각 토큰 예산 (기본: batch_size x 평균 프레임 수 x 프레임당 토큰)")
+    parser.add_argument("--batch_overhead",  type=float, default=1.0,
+                        help="batch_chat 1회 고정 비용 (초, 디코딩 스텝 지배)")
+    parser.add_argument("--token_cost",      type=float, default=2e-5,
+                        help="시각 토큰당 추가 비용 (초)")
+    parser.add_argument("--seed",            type=int, default=0)
+
+    return parser.parse_args()
+
+def video_shots(args, rng):
+    if args.videos:
+        counts = [len(ShotDetector().detect(video_file, keep_frames = False)[0]) - 1 for video_file in args.videos]
+    else:
+        counts = rng.integers(args.shots[0], args.shots[1] + 1, size = args.num_videos)
+
+    return [[int(rng.integers(args.frames_per_shot[0], args.frames_per_shot[1] + 1)) for _ in range(count)] for count in counts]
+
+def simulate(videos, pooled, args):
+    cost = [0.0]
+
+    def run_batch(frames):
+        cost[0] += args.batch_overhead + args.token_cost * sum(f.size(0) for f in frames) * TOKENS_PER_FRAME
+        return [None] * len(frames)
+
+    batchers = [ShotBatcher(run_batch, args.batch_size, args.max_tokens)]
+
+    for video_idx, frame_counts in enumerate(videos):
+        if not pooled:
+            batchers.append(ShotBatcher(run_batch, args.batch_size, args.max_tokens))
+
+        for shot_idx, num_frames in enumerate(frame_counts):
+            batchers[-1].add((video_idx, shot_idx), torch.empty(num_frames, 0))
+
+        if not pooled:
+            batchers[-1].flush()
+
+    batchers[-1].flush()
+
+    num_batches = sum(batcher.num_batches for batcher in batchers)
+    num_shots   = sum(batcher.num_shots for batcher in batchers)
+    return num_batches, num_shots / max(1, num_batches), cost[0]
+
+def main():
+    args    = parse_args()
+    rng     = np.random.default_rng(args.seed)
+    videos  = video_shots(args, rng)
+    frames  = [num_frames for frame_counts in videos for num_frames in frame_counts]
+
+    if args.max_tokens is None:
+        args.max_tokens = int(args.batch_size * np.mean(frames or [1]) * TOKENS_PER_FRAME)
+
+    print(f"영상 {len(videos)}개, 샷 {len(frames)}개, batch_size {args.batch_size}, 토큰 예산 {args.max_tokens}")
+    print(f"{'schedule':<10} | {'batches':>7} | {'mean size':>9} | {'fill':>6} | {'est. time':>9}")
+
+    baseline = None
+
+    for name, pooled in (("per-video", False), ("pooled", True)):
+        num_batches, mean_size, cost = simulate(videos, pooled, args)
+        baseline                     = baseline or cost
+
+        print(f"{name:<10} | {num_batches:>7} | {mean_size:9.2f} | {mean_size / args.batch_size:6.1%} | {cost:8.1f}s ({baseline / max(cost, 1e-9):.2f}x)")
+
+if __name__ == "__main__":
+    main()
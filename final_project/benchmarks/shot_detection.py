@@ -0,0 +1,122 @@
+import os
+import cv2
+import shutil
+import argparse
+import resource
+import tempfile
+import numpy                 as np
+from   time                  import perf_counter
+from   models.decode_pool    import shot_frame_indices
+from   models.frame_sampler  import FrameSampler
+from   models.shot_detector  import (SCENE_METRICS,
+                                     ShotDetector,
+                                     ffmpeg_shot_boundaries)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="쇼트 검출 + 프레임 샘플링 비교: ffmpeg 3회 디코딩 vs NumPy 단일 패스 (final_project 폴더에서 python -m benchmarks.shot_detection)")
+
+    parser.add_argument("--videos",      type=str, nargs="*", default=None,
+                        help="실제 영상 경로 목록 (없으면 컷이 있는 합성 영상 생성, 정답 경계 비교)")
+    parser.add_argument("--num_videos",  type=int, default=3)
+    parser.add_argument("--duration",    type=int, default=60,
+                        help="합성 영상 길이 (초)")
+    parser.add_argument("--shot_length", type=float, nargs=2, default=[1.5, 6.0],
+                        help="합성 영상 샷 길이 범위 (초)")
+    parser.add_argument("--threshold",   type=float, default=0.3)
+    parser.add_argument("--num_seg",     type=int, default=8)
+    parser.add_argument("--tolerance",   type=float, default=0.1,
+                        help="경계 일치 허용 오차 (초)")
+    parser.add_argument("--seed",        type=int, default=0)
+
+    return parser.parse_args()
+
+def make_cut_video(path, duration, fps, width, height, shot_length, rng):
+    writer     = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    boundaries = []
+    frame_idx  = 0
+
+    while frame_idx < duration * fps:
+        base   = cv2.resize(rng.integers(0, 255, size = (9, 16, 3), dtype = np.uint8), (width, height), interpolation = cv2.INTER_CUBIC)
+        length = int(rng.uniform(*shot_length) * fps)
+
+        for i in range(min(length, duration * fps - frame_idx)):
+            writer.write(np.roll(base, 2 * i, axis = 1))
+
+        frame_idx += length
+
+        if frame_idx < duration * fps:
+            boundaries.append(frame_idx / fps)
+
+    writer.release()
+    return path, boundaries
+
+def cpu_seconds():
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+def ffmpeg_pipeline(video_file, threshold, num_seg):
+    shot_times = ffmpeg_shot_boundaries(video_file, threshold)
+    sampler    = FrameSampler(video_file)
+    sampler.open()
+
+    try:
+        for indices, _ in shot_frame_indices(shot_times, sampler.fps, sampler.num_frames, num_seg):
+            list(sampler.sample((indices * 1000.0 / sampler.fps).tolist()))
+    finally:
+        sampler.close()
+
+    return shot_times
+
+def numpy_pipeline(video_file, threshold, num_seg, metric):
+    return ShotDetector(threshold, metric = metric, num_seg = num_seg).detect(video_file)[0]
+
+def score(detected, truth, tolerance):
+    detected = detected[1:-1]
+    hits     = sum(any(abs(t - d) <= tolerance for d in detected) for t in truth)
+    return hits / max(1, len(truth)), hits / max(1, len(detected))
+
+def main():
+    args    = parse_args()
+    rng     = np.random.default_rng(args.seed)
+    methods = {f"numpy-{metric}": (lambda video_file, metric = metric: numpy_pipeline(video_file, args.threshold, args.num_seg, metric))
+               for metric in SCENE_METRICS}
+
+    if shutil.which("ffmpeg") and shutil.which("ffprobe"):
+        methods["ffmpeg"] = lambda video_file: ffmpeg_pipeline(video_file, args.threshold, args.num_seg)
+    else:
+        print("⚠️ ffmpeg/ffprobe를 찾을 수 없어 ffmpeg 경로는 측정하지 않습니다.")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.videos:
+            videos = [(video_file, None) for video_file in args.videos]
+        else:
+            videos = [make_cut_video(os.path.join(tmp_dir, f"cuts_{i}.mp4"), args.duration, 30, 640, 360, args.shot_length, rng)
+                      for i in range(args.num_videos)]
+
+        minutes = 0.0
+        totals  = {name: [0.0, 0.0, [], []] for name in methods}
+
+        for video_file, truth in videos:
+            cap      = cv2.VideoCapture(video_file)
+            minutes += cap.get(cv2.CAP_PROP_FRAME_COUNT) / (cap.get(cv2.CAP_PROP_FPS) or 30.0) / 60
+            cap.release()
+
+            for name, method in methods.items():
+                wall_start, cpu_start = perf_counter(), cpu_seconds()
+                shot_times            = method(video_file)
+                totals[name][0]      += perf_counter() - wall_start
+                totals[name][1]      += cpu_seconds() - cpu_start
+
+                if truth is not None:
+                    recall, precision = score(shot_times, truth, args.tolerance)
+                    totals[name][2].append(recall)
+                    totals[name][3].append(precision)
+
+        print(f"{'method':<11} | {'wall s/min':>10} | {'cpu s/min':>9} | {'recall':>6} | {'precision':>9}")
+
+        for name, (wall, cpu, recalls, precisions) in totals.items():
+            print(f"{name:<11} | {wall / minutes:10.2f} | {cpu / minutes:9.2f} | "
+                  f"{np.mean(recalls) if recalls else float('nan'):6.2f} | {np.mean(precisions) if precisions else float('nan'):9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import cv2
+import random
+import argparse
+import tempfile
+import numpy                     as np
+from   time                      import perf_counter
+from   benchmarks.frame_sampling import make_video
+from   models.clip_similarity    import (COARSE_INTERVAL,
+                                         MAX_SEARCH_FRAMES,
+                                         REFINE_TOP,
+                                         ClipVideoProcessor)
+
+TEXTS = ["a man walking down the street", "two people talking at a table", "a car driving at night", "a close-up of a smiling woman"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="최적 프레임 탐색 모드 비교: exhaustive vs coarse_to_fine (final_project 폴더에서 python -m benchmarks.temporal_search)")
+
+    parser.add_argument("--videos",            type=str, nargs="*", default=None,
+                        help="실제 영상 경로 목록 (없으면 합성 영상 생성)")
+    parser.add_argument("--num_videos",        type=int, default=3)
+    parser.add_argument("--duration",          type=int, default=120,
+                        help="합성 영상 길이 (초)")
+    parser.add_argument("--texts",             type=str, nargs="+", default=TEXTS)
+    parser.add_argument("--interval_lengths",  type=int, nargs="+", default=[5000, 15000, 30000, 60000],
+                        help="구간 길이 목록 (ms)")
+    parser.add_argument("--sampling_interval", type=int, default=500)
+    parser.add_argument("--coarse_interval",   type=int, default=COARSE_INTERVAL)
+    parser.add_argument("--refine_top",        type=int, default=REFINE_TOP)
+    parser.add_argument("--max_search_frames", type=int, default=MAX_SEARCH_FRAMES)
+    parser.add_argument("--seed",              type=int, default=0)
+
+    return parser.parse_args()
+
+def run(processor, video_file, targets, sampling_interval):
+    start   = perf_counter()
+    results = processor.find_best_frames_in_video(video_file, targets, sampling_interval)
+    return results, processor.last_decoded_frames, perf_counter() - start
+
+def main():
+    args       = parse_args()
+    rng        = np.random.default_rng(args.seed)
+    rand       = random.Random(args.seed)
+    exhaustive = ClipVideoProcessor(search_mode = "exhaustive")
+    coarse     = ClipVideoProcessor(search_mode       = "coarse_to_fine",
+                                    coarse_interval   = args.coarse_interval,
+                                    refine_top        = args.refine_top,
+                                    max_search_frames = args.max_search_frames)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        videos = args.videos or [make_video(os.path.join(tmp_dir, f"clip_{i}.mp4"), args.duration, 30, 640, 360, rng)
+                                 for i in range(args.num_videos)]
+
+        print(f"{'video':<16} | {'length':>7} | {'frames (ex/cf)':>14} | {'time (ex/cf)':>15} | {'same':>4} | {'|dt|':>7} | {'sim gap':>8}")
+
+        for video_file in videos:
+            cap         = cv2.VideoCapture(video_file)
+            duration_ms = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) / (cap.get(cv2.CAP_PROP_FPS) or 30.0) * 1000)
+            cap.release()
+
+            for length in args.interval_lengths:
+                start   = rand.randint(0, max(0, duration_ms - length))
+                targets = [(start, start + length, text) for text in args.texts]
+
+                ex_results, ex_frames, ex_time = run(exhaustive, video_file, targets, args.sampling_interval)
+                cf_results, cf_frames, cf_time = run(coarse,     video_file, targets, args.sampling_interval)
+
+                pairs = [(ex, cf) for ex, cf in zip(ex_results, cf_results) if ex[1] is not None and cf[1] is not None]
+                same  = sum(ex[1] == cf[1] for ex, cf in pairs)
+                dt    = np.mean([abs(ex[1] - cf[1]) for ex, cf in pairs]) if pairs else float("nan")
+                gap   = np.mean([ex[2] - cf[2] for ex, cf in pairs]) if pairs else float("nan")
+
+                print(f"{os.path.basename(video_file)[:16]:<16} | {length / 1000:6.0f}s | {ex_frames:>6} / {cf_frames:<6} | "
+                      f"{ex_time:6.2f}s / {cf_time:6.2f}s | {same}/{len(pairs)} | {dt:6.0f}ms | {gap:8.4f}")
+
+if __name__ == "__main__":
+    main()
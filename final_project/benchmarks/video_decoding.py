@@ -0,0 +1,62 @@
+import os
+import argparse
+import tempfile
+import numpy                     as np
+from   time                      import perf_counter
+from   benchmarks.frame_sampling import make_video
+from   models.shot_detector      import SHOT_BACKENDS
+from   models.video_processor    import VideoProcessor
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="다중 영상 샷 스트리밍(stream_shots) 코어 수 확장성 측정 (final_project 폴더에서 python -m benchmarks.video_decoding)")
+
+    parser.add_argument("--videos",       type=str, nargs="*", default=None,
+                        help="실제 영상 경로 목록 (없으면 합성 영상 생성)")
+    parser.add_argument("--num_videos",   type=int, default=8)
+    parser.add_argument("--duration",     type=int, default=30,
+                        help="합성 영상 길이 (초)")
+    parser.add_argument("--num_seg",      type=int, default=8)
+    parser.add_argument("--workers",      type=int, nargs="+", default=None,
+                        help="측정할 워커 수 목록 (기본: 1부터 코어 수까지 2배씩)")
+    parser.add_argument("--shot_backend", type=str, default="ffmpeg", choices=SHOT_BACKENDS)
+    parser.add_argument("--seed",         type=int, default=0)
+
+    return parser.parse_args()
+
+def run(processor, videos):
+    start  = perf_counter()
+    shots  = 0
+    frames = 0
+
+    for item in processor.stream_shots(videos):
+        if item[0] == "shot":
+            shots  += 1
+            frames += item[3].size(0)
+        elif item[0] == "error":
+            print(f"🚨 [에러] {videos[item[1]]}: {item[2]}")
+
+    return shots, frames, perf_counter() - start
+
+def main():
+    args    = parse_args()
+    rng     = np.random.default_rng(args.seed)
+    workers = args.workers or [2**i for i in range(int(np.log2(os.cpu_count() or 1)) + 1)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        videos   = args.videos or [make_video(os.path.join(tmp_dir, f"clip_{i}.mp4"), args.duration, 30, 640, 360, rng)
+                                   for i in range(args.num_videos)]
+        baseline = None
+
+        print(f"영상 {len(videos)}개, CPU {os.cpu_count()}개, shot_backend={args.shot_backend}")
+        print(f"{'workers':>7} | {'shots':>6} | {'frames':>7} | {'time':>8} | {'frames/sec':>10} | {'speedup':>7}")
+
+        for num_workers in workers:
+            processor              = VideoProcessor(num_seg = args.num_seg, num_workers = num_workers, shot_backend = args.shot_backend)
+            shots, frames, elapsed = run(processor, videos)
+            baseline               = baseline or elapsed
+
+            print(f"{num_workers:>7} | {shots:>6} | {frames:>7} | {elapsed:7.2f}s | {frames / max(elapsed, 1e-9):10.1f} | "
+                  f"{baseline / max(elapsed, 1e-9):6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,62 @@ import os
 import glob
 import json
 import numpy     as     np
-import torch
-from   angle_emb import AnglE, Prompts
-from   time      import time
+from   angle_emb            import Prompts
+from   time                 import time
+from   models.query_encoder import (MODEL_NAME,
+                                    get_query_encoder)
+from   models.segment_store import (SegmentStore,
+                                    ShardedSegmentStore,
+                                    store_path_for)
+
+DEFAULT_BATCH_SIZE = 32
+
+def token_length(angle, sentence : str):
+    tokenizer = getattr(angle, "tokenizer", None)
+    
+    if tokenizer is None:
+        return len(sentence.split())
+    
+    return len(tokenizer.encode(sentence, add_special_tokens = False))
+
+def encode_sentences(angle, 
+                     sentences  : list, 
+                     batch_size : int = DEFAULT_BATCH_SIZE, 
+                     prompt           = Prompts.C):
+    
+    if not sentences:
+        return np.zeros((0, 0), dtype = np.float32)
+    
+    order      = sorted(range(len(sentences)), key = lambda i: token_length(angle, sentences[i]))
+    embeddings = [None] * len(sentences)
+    
+    for start in range(0, len(order), batch_size):
+        bucket           = order[start : start + batch_size]
+        bucket_embedding = angle.encode([{'text': sentences[i]} for i in bucket], 
+                                        to_numpy = True, 
+                                        prompt   = prompt)
+        
+        for i, embedding in zip(bucket, bucket_embedding):
+            embeddings[i] = embedding
+            
+    return np.stack(embeddings)
 
 class EmbeddingProcessor:
     def __init__(self, 
                  existing_npz_path : str, 
                  json_folder       : str, 
                  updated_npz_path  : str,
-                 model_name        : str = 'WhereIsAI/UAE-Large-V1', 
+                 model_name        : str = MODEL_NAME, 
                  pooling_strategy  : str = 'cls', 
-                 device            : str = 'cuda'):
+                 device            : str = 'cuda',
+                 batch_size        : int = DEFAULT_BATCH_SIZE):
         
         self.existing_npz_path = existing_npz_path
         self.json_folder       = json_folder
         self.updated_npz_path  = updated_npz_path
-        self.device            = device if torch.cuda.is_available() else 'cpu'
-        self.angle             = AnglE.from_pretrained(model_name, pooling_strategy=pooling_strategy)
-        
-        if self.device.lower() == 'cuda':
-            self.angle = self.angle.cuda()
+        self.batch_size        = batch_size
+        self.query_encoder     = get_query_encoder(model_name, pooling_strategy, device, warm = False)
+        self.device            = self.query_encoder.device
 
         self.merge_embeddings()
         
@@ -35,17 +70,17 @@ class EmbeddingProcessor:
         elapsed_time = time() - self.start_time
         print(f"⏳ [EmbeddingProcessor] 전체 실행 시간: {elapsed_time:.2f}초")
     
-    def __process_json_file(self, json_path : str):
+    def __read_json_file(self, json_path : str):
         
         with open(json_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        file_embeddings = {}
+        file_segments = {}
         
         for video_id, content in data.items():
-            timestamps          = content.get("timestamps", [])
-            sentences           = content.get("sentences", [])
-            timeline_embeddings = {}
+            timestamps = content.get("timestamps", [])
+            sentences  = content.get("sentences", [])
+            segments   = []
 
             for idx, sentence in enumerate(sentences):
                 if idx < len(timestamps):
@@ -54,45 +89,59 @@ class EmbeddingProcessor:
                 else:
                     ts_key = f"idx_{idx}"
                     
-                embedding                   = self.angle.encode({'text': sentence}, 
-                                                                 to_numpy = True, 
-                                                                 prompt   = Prompts.C)
-                timeline_embeddings[ts_key] = embedding[0]
+                segments.append((ts_key, sentence))
                 
-            file_embeddings[video_id]       = timeline_embeddings
-        return file_embeddings
+            file_segments[video_id] = segments
+        return file_segments
 
-    @staticmethod
-    def load_existing_npz(npz_path : str):
-        if os.path.exists(npz_path):
-            npz_data  = np.load(npz_path,
-                                allow_pickle = True)
-            data_dict = {key: npz_data[key] for key in npz_data.files}
-            npz_data.close()
-            return data_dict
-        else:
-            return {}
+    def __open_store(self):
+        root = store_path_for(self.updated_npz_path)
+        
+        if os.path.exists(self.existing_npz_path) and ShardedSegmentStore.import_npz(root, self.existing_npz_path):
+            print(f"기존 NPZ '{self.existing_npz_path}'를 첫 번째 샤드로 가져왔습니다.")
+            
+        return ShardedSegmentStore.create(root)
 
     def merge_embeddings(self):
-        all_embeddings = self.load_existing_npz(self.existing_npz_path)
+        store          = self.__open_store()
+        existing_ids   = store.video_id_set()
+        pending        = {}
         all_json_files = glob.glob(os.path.join(self.json_folder, "*.json"))
         
         for json_file in all_json_files:
             json_title = os.path.splitext(os.path.basename(json_file))[0]
             
-            if json_title in all_embeddings:
+            if json_title in existing_ids or json_title in pending:
                 print(f"이미 존재하는 video_id '{json_title}'의 JSON 파일은 건너뜁니다.")
                 continue
 
-            new_embeds = self.__process_json_file(json_file)
-            
-            for video_id, emb_dict in new_embeds.items():
-                if video_id in all_embeddings:
+            for video_id, segments in self.__read_json_file(json_file).items():
+                if video_id in existing_ids or video_id in pending:
                     print(f"이미 존재하는 비디오 id: {video_id} (건너뜁니다) from 파일: {os.path.basename(json_file)}")
                     
                 else:
-                    all_embeddings[video_id] = emb_dict
+                    pending[video_id] = segments
                     print(f"추가된 비디오 id: {video_id} from 파일: {os.path.basename(json_file)}")
+        
+        keys       = [(video_id, ts_key) for video_id, segments in pending.items() for ts_key, _ in segments]
+        sentences  = [sentence for segments in pending.values() for _, sentence in segments]
+        
+        if not sentences:
+            print(f"새로 추가할 임베딩이 없습니다. '{store.root}' 스토어를 그대로 유지합니다. (샤드 {len(store.shards)}개)")
+            return
+        
+        with self.query_encoder.model() as angle:
+            start_time = time()
+            embeddings = encode_sentences(angle, sentences, self.batch_size)
+            elapsed    = time() - start_time
+        
+        print(f"⚡ [EmbeddingProcessor] 문장 {len(sentences)}개 인코딩 완료 "
+              f"({elapsed:.2f}초, {len(sentences) / max(elapsed, 1e-9):.1f} sentences/sec, batch_size={self.batch_size})")
+        
+        new_embeddings = {video_id: {} for video_id in pending}
+        
+        for (video_id, ts_key), embedding in zip(keys, embeddings):
+            new_embeddings[video_id][ts_key] = embedding
                     
-        np.savez(self.updated_npz_path, **all_embeddings)
-        print(f"모든 임베딩이 '{self.updated_npz_path}' 파일에 저장되었습니다.")
+        store = store.append(SegmentStore.from_dicts(new_embeddings), skip_existing = True)
+        print(f"새 임베딩 {len(new_embeddings)}개 비디오가 '{store.root}' 스토어에 추가되었습니다. (샤드 {len(store.shards)}개)")
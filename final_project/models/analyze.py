@@ -1,23 +1,18 @@
-import  gc
 import  os
-import  cv2
 import  json
 import  torch
-import  numpy                  as     np
 from    tqdm                   import tqdm
 from    time                   import time
 from    transformers           import (AutoTokenizer,
                                        AutoModel)
-from    decord                 import (VideoReader,
-                                       cpu)
-from    PIL                    import Image
-from    torchvision            import transforms      as T
 from    models.audio_model     import AudioExtractor
-from    models.video_processor import VideoProcessor
+from    models.frame_sampler   import FrameSampler
+from    models.model_registry  import get_model_registry
+from    models.range_sampler   import RangeSampler
+from    models.shot_batcher    import ShotBatcher
+from    models.video_processor import (SHOT_QUEUE_DEPTH,
+                                       VideoProcessor)
     
-IMAGENET_MEAN = [0.485, 0.456, 0.406]
-IMAGENET_STD  = [0.229, 0.224, 0.225]
-
 LORA_MODEL_PATH  = "/data/ephemeral/home/checkpoint-2456"
 BASE_MODEL_PATH  = "/data/ephemeral/home/InternVL2_5-1B-MPO"
 
@@ -56,16 +51,21 @@ GENERATION_CONFIG = {
 
 class AnalyzeVideo:
     def __init__(self, 
-                 use_audio  : bool = True,
-                 num_seg    : int  = 32,
-                 input_size : int  = 448,
-                 batch_size : int  = 4):
-        self.use_audio  = use_audio
-        self.num_seg    = num_seg
-        self.input_size = input_size
-        self.batch_size = batch_size
-        self.model      = None
-        self.tokenizer  = None
+                 use_audio        : bool = True,
+                 num_seg          : int  = 32,
+                 input_size       : int  = 448,
+                 batch_size       : int  = 4,
+                 max_batch_tokens : int  = None):
+        self.use_audio        = use_audio
+        self.num_seg          = num_seg
+        self.input_size       = input_size
+        self.batch_size       = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.model            = None
+        self.tokenizer        = None
+        self.model_key        = f"internvl:{LORA_MODEL_PATH}"
+        self.registry         = get_model_registry()
+        self.sampler          = RangeSampler(input_size = input_size, dtype = torch.bfloat16)
         
     def __enter__(self):
         self.start_time = time()
@@ -76,126 +76,37 @@ class AnalyzeVideo:
         elapsed_time = time() - self.start_time
         print(f"⏳ [AnalyzeVideo] 전체 실행 시간: {elapsed_time}초")
     
+    def __build_model(self):
+        model     = AutoModel.from_pretrained(LORA_MODEL_PATH,
+                                              torch_dtype       = torch.bfloat16,
+                                              low_cpu_mem_usage = True,
+                                              use_flash_attn    = False,
+                                              trust_remote_code = True,
+                                              ).eval().to("cuda")
+        model     = torch.compile(model)
+        tokenizer = AutoTokenizer.from_pretrained(BASE_MODEL_PATH,
+                                                  trust_remote_code = True,
+                                                  use_fast          = True)
+        
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token_id = tokenizer.eos_token_id
+        
+        return model, tokenizer
+    
     def __load_model(self):
         if self.model is None or self.tokenizer is None:
-            self.model     = AutoModel.from_pretrained(LORA_MODEL_PATH,
-                                                       torch_dtype       = torch.bfloat16,
-                                                       low_cpu_mem_usage = True,
-                                                       use_flash_attn    = False,
-                                                       trust_remote_code = True,
-                                                       ).eval().to("cuda")
-            self.model     = torch.compile(self.model)
-            self.tokenizer = AutoTokenizer.from_pretrained(BASE_MODEL_PATH,
-                                                           trust_remote_code = True,
-                                                           use_fast          = True)
-            
-            if self.tokenizer.pad_token_id is None:
-                self.tokenizer.pad_token_id = self.tokenizer.eos_token_id
-                
+            self.model, self.tokenizer = self.registry.acquire(self.model_key, self.__build_model)
     
     def __unload_model(self):
         if self.model is not None:
-            torch.cuda.synchronize()
-            del self.model
-            del self.tokenizer
             self.model     = None
             self.tokenizer = None
-            gc.collect()
-            torch.cuda.empty_cache()
+            self.registry.release(self.model_key)
     
-    def __build_transform(self):
-        return T.Compose([
-               T.Resize((self.input_size, self.input_size),
-                         interpolation = T.InterpolationMode.BICUBIC),
-               T.ToTensor(),
-               T.Normalize(mean = IMAGENET_MEAN,
-                           std  = IMAGENET_STD)
-               ])
-        
-    def __get_index(self,
-                  bound     = None,
-                  fps       : int = 64,
-                  max_frame : int = 0,
-                  first_idx : int = 0):
-        
-        start, end = bound if bound else (-100000, 100000)
-        
-        start_idx  = max(first_idx, round(start * fps))
-        end_idx    = min(round(end * fps), max_frame)
-        seg_size   = (end_idx - start_idx) / self.num_seg
-        
-        frame_indice = np.linspace(start_idx + (seg_size / 2),
-                                   end_idx - (seg_size / 2),
-                                   self.num_seg,
-                                   dtype = int)
-        return frame_indice
-        
     def __load_video(self, video_path : str):
-        vr                = VideoReader(video_path,
-                                        ctx         = cpu(0), 
-                                        num_threads = 1)
-        
-        max_frame         = len(vr) - 1
-        fps               = float(vr.get_avg_fps())
-            
-        transform         = self.__build_transform()
-        frame_indices     = self.__get_index(fps = fps, max_frame = max_frame)
-        frames            = vr.get_batch(frame_indices).asnumpy()
-        
-        pixel_values_list = []
-        timestamp         = []
-        
-        for i, frame_np in enumerate(frames):
-            img     = Image.fromarray(frame_np)
-            img     = transform(img)
-            pixel_values_list.append(img)
-            
-            seconds = frame_indices[i] / fps
-            timestamp.append(f"{int(seconds // 60):02d}:{seconds % 60:05.2f}")
-        pixel_value = torch.stack(pixel_values_list)
-        return pixel_value, timestamp
-    
-    def __load_video_gpu(self, video_path : str):
-        vr = VideoReader(video_path,
-                         ctx         = cpu(0), 
-                         num_threads = 1)
-        
-        max_frame = len(vr) - 1
-        
-        fps = float(vr.get_avg_fps())
-        
-        start_idx = 0
-        end_idx = max_frame
-        seg_size = (end_idx - start_idx) / self.num_seg
-        
-        frame_indices = np.linspace(start_idx + seg_size / 2,
-                                    end_idx - seg_size / 2,
-                                    self.num_seg,
-                                    dtype=int)
-        
-        frames_np = vr.get_batch(frame_indices).asnumpy()
-        
-        frames = torch.from_numpy(frames_np).to(torch.bfloat16).div(255.0)
-        
-        frames = frames.permute(0, 3, 1, 2).cuda()
-        
-        frames = torch.nn.functional.interpolate(frames, 
-                                                 size=(self.input_size, self.input_size), 
-                                                 mode='bicubic', 
-                                                 align_corners=False)
-        
-        mean = torch.tensor(IMAGENET_MEAN, device=frames.device).view(1, 3, 1, 1)
-        std = torch.tensor(IMAGENET_STD, device=frames.device).view(1, 3, 1, 1)
-        
-        frames = (frames - mean) / std
-
-        timestamps = []
-        
-        for idx in frame_indices:
-            seconds = idx / fps
-            timestamps.append(f"{int(seconds // 60):02d}:{seconds % 60:05.2f}")
-        
-        return frames, timestamps
+        frames_list, indices_list, fps, _ = self.sampler.sample(video_path, [(0, None, self.num_seg)])
+        timestamps                        = [f"{int(idx / fps // 60):02d}:{idx / fps % 60:05.2f}" for idx in indices_list[0]]
+        return frames_list[0], timestamps
         
     def __transcribe_audio(self, video_path : str):
         with AudioExtractor(video_path = video_path, mode = "DL") as extractor:
@@ -209,55 +120,32 @@ class AnalyzeVideo:
                                   frames_per_segment : int = 3, 
                                   input_size         : int = 448):
         
-        cap = cv2.VideoCapture(video_path)
+        probe = FrameSampler(video_path)
         
-        if not cap.isOpened():
+        if not probe.open():
             raise ValueError(f"Cannot open video: {video_path}")
         
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps          = cap.get(cv2.CAP_PROP_FPS)
-
-        transform = T.Compose([
-                    T.Resize((input_size, input_size),
-                              interpolation=T.InterpolationMode.BICUBIC),
-                    T.ToTensor(),
-                    T.Normalize(mean=[0.485, 0.456, 0.406],
-                                std =[0.229, 0.224, 0.225])
-                    ])
+        total_frames = probe.num_frames
+        fps          = probe.fps
+        probe.close()
+        
+        sampler      = self.sampler if input_size == self.input_size else RangeSampler(input_size = input_size, dtype = torch.bfloat16)
+        bounds       = [(int(total_frames * seg_idx / segments), int(total_frames * (seg_idx + 1) / segments)) for seg_idx in range(segments)]
+        bounds       = [(seg_start, seg_end) for seg_start, seg_end in bounds if seg_end > seg_start]
+        frames_list  = sampler.sample(video_path, 
+                                      [(seg_start / fps, seg_end / fps, frames_per_segment) for seg_start, seg_end in bounds], 
+                                      mode = "span")[0]
 
         segments_frames     = []
         segments_timestamps = []
 
-        for seg_idx in range(segments):
-            seg_start = int(total_frames * seg_idx / segments)
-            seg_end   = int(total_frames * (seg_idx + 1) / segments)
-            if seg_end <= seg_start:
+        for (seg_start, seg_end), segment_tensor in zip(bounds, frames_list):
+            if len(segment_tensor) != frames_per_segment:
                 continue
 
-            frame_indices = np.linspace(seg_start, seg_end - 1, frames_per_segment, dtype=int)
-            
-            frames_list   = []
-            
-            for idx in frame_indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ret, frame   = cap.read()
-                
-                if not ret:
-                    continue
-                
-                frame        = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frame_pil    = Image.fromarray(frame)
-                frame_tensor = transform(frame_pil)
-                frames_list.append(frame_tensor)
-
-            if len(frames_list) != frames_per_segment:
-                continue
-
-            segment_tensor = torch.stack(frames_list, dim=0)
             segments_frames.append(segment_tensor)
             segments_timestamps.append([int((seg_start / fps) * 1000), int((seg_end / fps) * 1000)])
 
-        cap.release()
         return segments_frames, segments_timestamps, int(total_frames / fps * 1000)
 
     def analyze(self,
@@ -266,7 +154,7 @@ class AnalyzeVideo:
         
         self.__load_model()
         
-        pix_val, timestamp = self.__load_video_gpu(video_path=video_path)
+        pix_val, timestamp = self.__load_video(video_path=video_path)
         
         pix_val            = pix_val.to(torch.bfloat16).cuda()
         
@@ -288,99 +176,149 @@ class AnalyzeVideo:
         self.__unload_model()
         return response
     
-    def batch_analyze(self,
-                      video_paths : list,
-                      output_path : str,
-                      prompt      : str = PROMPT):
+    def __chat_batch(self, 
+                     frames : list, 
+                     prompt : str):
         
-        self.__load_model()
+        pix_values       = torch.cat(frames).to("cuda", torch.bfloat16, non_blocking = True)
         
-        with VideoProcessor(num_seg = self.num_seg, shot_threshold = 0.3,) as vp:
-            shot_frames_list, shot_times_list, durations = vp.process_videos(video_paths = video_paths)
+        batch_prompts    = [prompt] * len(frames)
+        num_patches_list = [shot_frames.size(0) for shot_frames in frames]
         
-        for vid_idx, ((shot_frames, shot_times), duration) in enumerate(zip(shot_frames_list, durations)):
-            video_path = video_paths[vid_idx]
-            video_id   = os.path.basename(video_path)[-15:-4]
-            
-            response   = []
-            
-            for i in tqdm(range(0, len(shot_frames), self.batch_size), desc=f"Processing {video_id}", unit="batch"):
-                mini_batch_frame = shot_frames[i : i + self.batch_size]
-                pix_values = torch.cat(mini_batch_frame).to(torch.bfloat16).cuda()
-                
-                batch_prompts = [prompt] * len(mini_batch_frame)
-                num_patches_list = [self.num_seg] * len(mini_batch_frame)
-                
-                batch_response = self.model.batch_chat(self.tokenizer,
-                                                           pix_values,
-                                                           batch_prompts,
-                                                           GENERATION_CONFIG,
-                                                           num_patches_list = num_patches_list,
-                                                           history = None)
-                response.extend(batch_response)
-            
-            json_data = {
-                video_id: {
-                    "duration": int(duration * 1000) if shot_times else 0,
-                    "timestamps": [[int(s * 1000), int(e * 1000)] for s, e in shot_times],
-                    "sentences": response
-                }
+        return self.model.batch_chat(self.tokenizer,
+                                     pix_values,
+                                     batch_prompts,
+                                     GENERATION_CONFIG,
+                                     num_patches_list = num_patches_list,
+                                     history          = None)
+    
+    def __new_batcher(self, prompt : str):
+        return ShotBatcher(lambda frames: self.__chat_batch(frames, prompt),
+                           batch_size = self.batch_size,
+                           max_tokens = self.max_batch_tokens)
+    
+    def __route_responses(self, 
+                          completed   : list, 
+                          states      : dict, 
+                          video_paths : list, 
+                          output_path : str):
+        
+        response = None
+        
+        for (video_idx, shot_idx), sentence in completed:
+            if video_idx in states:
+                states[video_idx]["sentences"][shot_idx] = sentence
+        
+        finished = [video_idx for video_idx, state in states.items() 
+                    if state["duration"] is not None and len(state["sentences"]) == len(state["times"])]
+        
+        for video_idx in finished:
+            state    = states.pop(video_idx)
+            response = self.__save_analysis(video_paths[video_idx], state, state["duration"], output_path)
+        
+        return response
+    
+    def __save_analysis(self, 
+                        video_path  : str, 
+                        state       : dict, 
+                        duration    : float, 
+                        output_path : str):
+        
+        video_id   = os.path.basename(video_path)[-15:-4]
+        shot_ids   = sorted(state["times"])
+        response   = [state["sentences"][shot_idx] for shot_idx in shot_ids]
+        
+        json_data = {
+            video_id: {
+                "duration": int(duration * 1000) if shot_ids else 0,
+                "timestamps": [[int(state["times"][shot_idx][0] * 1000), int(state["times"][shot_idx][1] * 1000)] for shot_idx in shot_ids],
+                "sentences": response
             }
+        }
+        
+        os.makedirs(output_path, exist_ok=True)
+        json_path = os.path.join(output_path, f"{video_id}.json")
+        
+        with open(json_path, 'w', encoding="utf-8") as json_file:
+            json.dump(json_data, json_file, indent=4, ensure_ascii=False)
             
-            os.makedirs(output_path, exist_ok=True)
-            json_path = os.path.join(output_path, f"{video_id}.json")
-            
-            with open(json_path, 'w', encoding="utf-8") as json_file:
-                json.dump(json_data, json_file, indent=4, ensure_ascii=False)
+        print(f"✅ JSON saved: {json_path}")
+        return response
+    
+    def batch_analyze(self,
+                      video_paths  : list,
+                      output_path  : str,
+                      prompt       : str = PROMPT,
+                      num_workers  : int = None,
+                      queue_depth  : int = SHOT_QUEUE_DEPTH,
+                      shot_backend : str = "ffmpeg"):
+        
+        self.__load_model()
+        
+        states   = {}
+        response = []
+        progress = tqdm(desc="Analyzing shots", unit="shot")
+        batcher  = self.__new_batcher(prompt)
+        
+        try:
+            with VideoProcessor(num_seg        = self.num_seg, 
+                                shot_threshold = 0.3, 
+                                num_workers    = num_workers, 
+                                shot_backend   = shot_backend) as vp:
+                print(f"🎞️ [AnalyzeVideo] 스트리밍 분석: 영상 {len(video_paths)}개, 전처리 워커 {min(vp.num_workers, len(video_paths))}개, 큐 깊이 {queue_depth}")
                 
-            print(f"✅ JSON saved: {json_path}")
+                for item in vp.stream_shots(video_paths, queue_depth = queue_depth):
+                    kind, video_idx = item[:2]
+                    state           = states.setdefault(video_idx, {"times": {}, "sentences": {}, "duration": None})
+                    completed       = []
+                    
+                    if kind == "shot":
+                        _, _, shot_idx, frames, shot_time = item
+                        state["times"][shot_idx]          = shot_time
+                        completed                         = batcher.add((video_idx, shot_idx), frames)
+                    
+                    elif kind == "done":
+                        state["duration"] = item[2]
+                    
+                    else:
+                        print(f"🚨 [에러] 영상 분석에 실패했습니다: {video_paths[video_idx]}")
+                        print(f"🔹 [에러 내용] {item[2]}")
+                        states.pop(video_idx, None)
+                    
+                    progress.update(len(completed))
+                    response = self.__route_responses(completed, states, video_paths, output_path) or response
+                
+                completed = batcher.flush()
+                progress.update(len(completed))
+                response  = self.__route_responses(completed, states, video_paths, output_path) or response
             
-        self.__unload_model()
+            print(f"📦 [AnalyzeVideo] batch_chat {batcher.num_batches}회, 평균 배치 크기 {batcher.mean_batch_size():.2f}")
+        finally:
+            progress.close()
+            self.__unload_model()
+        
         return response
 
-    def fast_batch_analyze(self,
-                  video_paths: list,
-                  output_path: str,
-                  prompt: str = PROMPT):
-        self.__load_model()
-
-        shot_frames_list = []
-        shot_times_list  = []
-        durations_list   = []
-
-        for video_path in video_paths:
-            frames, timestamps, duration = self.__extract_segments_frames(video_path=video_path)
-            shot_frames_list.append(frames)
-            shot_times_list.append(timestamps)
-            durations_list.append(duration)
-
-        for vid_idx, ((shot_frames, shot_times), duration) in enumerate(zip(zip(shot_frames_list, shot_times_list), durations_list)):
-            video_path = video_paths[vid_idx]
-            
-            base_name = os.path.splitext(os.path.basename(video_path))[0]
+    def __save_finished_segments(self, 
+                                 videos      : dict, 
+                                 sentences   : dict, 
+                                 video_paths : list, 
+                                 output_path : str):
+        
+        response = None
+        finished = [video_idx for video_idx, (shot_times, _) in videos.items() 
+                    if all((video_idx, shot_idx) in sentences for shot_idx in range(len(shot_times)))]
+        
+        for video_idx in finished:
+            shot_times, duration = videos.pop(video_idx)
+            response             = [sentences.pop((video_idx, shot_idx)) for shot_idx in range(len(shot_times))]
+            base_name            = os.path.splitext(os.path.basename(video_paths[video_idx]))[0]
             
             if len(base_name) < 20:
                 video_id = base_name
             else:
                 video_id = base_name[-15:-4]
 
-            response   = []
-
-            for i in tqdm(range(0, len(shot_frames), self.batch_size), desc=f"Processing {video_id}", unit="batch"):
-                mini_batch_frame = shot_frames[i : i + self.batch_size]
-                pix_values       = torch.cat(mini_batch_frame).to(torch.bfloat16).cuda()
-
-                batch_prompts    = [prompt] * len(mini_batch_frame)
-                num_patches_list = [self.num_seg] * len(mini_batch_frame)
-
-                batch_response   = self.model.batch_chat(self.tokenizer,
-                                                         pix_values,
-                                                         batch_prompts,
-                                                         GENERATION_CONFIG,
-                                                         num_patches_list=num_patches_list,
-                                                         history=None)
-                response.extend(batch_response)
-
             json_data = {
                 video_id: {
                     "duration": duration,
@@ -396,6 +334,41 @@ class AnalyzeVideo:
                 json.dump(json_data, json_file, indent=4, ensure_ascii=False)
 
             print(f"✅ JSON saved: {json_path}")
+        
+        return response
 
-        self.__unload_model()
-        return response
\ No newline at end of file
+    def fast_batch_analyze(self,
+                  video_paths: list,
+                  output_path: str,
+                  prompt: str = PROMPT):
+        self.__load_model()
+
+        batcher   = self.__new_batcher(prompt)
+        videos    = {}
+        sentences = {}
+        response  = []
+        progress  = tqdm(desc="Analyzing shots", unit="shot")
+
+        try:
+            for video_idx, video_path in enumerate(video_paths):
+                shot_frames, shot_times, duration = self.__extract_segments_frames(video_path=video_path)
+                videos[video_idx]                 = (shot_times, duration)
+
+                for shot_idx, frames in enumerate(shot_frames):
+                    completed = batcher.add((video_idx, shot_idx), frames)
+                    sentences.update(completed)
+                    progress.update(len(completed))
+
+                response = self.__save_finished_segments(videos, sentences, video_paths, output_path) or response
+
+            completed = batcher.flush()
+            sentences.update(completed)
+            progress.update(len(completed))
+            response  = self.__save_finished_segments(videos, sentences, video_paths, output_path) or response
+
+            print(f"📦 [AnalyzeVideo] batch_chat {batcher.num_batches}회, 평균 배치 크기 {batcher.mean_batch_size():.2f}")
+        finally:
+            progress.close()
+            self.__unload_model()
+
+        return response
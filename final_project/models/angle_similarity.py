@@ -1,10 +1,8 @@
-import torch
-import numpy           as     np
-from   time            import time
-from   angle_emb       import AnglE
-from   angle_emb.utils import cosine_similarity
-
-MODEL_NAME = 'WhereIsAI/UAE-Large-V1'
+from   time                 import time
+from   models.query_encoder import (MODEL_NAME,
+                                    get_query_encoder)
+from   models.segment_store import open_store
+from   models.tracing       import get_tracer
 
 class AngleSimilarity:
     def __init__(self,
@@ -12,18 +10,21 @@ class AngleSimilarity:
                  npz_file         : str,
                  top_k            : int = 5,
                  model_name       : str = MODEL_NAME, 
-                 pooling_strategy : str = 'cls'):
+                 pooling_strategy : str = 'cls',
+                 query_encoder          = None,
+                 index_type       : str = "brute",
+                 search_params    : dict = None,
+                 query_embedding        = None):
         
         self.input_text       = input_text
+        self.query_embedding  = query_embedding
         self.npz_file         = npz_file
         self.top_k            = top_k
-        self.device           = device if torch.cuda.is_available() else 'cpu'
-        self.angle            = AnglE.from_pretrained(model_name, pooling_strategy=pooling_strategy)
-        
-        if self.device.lower() == 'cuda':
-            self.angle = self.angle.cuda()
+        self.index_type       = index_type
+        self.search_params    = search_params or {}
+        self.query_encoder    = query_encoder or get_query_encoder(model_name, pooling_strategy)
         
-        self.results    = self.compute_angle_similarity()
+        self.results          = self.compute_angle_similarity()
         
     def __enter__(self):
         self.start_time = time()
@@ -35,26 +36,24 @@ class AngleSimilarity:
         print(f"⏳ [AngleSimilarity] 전체 실행 시간: {elapsed_time:.2f}초")
     
     def __load_embeddings(self):
-        return np.load(self.npz_file, 
-                       allow_pickle = True)
+        return open_store(self.npz_file)
     
     def __compute_text_embedding(self):
-        return self.angle.encode([self.input_text], 
-                                  to_numpy = True)[0]
+        if self.query_embedding is not None:
+            return self.query_embedding
+        
+        embedding = self.query_encoder.encode([self.input_text])[0]
+        stats     = self.query_encoder.stats()
+        print(f"⏱️ [AngleSimilarity] 인코더 로드: {stats['load_time']:.2f}초 / 쿼리 인코딩: {stats['last_encode_time']:.3f}초")
+        return embedding
     
     def compute_angle_similarity(self):
-        data            = self.__load_embeddings()
         input_embedding = self.__compute_text_embedding()
-        results         = []
         
-        for video_id in data.files:
-            timeline_embeddings = data[video_id].item()
+        with get_tracer().span("search", index_type = self.index_type, top_k = self.top_k):
+            store = self.__load_embeddings()
             
-            for ts_key, embedding in timeline_embeddings.items():
-                sim    = cosine_similarity(input_embedding, embedding)
-                results.append((video_id, ts_key, sim))
-                
-        results_sorted = sorted(results, key=lambda x: x[2], reverse=True)
-        
-        return results_sorted[:self.top_k]
-
+            return store.search(input_embedding, 
+                                self.top_k, 
+                                index_type = self.index_type, 
+                                **self.search_params)
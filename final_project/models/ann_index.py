@@ -0,0 +1,290 @@
+import os
+import json
+import shutil
+import numpy             as np
+from   time              import time
+from   models.store_lock import (LOCK_FILE,
+                                 file_lock,
+                                 replace_dir)
+
+INDEX_DIR         = "ann"
+META_FILE         = "meta.json"
+ASSIGN_CHUNK_SIZE = 65536
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+def top_k_order(scores : np.ndarray, top_k : int):
+    top_k = min(top_k, scores.shape[0])
+
+    if top_k <= 0:
+        return np.array([], dtype = np.int64)
+
+    order = np.argpartition(-scores, top_k - 1)[:top_k] if top_k < scores.shape[0] else np.arange(scores.shape[0])
+    return order[np.argsort(-scores[order], kind = "stable")]
+
+def exact_rerank(embeddings : np.ndarray,
+                 query      : np.ndarray,
+                 candidates : np.ndarray,
+                 top_k      : int):
+
+    candidates = np.unique(np.asarray(candidates, dtype = np.int64))
+
+    if candidates.size == 0:
+        return candidates, np.array([], dtype = np.float32)
+
+    scores = np.asarray(embeddings[candidates]) @ query
+    order  = top_k_order(scores, top_k)
+
+    return candidates[order], scores[order]
+
+class BruteForceIndex:
+    kind       = "brute"
+    build_keys = ()
+
+    def __init__(self):
+        self.embeddings = None
+
+    def build(self, embeddings : np.ndarray):
+        self.embeddings = embeddings
+        return self
+
+    def attach(self, embeddings : np.ndarray):
+        self.embeddings = embeddings
+        return self
+
+    def save(self, index_dir : str):
+        os.makedirs(index_dir, exist_ok = True)
+
+    def load(self, index_dir : str):
+        return self
+
+    def search(self,
+               query : np.ndarray,
+               top_k : int = 5,
+               **kwargs):
+        scores = self.embeddings @ query
+        order  = top_k_order(scores, top_k)
+        return order, scores[order]
+
+class IVFFlatIndex:
+    kind       = "ivf"
+    build_keys = ("n_lists", "n_iter", "train_size", "seed")
+
+    def __init__(self,
+                 n_lists      : int = None,
+                 nprobe       : int = 8,
+                 n_iter       : int = 10,
+                 train_size   : int = 100000,
+                 seed         : int = 0):
+
+        self.n_lists    = n_lists
+        self.nprobe     = nprobe
+        self.n_iter     = n_iter
+        self.train_size = train_size
+        self.seed       = seed
+        self.embeddings = None
+        self.centroids  = None
+        self.offsets    = None
+        self.list_ids   = None
+
+    def __assign(self, embeddings : np.ndarray, centroids : np.ndarray):
+        assignments = np.empty(embeddings.shape[0], dtype = np.int64)
+
+        for start in range(0, embeddings.shape[0], ASSIGN_CHUNK_SIZE):
+            chunk                                       = np.asarray(embeddings[start : start + ASSIGN_CHUNK_SIZE])
+            assignments[start : start + chunk.shape[0]] = np.argmax(chunk @ centroids.T, axis = 1)
+
+        return assignments
+
+    def __train_centroids(self, embeddings : np.ndarray, n_lists : int):
+        rng       = np.random.default_rng(self.seed)
+        n         = embeddings.shape[0]
+        train_ids = np.sort(rng.choice(n, size = min(n, max(self.train_size, n_lists)), replace = False))
+        train     = np.asarray(embeddings[train_ids], dtype = np.float32)
+        centroids = train[rng.choice(train.shape[0], size = n_lists, replace = False)].copy()
+
+        for _ in range(self.n_iter):
+            assignments = np.argmax(train @ centroids.T, axis = 1)
+            sums        = np.zeros_like(centroids)
+            np.add.at(sums, assignments, train)
+
+            empty       = ~sums.any(axis = 1)
+            sums[empty] = train[rng.choice(train.shape[0], size = int(empty.sum()), replace = False)]
+            norms       = np.linalg.norm(sums, axis = 1, keepdims = True)
+            norms[norms == 0] = 1.0
+            centroids   = sums / norms
+
+        return centroids.astype(np.float32)
+
+    def build(self, embeddings : np.ndarray):
+        n               = embeddings.shape[0]
+        n_lists         = self.n_lists or max(1, int(np.sqrt(n)))
+        n_lists         = min(n_lists, n)
+
+        self.centroids  = self.__train_centroids(embeddings, n_lists)
+        assignments     = self.__assign(embeddings, self.centroids)
+        self.list_ids   = np.argsort(assignments, kind = "stable").astype(np.int64)
+        counts          = np.bincount(assignments, minlength = n_lists)
+        self.offsets    = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.n_lists    = n_lists
+        self.embeddings = embeddings
+        return self
+
+    def attach(self, embeddings : np.ndarray):
+        self.embeddings = embeddings
+        return self
+
+    def save(self, index_dir : str):
+        os.makedirs(index_dir, exist_ok = True)
+        np.save(os.path.join(index_dir, "ivf_centroids.npy"), self.centroids)
+        np.save(os.path.join(index_dir, "ivf_offsets.npy"),   self.offsets)
+        np.save(os.path.join(index_dir, "ivf_list_ids.npy"),  self.list_ids)
+
+    def load(self, index_dir : str):
+        self.centroids = np.load(os.path.join(index_dir, "ivf_centroids.npy"))
+        self.offsets   = np.load(os.path.join(index_dir, "ivf_offsets.npy"))
+        self.list_ids  = np.load(os.path.join(index_dir, "ivf_list_ids.npy"), mmap_mode = "r")
+        self.n_lists   = self.centroids.shape[0]
+        return self
+
+    def search(self,
+               query  : np.ndarray,
+               top_k  : int = 5,
+               nprobe : int = None,
+               **kwargs):
+
+        nprobe          = min(nprobe or self.nprobe, self.n_lists)
+        centroid_scores = self.centroids @ query
+        probe           = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe] if nprobe < self.n_lists else np.arange(self.n_lists)
+        candidates      = np.concatenate([self.list_ids[self.offsets[l] : self.offsets[l + 1]] for l in probe])
+
+        return exact_rerank(self.embeddings, query, candidates, top_k)
+
+class HNSWIndex:
+    kind       = "hnsw"
+    build_keys = ("M", "ef_construction")
+
+    def __init__(self,
+                 M               : int = 16,
+                 ef_construction : int = 200,
+                 ef              : int = 64,
+                 rerank_factor   : int = 4):
+
+        if hnswlib is None:
+            raise ImportError("HNSW 인덱스를 사용하려면 hnswlib 패키지가 필요합니다. (pip install hnswlib)")
+
+        self.M               = M
+        self.ef_construction = ef_construction
+        self.ef              = ef
+        self.rerank_factor   = rerank_factor
+        self.embeddings      = None
+        self.index           = None
+
+    def build(self, embeddings : np.ndarray):
+        n, dim     = embeddings.shape
+        self.index = hnswlib.Index(space = "ip", dim = dim)
+        self.index.init_index(max_elements = n, ef_construction = self.ef_construction, M = self.M)
+
+        for start in range(0, n, ASSIGN_CHUNK_SIZE):
+            chunk = np.asarray(embeddings[start : start + ASSIGN_CHUNK_SIZE], dtype = np.float32)
+            self.index.add_items(chunk, np.arange(start, start + chunk.shape[0]))
+
+        self.embeddings = embeddings
+        return self
+
+    def attach(self, embeddings : np.ndarray):
+        self.embeddings = embeddings
+        return self
+
+    def save(self, index_dir : str):
+        os.makedirs(index_dir, exist_ok = True)
+        self.index.save_index(os.path.join(index_dir, "hnsw.bin"))
+
+    def load(self, index_dir : str):
+        self.index = hnswlib.Index(space = "ip", dim = self.embeddings.shape[1])
+        self.index.load_index(os.path.join(index_dir, "hnsw.bin"))
+        return self
+
+    def search(self,
+               query         : np.ndarray,
+               top_k         : int = 5,
+               ef            : int = None,
+               rerank_factor : int = None,
+               **kwargs):
+
+        n_candidates = min(top_k * (rerank_factor or self.rerank_factor), self.index.get_current_count())
+        self.index.set_ef(max(ef or self.ef, n_candidates))
+        labels, _    = self.index.knn_query(query.reshape(1, -1), k = n_candidates)
+
+        return exact_rerank(self.embeddings, query, labels[0], top_k)
+
+INDEX_TYPES = {
+               BruteForceIndex.kind : BruteForceIndex,
+               IVFFlatIndex.kind    : IVFFlatIndex,
+               HNSWIndex.kind       : HNSWIndex
+              }
+
+def create_index(kind : str = "brute", **params):
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"지원되지 않는 인덱스 타입입니다: {kind} ({', '.join(INDEX_TYPES)} 중 선택하세요)")
+    return INDEX_TYPES[kind](**params)
+
+def split_build_params(kind : str, params : dict):
+    build_keys = INDEX_TYPES[kind].build_keys if kind in INDEX_TYPES else ()
+    build      = {key: value for key, value in params.items() if key in build_keys}
+    search     = {key: value for key, value in params.items() if key not in build_keys}
+    return build, search
+
+def read_meta(index_dir : str):
+    meta_path = os.path.join(index_dir, META_FILE)
+
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, "r", encoding = "utf-8") as f:
+        return json.load(f)
+
+def open_index(store_dir  : str,
+               embeddings : np.ndarray,
+               kind       : str = "brute",
+               lock_path  : str = None,
+               **params):
+
+    index     = create_index(kind, **params).attach(embeddings)
+
+    if kind == BruteForceIndex.kind:
+        return index
+
+    if store_dir is None:
+        return index.build(embeddings)
+
+    index_dir = os.path.join(store_dir, INDEX_DIR, kind)
+    meta      = {"kind": kind, "num_vectors": int(embeddings.shape[0]), "params": {key: getattr(index, key) for key in index.build_keys}}
+
+    if read_meta(index_dir) == meta:
+        return index.load(index_dir)
+
+    with file_lock(lock_path or os.path.join(store_dir, LOCK_FILE)):
+        if read_meta(index_dir) == meta:
+            return index.load(index_dir)
+
+        start_time = time()
+        index.build(embeddings)
+
+        if not os.path.isdir(store_dir):
+            return index
+
+        tmp_dir    = f"{index_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors = True)
+        index.save(tmp_dir)
+
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding = "utf-8") as f:
+            json.dump(meta, f)
+
+        replace_dir(tmp_dir, index_dir)
+
+    print(f"🧭 [ANNIndex] {kind} 인덱스 생성 완료: {index_dir} ({time() - start_time:.2f}초)")
+    return index
@@ -1,14 +1,14 @@
 import torch
-import gc
 import os
 import tempfile
 import librosa
-import speech_recognition as     sr
-import numpy              as     np
-from   time               import time
-from   transformers       import (Wav2Vec2ForCTC, 
-                                  Wav2Vec2Processor)
-from   moviepy            import  VideoFileClip
+import speech_recognition    as     sr
+import numpy                 as     np
+from   time                  import time
+from   transformers          import (Wav2Vec2ForCTC, 
+                                     Wav2Vec2Processor)
+from   moviepy               import  VideoFileClip
+from   models.model_registry import  get_model_registry
 
 AUDIO_MODEL = "facebook/wav2vec2-large-960h-lv60-self"
 
@@ -22,6 +22,8 @@ class AudioExtractor:
         self.mode       = mode
         self.model      = None
         self.processor  = None
+        self.model_key  = f"wav2vec2:{AUDIO_MODEL}"
+        self.registry   = get_model_registry()
 
     def __enter__(self):
         self.start_time = time()
@@ -32,20 +34,19 @@ class AudioExtractor:
         elapsed_time = time() - self.start_time
         print(f"⏳ [AudioExtractor] 전체 실행 시간: {elapsed_time:.2f}초")
 
+    def __build_model(self):
+        return (Wav2Vec2ForCTC.from_pretrained(AUDIO_MODEL).to("cuda"),
+                Wav2Vec2Processor.from_pretrained(AUDIO_MODEL))
+
     def __load_model(self):
         if self.model is None or self.processor is None:
-            self.model = Wav2Vec2ForCTC.from_pretrained(AUDIO_MODEL).to("cuda")
-            self.processor = Wav2Vec2Processor.from_pretrained(AUDIO_MODEL)
+            self.model, self.processor = self.registry.acquire(self.model_key, self.__build_model)
 
     def __unload_model(self):
         if self.model is not None:
-            torch.cuda.synchronize()
-            del self.model
-            del self.processor
-            self.model = None
+            self.model     = None
             self.processor = None
-            gc.collect()
-            torch.cuda.empty_cache()
+            self.registry.release(self.model_key)
 
     def __extract_audio_np(self):
         try:
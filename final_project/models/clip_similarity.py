@@ -1,19 +1,70 @@
-import os
-import gc
-import cv2
-import glob
+import queue
 import torch
-from   PIL          import Image
-from   time         import time
-from   transformers import CLIPProcessor, CLIPModel
+import threading
+import numpy                   as np
+import torch.nn.functional     as F
+from   collections             import OrderedDict
+from   time                    import (perf_counter,
+                                       time)
+from   transformers            import CLIPProcessor, CLIPModel
+from   models.frame_sampler    import (FrameSampler,
+                                       av,
+                                       sample_keyframes)
+from   models.interval_planner import (merge_intervals,
+                                       naive_sample_count,
+                                       plan_sample_times)
+from   models.model_registry   import get_model_registry
+from   models.tracing          import get_tracer
+from   models.video_catalog    import get_video_catalog
 
-MODEL_NAME = "openai/clip-vit-base-patch32"
+MODEL_NAME           = "openai/clip-vit-base-patch32"
+CLIP_BATCH_SIZE      = 32
+DECODE_QUEUE_BATCHES = 2
+SEARCH_MODES         = ("exhaustive", "coarse_to_fine", "keyframe")
+COARSE_INTERVAL      = 2000
+REFINE_TOP           = 3
+MAX_SEARCH_FRAMES    = 64
+MAX_KEYFRAME_GAP     = 4000
+KEYFRAME_WINDOW      = 1000
+KEYFRAME_WINDOW_STEP = 250
+TEXT_CACHE_SIZE      = 1024
+
+_TEXT_FEATURES       = OrderedDict()
+_TEXT_FEATURES_LOCK  = threading.Lock()
 
 class ClipVideoProcessor:
-    def __init__(self):
-        self.device         = "cuda" if torch.cuda.is_available() else "cpu"
-        self.clip_model     = None
-        self.clip_processor = None
+    def __init__(self, 
+                 batch_size        : int = CLIP_BATCH_SIZE,
+                 sampler_backend   : str = "auto",
+                 search_mode       : str = "exhaustive",
+                 coarse_interval   : int = COARSE_INTERVAL,
+                 refine_top        : int = REFINE_TOP,
+                 max_search_frames : int = MAX_SEARCH_FRAMES,
+                 max_keyframe_gap  : int = MAX_KEYFRAME_GAP,
+                 keyframe_window   : int = KEYFRAME_WINDOW,
+                 use_text_cache    : bool = True):
+        
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"지원되지 않는 탐색 모드입니다: {search_mode} ({', '.join(SEARCH_MODES)} 중 선택하세요)")
+        
+        if search_mode == "keyframe" and av is None:
+            raise ImportError("keyframe 탐색 모드를 사용하려면 PyAV 패키지가 필요합니다. (pip install av)")
+        
+        self.device              = "cuda" if torch.cuda.is_available() else "cpu"
+        self.batch_size          = max(1, batch_size)
+        self.sampler_backend     = sampler_backend
+        self.search_mode         = search_mode
+        self.coarse_interval     = coarse_interval
+        self.refine_top          = refine_top
+        self.max_search_frames   = max_search_frames
+        self.max_keyframe_gap    = max_keyframe_gap
+        self.keyframe_window     = keyframe_window
+        self.use_text_cache      = use_text_cache
+        self.last_decoded_frames = 0
+        self.clip_model          = None
+        self.clip_processor      = None
+        self.model_key           = f"clip:{MODEL_NAME}:{self.device}"
+        self.registry            = get_model_registry()
         
     def __enter__(self):
         self.start_time = time()
@@ -24,89 +75,530 @@ class ClipVideoProcessor:
         elapsed_time = time() - self.start_time
         print(f"⏳ [ClipVideoProcessor] 전체 실행 시간: {elapsed_time:.2f}초")
     
+    def __build_model(self):
+        return (CLIPModel.from_pretrained(MODEL_NAME).to(self.device).eval(),
+                CLIPProcessor.from_pretrained(MODEL_NAME))
+    
     def __load_model(self):
-        if self.clip_model is None or self.clip_processor:
-            self.clip_model     = CLIPModel.from_pretrained(MODEL_NAME).to(self.device)
-            self.clip_processor = CLIPProcessor.from_pretrained(MODEL_NAME)
+        if self.clip_model is None or self.clip_processor is None:
+            self.clip_model, self.clip_processor = self.registry.acquire(self.model_key, self.__build_model)
     
     def __unload_model(self):
         if self.clip_model is not None:
-            torch.cuda.synchronize()
-            del self.clip_model
-            del self.clip_processor
             self.clip_model     = None
             self.clip_processor = None
-            gc.collect()
-            torch.cuda.empty_cache()
+            self.registry.release(self.model_key)
             
     def find_video_file_by_movie_id(self, 
                                     video_dir : str, 
                                     movie_id  : str):
         
-        pattern = os.path.join(video_dir, f"*{movie_id}*.mp4")
-        files   = glob.glob(pattern)
-        
-        if files:
-            return files[0]
-        else:
-            return None
+        return get_video_catalog([video_dir]).resolve(movie_id)
 
     def find_best_frame_in_interval(self, 
                                     video_file        : str, 
                                     start_timestamp   : int, 
                                     end_timestamp     : int, 
                                     input_text        : str, 
-                                    sampling_interval : int = 500):
-        self.__load_model()
+                                    sampling_interval : int  = 500,
+                                    text_features     : dict = None):
         
-        text_inputs   = self.clip_processor(text           = [input_text], 
+        return self.find_best_frames_in_video(video_file, 
+                                              [(start_timestamp, end_timestamp, input_text)], 
+                                              sampling_interval,
+                                              text_features)[0]
+
+    def __encode_texts(self, texts : list):
+        text_inputs   = self.clip_processor(text           = texts, 
                                             return_tensors = "pt", 
                                             padding        = True
                                             ).to(self.device)
         with torch.no_grad():
             text_features = self.clip_model.get_text_features(**text_inputs)
             
-        text_features = text_features / text_features.norm(dim = -1, keepdim = True)
+        return text_features / text_features.norm(dim = -1, keepdim = True)
+
+    def encode_text_features(self, texts : list):
+        texts    = list(dict.fromkeys(texts))
+        features = {}
+        
+        if self.use_text_cache:
+            with _TEXT_FEATURES_LOCK:
+                for text in texts:
+                    if (MODEL_NAME, text) in _TEXT_FEATURES:
+                        _TEXT_FEATURES.move_to_end((MODEL_NAME, text))
+                        features[text] = _TEXT_FEATURES[(MODEL_NAME, text)]
+        
+        missing = [text for text in texts if text not in features]
+        
+        if missing:
+            loaded = self.clip_model is not None
+            
+            if not loaded:
+                self.__load_model()
+            
+            try:
+                with get_tracer().span("clip_score", texts = len(missing)):
+                    encoded = self.__encode_texts(missing).float().cpu().numpy()
+            finally:
+                if not loaded:
+                    self.__unload_model()
+            
+            features.update(zip(missing, encoded))
+            
+            if self.use_text_cache:
+                with _TEXT_FEATURES_LOCK:
+                    for text, feature in zip(missing, encoded):
+                        _TEXT_FEATURES[(MODEL_NAME, text)] = feature
+                    
+                    while len(_TEXT_FEATURES) > TEXT_CACHE_SIZE:
+                        _TEXT_FEATURES.popitem(last = False)
         
-        cap = cv2.VideoCapture(video_file)
+        return {text: features[text] for text in texts}
+
+    def encode_texts(self, texts : list):
+        features = self.encode_text_features(texts)
+        return np.stack([features[text] for text in texts])
+
+    def __target_text_features(self, 
+                               targets       : list, 
+                               text_features : dict = None):
+        
+        text_features = text_features if text_features is not None else self.encode_text_features([text for _, _, text in targets])
+        return torch.from_numpy(np.stack([text_features[text] for _, _, text in targets])).to(self.device)
+
+    def __run_pipeline(self, 
+                       frames, 
+                       on_batch):
+        
+        frame_queue  = queue.Queue(maxsize = DECODE_QUEUE_BATCHES * self.batch_size)
+        stop_event   = threading.Event()
+        timings      = {"decode": 0.0, "clip_score": 0.0, "frames": 0}
+        decoder      = threading.Thread(target = self.__decode_frames, 
+                                        args   = (frames, frame_queue, stop_event, timings), 
+                                        daemon = True)
+        decoder.start()
+        
+        try:
+            batch = []
+            while True:
+                item = frame_queue.get()
+                
+                if item is not None:
+                    batch.append(item)
+                
+                if batch and (item is None or len(batch) == self.batch_size):
+                    start_time    = perf_counter()
+                    times, frames = zip(*batch)
+                    on_batch(times, frames, self.__encode_images(frames))
+                    timings["clip_score"] += perf_counter() - start_time
+                    batch = []
+                
+                if item is None:
+                    break
+        finally:
+            stop_event.set()
+            decoder.join()
+            
+            tracer = get_tracer()
+            tracer.record("decode",     timings["decode"],     frames = timings["frames"], backend = self.sampler_backend)
+            tracer.record("clip_score", timings["clip_score"], frames = timings["frames"])
+
+    def find_best_frames_in_video(self, 
+                                  video_file        : str, 
+                                  targets           : list, 
+                                  sampling_interval : int  = 500,
+                                  text_features     : dict = None):
+        
+        text_features = self.__target_text_features(targets, text_features)
         
-        if not cap.isOpened():
+        self.__load_model()
+        
+        sampler = FrameSampler(video_file, self.sampler_backend)
+        
+        if not sampler.open():
             print("Error: 영상 파일을 열 수 없습니다.", video_file)
-            return None, None, None
+            self.__unload_model()
+            return [(None, None, None)] * len(targets)
+
+        intervals     = [(start_timestamp, end_timestamp) for start_timestamp, end_timestamp, _ in targets]
+        bounds        = torch.tensor(intervals, dtype = torch.float64, device = self.device)
+        best          = [[-1.0, None, None] for _ in targets]
+        
+        self.last_decoded_frames = 0
+        
+        try:
+            if self.search_mode == "coarse_to_fine":
+                self.__coarse_to_fine(sampler, intervals, sampling_interval, text_features, bounds, best)
+            elif self.search_mode == "keyframe":
+                self.__keyframe_search(sampler, video_file, intervals, sampling_interval, text_features, bounds, best)
+            else:
+                sample_times = plan_sample_times(intervals, sampling_interval)
+                
+                print(f"🧩 [ClipVideoProcessor] 구간 {len(intervals)}개 -> 병합 {len(merge_intervals(intervals, sampling_interval))}개, "
+                      f"프레임 {len(sample_times)}개 디코딩 (구간별 처리 시 {naive_sample_count(intervals, sampling_interval)}개)")
+                
+                self.__run_pipeline(sampler.sample(sample_times), 
+                                    lambda times, frames, image_features: self.__score_batch(times, frames, image_features, text_features, bounds, best))
+        finally:
+            sampler.close()
+        
+        self.__unload_model()
+        return [(best_frame, best_time, best_similarity) for best_similarity, best_frame, best_time in best]
 
-        best_similarity = -1.0
-        best_frame      = None
-        best_time       = None
-        t               = start_timestamp
+    def __coarse_to_fine(self, 
+                         sampler       : FrameSampler, 
+                         intervals     : list, 
+                         min_step      : int, 
+                         text_features : torch.Tensor, 
+                         bounds        : torch.Tensor, 
+                         best          : list):
         
-        while t <= end_timestamp:
-            cap.set(cv2.CAP_PROP_POS_MSEC, t)
-            ret, frame   = cap.read()
+        scores = [{} for _ in intervals]
+        
+        def on_batch(times, frames, image_features):
+            self.__score_batch(times, frames, image_features, text_features, bounds, best)
+            similarities = (text_features @ image_features.T).tolist()
             
-            if not ret:
-                t += sampling_interval
-                continue
+            for target_idx, (start, end) in enumerate(intervals):
+                for t, similarity in zip(times, similarities[target_idx]):
+                    if start <= t <= end:
+                        scores[target_idx][t] = similarity
+        
+        step = max(self.coarse_interval, min_step)
+        
+        while len(plan_sample_times(intervals, step)) > self.max_search_frames and step < 2**30:
+            step *= 2
+        
+        sample_times = plan_sample_times(intervals, step)
+        requested    = set()
+        rounds       = 0
+        
+        while sample_times:
+            requested.update(sample_times)
+            self.__run_pipeline(sampler.sample(sample_times), on_batch)
+            rounds += 1
+            
+            if step <= min_step:
+                break
+            
+            step       = max(min_step, step // 2)
+            candidates = set()
+            
+            for target_idx, (start, end) in enumerate(intervals):
+                for t in sorted(scores[target_idx], key = scores[target_idx].get, reverse = True)[: self.refine_top]:
+                    candidates.update(candidate for candidate in (t - step, t + step) if start <= candidate <= end)
+            
+            sample_times = sorted(candidates - requested)[: max(0, self.max_search_frames - len(requested))]
+        
+        print(f"🧩 [ClipVideoProcessor] coarse-to-fine: 구간 {len(intervals)}개, {rounds}단계, 프레임 {self.last_decoded_frames}개 디코딩 "
+              f"(전수 탐색 시 {len(plan_sample_times(intervals, min_step))}개)")
+
+    def __keyframe_search(self, 
+                          sampler       : FrameSampler, 
+                          video_file    : str, 
+                          intervals     : list, 
+                          min_step      : int, 
+                          text_features : torch.Tensor, 
+                          bounds        : torch.Tensor, 
+                          best          : list):
+        
+        keyframe_times = []
+        
+        def score(times, frames, image_features):
+            self.__score_batch(times, frames, image_features, text_features, bounds, best)
+        
+        def on_keyframes(times, frames, image_features):
+            keyframe_times.extend(times)
+            score(times, frames, image_features)
+        
+        self.__run_pipeline(sample_keyframes(video_file, intervals), on_keyframes)
+        
+        num_keyframes = len(keyframe_times)
+        decoded       = set(keyframe_times)
+        keyframe_times.sort()
+        gaps          = []
+        
+        for start, end in intervals:
+            inside = [t for t in keyframe_times if start <= t <= end]
+            points = [start] + inside + [end]
+            gaps.extend((a, b) for a, b in zip(points, points[1:]) if b - a > self.max_keyframe_gap or not inside)
+        
+        fallback_times = [t for t in plan_sample_times(gaps, min_step) if t not in decoded]
+        
+        if fallback_times:
+            self.__run_pipeline(sampler.sample(fallback_times), score)
+            decoded.update(fallback_times)
+        
+        window_times = set()
+        
+        if self.keyframe_window > 0:
+            step = int(max(1, min(min_step, KEYFRAME_WINDOW_STEP)))
             
-            frame_rgb    = cv2.cvtColor(frame, 
-                                      cv2.COLOR_BGR2RGB)
-            pil_image    = Image.fromarray(frame_rgb)
-            image_inputs = self.clip_processor(images         = pil_image, 
-                                               return_tensors = "pt"
-                                               ).to(self.device)
+            for (start, end), (_, _, best_time) in zip(intervals, best):
+                if best_time is not None:
+                    center = int(round(best_time))
+                    window_times.update(t for t in range(center - self.keyframe_window, center + self.keyframe_window + 1, step) 
+                                        if start <= t <= end and t not in decoded)
+        
+        if window_times:
+            self.__run_pipeline(sampler.sample(sorted(window_times)), score)
+        
+        print(f"🧩 [ClipVideoProcessor] keyframe: 구간 {len(intervals)}개, 키프레임 {num_keyframes}개 + 보충 {len(fallback_times)}개 + 주변 {len(window_times)}개 디코딩 "
+              f"(전수 탐색 시 {len(plan_sample_times(intervals, min_step))}개)")
+
+    def __encode_pixels(self, pixel_values : torch.Tensor):
+        features = []
+        
+        for start in range(0, pixel_values.shape[0], self.batch_size):
             with torch.no_grad():
-                image_features = self.clip_model.get_image_features(**image_inputs)
+                image_features = self.clip_model.get_image_features(pixel_values = pixel_values[start : start + self.batch_size])
+            
+            features.append(image_features / image_features.norm(dim = -1, keepdim = True))
+        
+        return torch.cat(features)
+
+    def find_best_frames_parallel(self, 
+                                  jobs              : list, 
+                                  decode_pool, 
+                                  sampling_interval : int  = 500,
+                                  text_features     : dict = None):
+        
+        text_features = text_features if text_features is not None else self.encode_text_features([text for _, targets in jobs for _, _, text in targets])
+        
+        self.__load_model()
+        
+        best          = [[[-1.0, None, None] for _ in targets] for _, targets in jobs]
+        job_features  = [self.__target_text_features(targets, text_features) for _, targets in jobs]
+        job_bounds    = [torch.tensor([(start, end) for start, end, _ in targets], dtype = torch.float64, device = self.device) for _, targets in jobs]
+        decode_jobs   = [(video_file, plan_sample_times([(start, end) for start, end, _ in targets], sampling_interval)) for video_file, targets in jobs]
+        pending       = []
+        
+        self.last_decoded_frames = 0
+        
+        def flush():
+            image_features = self.__encode_pixels(torch.cat([pixel_values for _, _, pixel_values in pending]))
+            offset         = 0
+            
+            for job_idx, decoded, pixel_values in pending:
+                count  = len(decoded.times)
+                frames = [frame[..., ::-1] for frame in decoded.frames]
+                self.__score_batch(tuple(decoded.times), frames, image_features[offset : offset + count], 
+                                   job_features[job_idx], job_bounds[job_idx], best[job_idx])
                 
-            image_features = image_features / image_features.norm(dim = -1, keepdim = True)
-            similarity     = (text_features * image_features).sum(dim = -1).item()
+                for target_best in best[job_idx]:
+                    if target_best[1] is not None and not target_best[1].flags.owndata:
+                        target_best[1] = target_best[1].copy()
+                
+                del frames
+                decoded.release()
+                offset += count
             
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_frame      = frame.copy()
-                best_time       = t
+            pending.clear()
+        
+        start_time   = time()
+        total_frames = 0
+        score_time   = 0.0
+        
+        results      = decode_pool.decode(decode_jobs)
+        
+        try:
+            for job_idx, decoded in results:
+                if decoded is None:
+                    print("Error: 영상 파일을 열 수 없습니다.", jobs[job_idx][0])
+                    continue
+                
+                score_start   = perf_counter()
+                
+                try:
+                    pixel_values = self.__preprocess(decoded.frames, rgb = True)
+                except Exception:
+                    decoded.release()
+                    raise
                 
-            t += sampling_interval
+                pending.append((job_idx, decoded, pixel_values))
+                total_frames += len(decoded.times)
+                
+                if sum(len(decoded.times) for _, decoded, _ in pending) >= self.batch_size:
+                    flush()
+                score_time   += perf_counter() - score_start
+            
+            if pending:
+                score_start  = perf_counter()
+                flush()
+                score_time  += perf_counter() - score_start
+        finally:
+            results.close()
+            
+            for _, decoded, _ in pending:
+                decoded.release()
+            self.__unload_model()
         
-        cap.release()
+        elapsed_time = time() - start_time
+        tracer       = get_tracer()
+        tracer.record("decode",     max(0.0, elapsed_time - score_time), frames = total_frames, videos = len(jobs), workers = decode_pool.num_workers)
+        tracer.record("clip_score", score_time,                          frames = total_frames, videos = len(jobs))
         
-        self.__unload_model()
-        return best_frame, best_time, best_similarity
+        print(f"⚡ [ClipVideoProcessor] 영상 {len(jobs)}개 병렬 디코딩 및 배치 스코어링: 프레임 {total_frames}개 ({elapsed_time:.2f}초)")
+        
+        return [[(best_frame, best_time, best_similarity) for best_similarity, best_frame, best_time in job_best] for job_best in best]
+
+    def encode_video_frames(self, 
+                            video_file        : str, 
+                            sampling_interval : int = 500):
+        
+        sampler = FrameSampler(video_file, self.sampler_backend)
+        
+        if not sampler.open():
+            print("Error: 영상 파일을 열 수 없습니다.", video_file)
+            return None, None
+        
+        self.__load_model()
+        
+        duration_ms  = int(sampler.num_frames / sampler.fps * 1000) if sampler.fps else 0
+        sample_times = list(range(0, max(duration_ms, 1), sampling_interval))
+        times        = []
+        features     = []
+        
+        def collect(batch_times, frames, image_features):
+            times.extend(batch_times)
+            features.append(image_features.float().cpu().numpy())
+        
+        try:
+            self.__run_pipeline(sampler.sample(sample_times), collect)
+        finally:
+            sampler.close()
+            self.__unload_model()
+        
+        if not times:
+            return None, None
+        
+        return np.asarray(times, dtype = np.int64), np.concatenate(features).astype(np.float16)
+
+    def best_times_from_index(self, 
+                              targets       : list, 
+                              times         : np.ndarray, 
+                              embeddings    : np.ndarray,
+                              text_features : dict = None):
+        
+        texts         = list(dict.fromkeys(text for _, _, text in targets))
+        text_features = text_features if text_features is not None else self.encode_text_features(texts)
+        best          = []
+        
+        with get_tracer().span("clip_score", frames = len(times), source = "index"):
+            similarities = np.stack([text_features[text] for text in texts]) @ embeddings.astype(np.float32).T
+            
+            for start_timestamp, end_timestamp, text in targets:
+                row = similarities[texts.index(text)]
+                lo  = int(np.searchsorted(times, start_timestamp, side = "left"))
+                hi  = int(np.searchsorted(times, end_timestamp,   side = "right"))
+                
+                if hi > lo:
+                    idx = lo + int(np.argmax(row[lo:hi]))
+                else:
+                    idx = int(np.argmin(np.abs(times - (start_timestamp + end_timestamp) / 2)))
+                
+                best.append((int(times[idx]), float(row[idx])))
+        
+        return best
+
+    def read_frames(self, 
+                    video_file : str, 
+                    times      : list):
+        
+        with get_tracer().span("decode", frames = len(times), backend = self.sampler_backend):
+            sampler = FrameSampler(video_file, self.sampler_backend)
+            
+            if not sampler.open():
+                return {}
+            
+            try:
+                return dict(sampler.sample(sorted(set(times))))
+            finally:
+                sampler.close()
+
+    @staticmethod
+    def __put_frame(frame_queue : queue.Queue, 
+                    item, 
+                    stop_event  : threading.Event):
+        
+        while not stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout = 0.1)
+                return
+            except queue.Full:
+                continue
+
+    def __decode_frames(self, 
+                        frames, 
+                        frame_queue  : queue.Queue, 
+                        stop_event   : threading.Event,
+                        timings      : dict):
+        
+        frames = iter(frames)
+        
+        while not stop_event.is_set():
+            start_time         = perf_counter()
+            item               = next(frames, None)
+            timings["decode"] += perf_counter() - start_time
+            
+            if item is None:
+                break
+            
+            timings["frames"] += 1
+            self.__put_frame(frame_queue, item, stop_event)
+        
+        self.__put_frame(frame_queue, None, stop_event)
+
+    def __preprocess(self, 
+                     frames, 
+                     rgb    : bool = False):
+        image_processor = self.clip_processor.image_processor
+        crop_size       = image_processor.crop_size["height"]
+        mean            = torch.tensor(image_processor.image_mean, device = self.device).view(1, 3, 1, 1)
+        std             = torch.tensor(image_processor.image_std,  device = self.device).view(1, 3, 1, 1)
+        
+        pixels          = torch.from_numpy(frames if isinstance(frames, np.ndarray) else np.stack(frames)).to(self.device)
+        pixels          = (pixels if rgb else pixels[..., [2, 1, 0]]).permute(0, 3, 1, 2).float()
+        height, width   = pixels.shape[-2:]
+        scale           = crop_size / min(height, width)
+        resized_size    = (max(crop_size, round(height * scale)), max(crop_size, round(width * scale)))
+        pixels          = F.interpolate(pixels, 
+                                        size          = resized_size, 
+                                        mode          = "bicubic", 
+                                        align_corners = False, 
+                                        antialias     = True).clamp(0, 255)
+        top             = (resized_size[0] - crop_size) // 2
+        left            = (resized_size[1] - crop_size) // 2
+        pixels          = pixels[:, :, top : top + crop_size, left : left + crop_size]
+        
+        return (pixels / 255.0 - mean) / std
+
+    def __encode_images(self, frames : list):
+        pixel_values   = self.__preprocess(frames)
+        
+        with torch.no_grad():
+            image_features = self.clip_model.get_image_features(pixel_values = pixel_values)
+        
+        return image_features / image_features.norm(dim = -1, keepdim = True)
+
+    def __score_batch(self, 
+                      times          : tuple, 
+                      frames         : tuple, 
+                      image_features : torch.Tensor, 
+                      text_features  : torch.Tensor, 
+                      bounds         : torch.Tensor, 
+                      best           : list):
+        
+        self.last_decoded_frames += len(times)
+        
+        similarities   = text_features @ image_features.T
+        sample_times   = torch.tensor(times, dtype = torch.float64, device = self.device)
+        in_range       = (sample_times >= bounds[:, :1]) & (sample_times <= bounds[:, 1:])
+        similarities   = similarities.masked_fill(~in_range, float("-inf"))
+        
+        batch_best, batch_idx = similarities.max(dim = 1)
+        
+        for target_idx, (similarity, frame_idx) in enumerate(zip(batch_best.tolist(), batch_idx.tolist())):
+            if similarity > best[target_idx][0]:
+                best[target_idx] = [similarity, frames[frame_idx], times[frame_idx]]
@@ -0,0 +1,143 @@
+import os
+import threading
+import numpy                as np
+import multiprocessing
+from   concurrent.futures   import (FIRST_COMPLETED,
+                                    ProcessPoolExecutor,
+                                    wait)
+from   multiprocessing      import shared_memory
+from   models.frame_sampler import FrameSampler
+
+DECODE_WORKERS   = 4
+MP_CONTEXT       = "spawn"
+
+_DECODE_POOLS    = {}
+_DECODE_LOCK     = threading.Lock()
+
+def decode_to_shared_memory(video_file   : str,
+                            sample_times : list,
+                            backend      : str = "auto"):
+
+    sampler = FrameSampler(video_file, backend, rgb = True)
+
+    if not sampler.open():
+        return None
+
+    shm    = None
+    times  = []
+    frames = None
+
+    try:
+        for t, frame in sampler.sample(sample_times):
+            if shm is None:
+                shm    = shared_memory.SharedMemory(create = True, size = max(1, len(sample_times) * frame.nbytes))
+                frames = np.ndarray((len(sample_times), *frame.shape), dtype = np.uint8, buffer = shm.buf)
+
+            frames[len(times)] = frame
+            times.append(t)
+    except Exception:
+        if shm is not None:
+            del frames
+            shm.close()
+            shm.unlink()
+        raise
+    finally:
+        sampler.close()
+
+    if shm is None:
+        return None
+
+    shape  = (len(times), *frames.shape[1:])
+    del frames
+    shm.close()
+    return shm.name, shape, times
+
+def shot_frame_indices(shot_times   : list,
+                       fps          : float,
+                       total_frames : int,
+                       num_seg      : int):
+
+    for i in range(len(shot_times) - 1):
+        start_time = shot_times[i]
+        end_time   = shot_times[i + 1]
+
+        start_shot = min(int(start_time * fps), total_frames - 1)
+        end_shot   = min(int(end_time * fps), total_frames - 1)
+
+        indices    = np.linspace(start_shot, end_shot, num_seg).astype(int)
+        yield np.clip(indices, 0, total_frames - 1), (start_time, end_time)
+
+class DecodedFrames:
+    def __init__(self,
+                 shm_name : str,
+                 shape    : tuple,
+                 times    : list):
+
+        self.shm    = shared_memory.SharedMemory(name = shm_name)
+        self.frames = np.ndarray(shape, dtype = np.uint8, buffer = self.shm.buf)
+        self.times  = times
+
+    def release(self):
+        if self.shm is None:
+            return
+
+        self.frames = None
+        self.shm.close()
+        self.shm.unlink()
+        self.shm    = None
+
+class DecodePool:
+    def __init__(self,
+                 num_workers  : int = DECODE_WORKERS,
+                 max_inflight : int = None,
+                 backend      : str = "auto",
+                 mp_context   : str = MP_CONTEXT):
+
+        self.num_workers  = max(1, min(num_workers, os.cpu_count() or 1))
+        self.max_inflight = max_inflight or 2 * self.num_workers
+        self.backend      = backend
+        self.executor     = ProcessPoolExecutor(max_workers = self.num_workers,
+                                                mp_context  = multiprocessing.get_context(mp_context))
+
+    def decode(self, jobs : list):
+        pending = {}
+        next_id = 0
+
+        try:
+            while next_id < len(jobs) or pending:
+                while next_id < len(jobs) and len(pending) < self.max_inflight:
+                    video_file, sample_times = jobs[next_id]
+                    future                   = self.executor.submit(decode_to_shared_memory, video_file, list(sample_times), self.backend)
+                    pending[future]          = next_id
+                    next_id                 += 1
+
+                done, _ = wait(pending, return_when = FIRST_COMPLETED)
+
+                for future in done:
+                    job_idx = pending.pop(future)
+                    result  = future.result()
+                    yield job_idx, DecodedFrames(*result) if result is not None else None
+        finally:
+            for future in pending:
+                if future.cancel() or future.exception() is not None:
+                    continue
+
+                if future.result() is not None:
+                    DecodedFrames(*future.result()).release()
+
+    def shutdown(self):
+        self.executor.shutdown(wait = True, cancel_futures = True)
+
+def get_decode_pool(num_workers : int = DECODE_WORKERS,
+                    backend     : str = "auto"):
+
+    key = (num_workers, backend)
+
+    with _DECODE_LOCK:
+        pool = _DECODE_POOLS.get(key)
+
+        if pool is None:
+            pool               = DecodePool(num_workers, backend = backend)
+            _DECODE_POOLS[key] = pool
+
+    return pool
@@ -1,8 +1,25 @@
 import os
-import cv2
+import threading
+from   collections             import OrderedDict
 from   time                    import time
 from   models.angle_similarity import AngleSimilarity
-from   models.clip_similarity  import ClipVideoProcessor
+from   models.clip_similarity  import (CLIP_BATCH_SIZE,
+                                       ClipVideoProcessor)
+from   models.decode_pool      import (DECODE_WORKERS,
+                                       get_decode_pool)
+from   models.frame_index      import get_frame_index
+from   models.interval_planner import group_hits_by_video
+from   models.query_encoder    import get_query_encoder
+from   models.segment_store    import (open_store,
+                                       parse_timestamp_key)
+from   models.thumbnail_cache  import get_thumbnail_cache
+from   models.tracing          import get_tracer
+from   models.video_catalog    import get_video_catalog
+
+REFINE_MEMO_SIZE  = 4096
+
+_REFINE_MEMO      = OrderedDict()
+_REFINE_MEMO_LOCK = threading.Lock()
 
 class FrameExtractor:
     def __init__(self, 
@@ -11,7 +28,14 @@ class FrameExtractor:
                  npz_file          : str,
                  output_dir        : str = "extracted_frames",
                  top_k             : int = 5, 
-                 sampling_interval : int = 500):
+                 sampling_interval : int = 500,
+                 index_type        : str = "brute",
+                 search_params     : dict = None,
+                 clip_batch_size   : int = CLIP_BATCH_SIZE,
+                 frame_index_dir   : str = None,
+                 decode_workers    : int = DECODE_WORKERS,
+                 search_mode       : str = "exhaustive",
+                 thumbnail_size    : int = None):
         
         self.video_dir1        = video_dir1
         self.video_dir2        = video_dir2
@@ -19,10 +43,19 @@ class FrameExtractor:
         self.output_dir        = output_dir
         self.top_k             = top_k
         self.sampling_interval = sampling_interval
+        self.index_type        = index_type
+        self.search_params     = search_params
+        self.thumbnail_size    = thumbnail_size
         
         os.makedirs(self.output_dir, exist_ok=True)
         
-        self.clip_processor = ClipVideoProcessor()
+        self.clip_processor = ClipVideoProcessor(batch_size  = clip_batch_size,
+                                                 search_mode = search_mode)
+        self.query_encoder  = get_query_encoder()
+        self.video_catalog  = get_video_catalog([self.video_dir1, self.video_dir2])
+        self.frame_index    = get_frame_index(frame_index_dir) if frame_index_dir else None
+        self.decode_workers = decode_workers
+        self.thumbnails     = get_thumbnail_cache(self.output_dir)
     
     def __enter__(self):
         self.start_time = time()
@@ -35,67 +68,189 @@ class FrameExtractor:
     
     @staticmethod
     def parse_timestamp_key(ts_key):
-
-        parts = ts_key.split("_")
-        if len(parts) == 2:
-            try:
-                start = float(parts[0])
-                end   = float(parts[1])
-                return start, end
-            
-            except ValueError:
-                pass
-        try:
-            ts = float(ts_key)
-            return ts, ts + 2000
-        
-        except ValueError:
-            return 0, 2000
+        return parse_timestamp_key(ts_key)
     
     def extract_frames(self, 
-                       input_text : str):
+                       input_text      : str,
+                       query_embedding = None):
         
         angle_model  = AngleSimilarity(input_text, 
                                        self.npz_file, 
-                                       self.top_k)
+                                       self.top_k,
+                                       query_encoder   = self.query_encoder,
+                                       index_type      = self.index_type,
+                                       search_params   = self.search_params,
+                                       query_embedding = query_embedding)
         top_results  = angle_model.results
-        saved_frames = []
+        hits         = [{
+                         "query_idx"  : 0,
+                         "rank"       : idx,
+                         "video_id"   : video_id,
+                         "ts_key"     : ts_key,
+                         "angle_sim"  : angle_sim,
+                         "input_text" : input_text
+                        } for idx, (video_id, ts_key, angle_sim) in enumerate(top_results, start=1)]
+        
+        return self.__refine_hits(hits, num_queries = 1)[0]
+
+    def __find_video_file(self, video_id : str):
+        return self.video_catalog.resolve(video_id)
+    
+    def __load_frame_index(self, 
+                           video_id   : str, 
+                           video_file : str):
+        
+        if self.frame_index is None:
+            return None
         
-        for idx, (video_id, ts_key, angle_sim) in enumerate(top_results, start=1):
-            start_timestamp, end_timestamp = self.parse_timestamp_key(ts_key)
-            video_file     = self.clip_processor.find_video_file_by_movie_id(self.video_dir1, 
-                                                                             video_id)
+        for key in dict.fromkeys([video_id, os.path.splitext(os.path.basename(video_file))[0]]):
+            indexed = self.frame_index.load(key, video_file, self.sampling_interval)
             
-            if video_file is None:
-                video_file = self.clip_processor.find_video_file_by_movie_id(self.video_dir2, 
-                                                                             video_id)
-                
-            if video_file is None:
-                print(f"Error: 영상 파일을 찾을 수 없습니다. Movie ID: {video_id}")
-                continue
+            if indexed is not None:
+                return indexed
+        
+        return None
+    
+    def __memo_key(self, 
+                   video_file : str, 
+                   target     : tuple):
+        
+        stat = os.stat(video_file)
+        return (video_file, stat.st_size, stat.st_mtime, *target, self.sampling_interval, self.clip_processor.search_mode)
+    
+    def __memo_get(self, key : tuple):
+        with _REFINE_MEMO_LOCK:
+            value = _REFINE_MEMO.get(key)
             
-            best_frame, best_time, clip_sim = self.clip_processor.find_best_frame_in_interval(video_file, 
-                                                                                              start_timestamp, 
-                                                                                              end_timestamp, 
-                                                                                              input_text, 
-                                                                                              self.sampling_interval)
+            if value is not None:
+                _REFINE_MEMO.move_to_end(key)
+            return value
+    
+    def __memo_put(self, 
+                   key   : tuple, 
+                   value : tuple):
+        
+        with _REFINE_MEMO_LOCK:
+            _REFINE_MEMO[key] = value
+            _REFINE_MEMO.move_to_end(key)
             
-            if best_frame is None:
-                print(f"Movie ID: {video_id} 구간 ({start_timestamp}ms ~ {end_timestamp}ms)에서 프레임 추출 실패")
-                continue
+            while len(_REFINE_MEMO) > REFINE_MEMO_SIZE:
+                _REFINE_MEMO.popitem(last = False)
+    
+    def __refine_hits(self, 
+                      hits        : list, 
+                      num_queries : int):
+        
+        saved_frames = [{} for _ in range(num_queries)]
+        videos       = []
+        tracer       = get_tracer()
+        
+        with tracer.span("file_lookup", hits = len(hits)):
+            for video_id, video_hits in group_hits_by_video(hits).items():
+                video_file = self.__find_video_file(video_id)
+                
+                if video_file is None:
+                    print(f"Error: 영상 파일을 찾을 수 없습니다. Movie ID: {video_id}")
+                    continue
+                
+                targets    = [(*self.parse_timestamp_key(hit["ts_key"]), hit["input_text"]) for hit in video_hits]
+                memo_keys  = [self.__memo_key(video_file, target) for target in targets]
+                videos.append((video_id, video_file, video_hits, targets, memo_keys))
+        
+        results     = {}
+        pending     = []
+        decode_jobs = []
+        
+        for video_idx, (_, _, _, _, memo_keys) in enumerate(videos):
+            memo = [self.__memo_get(key) for key in memo_keys]
             
-            output_frame_path = os.path.join(self.output_dir, f"extracted_frame_{idx}.jpg")
+            if all(value is not None for value in memo):
+                results[video_idx] = [(None, best_time, similarity) for best_time, similarity in memo]
+            else:
+                pending.append(video_idx)
+        
+        text_features = self.clip_processor.encode_text_features([target[2] for video_idx in pending for target in videos[video_idx][3]]) if pending else {}
+        
+        for video_idx in pending:
+            video_id, video_file, _, targets, _ = videos[video_idx]
             
-            cv2.imwrite(output_frame_path, best_frame)
+            with tracer.span("file_lookup", video_id = video_id, source = "frame_index"):
+                indexed = self.__load_frame_index(video_id, video_file)
             
-            saved_frames.append({
-                                 "movie_id"         : video_id,
-                                 "time_range"       : f"{start_timestamp/1000:.1f} ~ {end_timestamp/1000:.1f}초",
-                                 "best_time"        : best_time,
-                                 "angle_similarity" : angle_sim,
-                                 "output_frame_path": output_frame_path
-                                })
+            if indexed is not None:
+                results[video_idx] = [(None, best_time, similarity) 
+                                      for best_time, similarity in self.clip_processor.best_times_from_index(targets, *indexed, text_features)]
+            else:
+                decode_jobs.append(video_idx)
+        
+        if self.decode_workers > 1 and len(decode_jobs) > 1 and self.clip_processor.search_mode == "exhaustive":
+            best = self.clip_processor.find_best_frames_parallel([(videos[video_idx][1], videos[video_idx][3]) for video_idx in decode_jobs], 
+                                                                 get_decode_pool(self.decode_workers), 
+                                                                 self.sampling_interval,
+                                                                 text_features)
+            results.update(zip(decode_jobs, best))
+        else:
+            for video_idx in decode_jobs:
+                results[video_idx] = self.clip_processor.find_best_frames_in_video(videos[video_idx][1], 
+                                                                                   videos[video_idx][3], 
+                                                                                   self.sampling_interval,
+                                                                                   text_features)
+        
+        served = 0
+        
+        for video_idx, (video_id, video_file, video_hits, targets, memo_keys) in enumerate(videos):
+            best    = results[video_idx]
+            paths   = [self.thumbnails.get(video_id, best_time, self.thumbnail_size, video_file) if best_time is not None else None 
+                       for _, best_time, _ in best]
+            missing = [best_time for (best_frame, best_time, _), path in zip(best, paths) 
+                       if path is None and best_frame is None and best_time is not None]
+            frames  = self.clip_processor.read_frames(video_file, missing) if missing else {}
+            served += sum(path is not None for path in paths)
             
-        return saved_frames
-
-
+            for hit, (start_timestamp, end_timestamp, _), key, (best_frame, best_time, similarity), path in zip(video_hits, targets, memo_keys, best, paths):
+                if path is None and best_time is not None:
+                    best_frame = best_frame if best_frame is not None else frames.get(best_time)
+                    path       = self.thumbnails.put(video_id, best_time, best_frame, self.thumbnail_size, video_file) if best_frame is not None else None
+                
+                if path is None:
+                    print(f"Movie ID: {video_id} 구간 ({start_timestamp}ms ~ {end_timestamp}ms)에서 프레임 추출 실패")
+                    continue
+                
+                self.__memo_put(key, (best_time, similarity))
+                
+                saved_frames[hit["query_idx"]][hit["rank"]] = {
+                                                               "movie_id"         : video_id,
+                                                               "time_range"       : f"{start_timestamp/1000:.1f} ~ {end_timestamp/1000:.1f}초",
+                                                               "best_time"        : best_time,
+                                                               "angle_similarity" : hit["angle_sim"],
+                                                               "output_frame_path": path
+                                                              }
+        
+        print(f"🖼️ [FrameExtractor] 썸네일 캐시 적중 {served}/{sum(len(video[2]) for video in videos)}개")
+        return [[frames[rank] for rank in sorted(frames)] for frames in saved_frames]
+    
+    def extract_frames_batch(self, 
+                             queries          : list,
+                             query_embeddings = None):
+        
+        if query_embeddings is None:
+            query_embeddings = self.query_encoder.encode(queries)
+        
+        with get_tracer().span("search", index_type = self.index_type, top_k = self.top_k, queries = len(queries)):
+            store       = open_store(self.npz_file)
+            top_results = store.search_batch(query_embeddings, 
+                                             self.top_k, 
+                                             index_type = self.index_type, 
+                                             **(self.search_params or {}))
+        
+        hits          = [{
+                          "query_idx"  : query_idx,
+                          "rank"       : idx,
+                          "video_id"   : video_id,
+                          "ts_key"     : ts_key,
+                          "angle_sim"  : angle_sim,
+                          "input_text" : queries[query_idx]
+                         } for query_idx, results in enumerate(top_results)
+                           for idx, (video_id, ts_key, angle_sim) in enumerate(results, start=1)]
+        
+        return self.__refine_hits(hits, num_queries = len(queries))
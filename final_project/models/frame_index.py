@@ -0,0 +1,165 @@
+import os
+import argparse
+import threading
+import numpy                  as np
+from   collections            import OrderedDict
+from   time                   import time
+from   models.clip_similarity import ClipVideoProcessor
+from   models.video_catalog   import VIDEO_EXTENSIONS
+
+FRAME_INDEX_DIR    = "/data/ephemeral/home/clip_frame_index"
+MAX_CACHED_VIDEOS  = 512
+
+_FRAME_INDEXES      = {}
+_FRAME_INDEXES_LOCK = threading.Lock()
+
+class FrameEmbeddingIndex:
+    def __init__(self,
+                 index_dir  : str = FRAME_INDEX_DIR,
+                 max_cached : int = MAX_CACHED_VIDEOS):
+
+        self.index_dir  = index_dir
+        self.max_cached = max_cached
+        self.cache      = OrderedDict()
+        self.lock       = threading.Lock()
+
+    def path_for(self, video_id : str):
+        return os.path.join(self.index_dir, f"{video_id}.npz")
+
+    def has(self, video_id : str):
+        return os.path.exists(self.path_for(video_id))
+
+    def save(self,
+             video_id          : str,
+             video_file        : str,
+             times             : np.ndarray,
+             embeddings        : np.ndarray,
+             sampling_interval : int):
+
+        os.makedirs(self.index_dir, exist_ok = True)
+
+        path     = self.path_for(video_id)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        stat     = os.stat(video_file)
+
+        with open(tmp_path, "wb") as f:
+            np.savez(f,
+                     times             = np.asarray(times, dtype = np.int64),
+                     embeddings        = np.asarray(embeddings, dtype = np.float16),
+                     sampling_interval = np.int64(sampling_interval),
+                     source_size       = np.int64(stat.st_size),
+                     source_mtime      = np.float64(stat.st_mtime))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.cache.pop(video_id, None)
+        return path
+
+    def load(self,
+             video_id          : str,
+             video_file        : str = None,
+             sampling_interval : int = None):
+
+        path = self.path_for(video_id)
+
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+
+        with self.lock:
+            cached = self.cache.get(video_id)
+
+            if cached is not None and cached[0] == mtime:
+                self.cache.move_to_end(video_id)
+                entry = cached[1]
+            else:
+                entry = None
+
+        if entry is None:
+            with np.load(path) as data:
+                entry = {key: data[key] for key in data.files}
+
+            with self.lock:
+                self.cache[video_id] = (mtime, entry)
+                self.cache.move_to_end(video_id)
+
+                while len(self.cache) > self.max_cached:
+                    self.cache.popitem(last = False)
+
+        if video_file is not None:
+            stat = os.stat(video_file)
+
+            if int(entry["source_size"]) != stat.st_size or float(entry["source_mtime"]) != stat.st_mtime:
+                print(f"⚠️ [FrameEmbeddingIndex] {video_id} 인덱스가 원본 영상과 맞지 않아 사용하지 않습니다. (재생성 필요)")
+                return None
+
+        if sampling_interval is not None and int(entry["sampling_interval"]) != sampling_interval:
+            print(f"⚠️ [FrameEmbeddingIndex] {video_id} 인덱스의 샘플링 간격({int(entry['sampling_interval'])}ms)이 "
+                  f"요청({sampling_interval}ms)과 달라 사용하지 않습니다.")
+            return None
+
+        return entry["times"], entry["embeddings"]
+
+    def build(self,
+              video_files       : list,
+              video_ids         : list = None,
+              sampling_interval : int  = 500,
+              clip_processor           = None,
+              overwrite         : bool = False):
+
+        clip_processor = clip_processor or ClipVideoProcessor()
+        video_ids      = video_ids or [os.path.splitext(os.path.basename(video_file))[0] for video_file in video_files]
+        built          = []
+
+        for video_file, video_id in zip(video_files, video_ids):
+            if not overwrite and self.load(video_id, video_file) is not None:
+                continue
+
+            start_time        = time()
+            times, embeddings = clip_processor.encode_video_frames(video_file, sampling_interval)
+
+            if times is None:
+                continue
+
+            self.save(video_id, video_file, times, embeddings, sampling_interval)
+            built.append(video_id)
+            print(f"🖼️ [FrameEmbeddingIndex] {video_id}: 프레임 {len(times)}개 인덱싱 "
+                  f"({embeddings.nbytes / 2**10:.0f}KB, {time() - start_time:.2f}초)")
+
+        return built
+
+def get_frame_index(index_dir : str = FRAME_INDEX_DIR):
+    with _FRAME_INDEXES_LOCK:
+        frame_index = _FRAME_INDEXES.get(index_dir)
+
+        if frame_index is None:
+            frame_index               = FrameEmbeddingIndex(index_dir)
+            _FRAME_INDEXES[index_dir] = frame_index
+
+    return frame_index
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CLIP 프레임 임베딩 인덱스 생성 (final_project 폴더에서 python -m models.frame_index)")
+
+    parser.add_argument("video_dirs",          type=str, nargs="+",
+                        help="인덱싱할 영상 폴더 목록")
+    parser.add_argument("--index_dir",         type=str, default=FRAME_INDEX_DIR)
+    parser.add_argument("--sampling_interval", type=int, default=500)
+    parser.add_argument("--overwrite",         action="store_true",
+                        help="이미 인덱싱된 영상도 다시 생성합니다.")
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args        = parse_args()
+    video_files = [os.path.join(video_dir, name) for video_dir in args.video_dirs
+                   for name in sorted(os.listdir(video_dir)) if name.lower().endswith(VIDEO_EXTENSIONS)]
+    built       = get_frame_index(args.index_dir).build(video_files,
+                                                        sampling_interval = args.sampling_interval,
+                                                        overwrite         = args.overwrite)
+
+    print(f"🖼️ {args.index_dir}: 영상 {len(video_files)}개 중 {len(built)}개 인덱싱 완료")
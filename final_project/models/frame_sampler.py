@@ -0,0 +1,153 @@
+import cv2
+import numpy                   as np
+from   models.interval_planner import merge_intervals
+
+try:
+    from decord import (VideoReader,
+                        cpu)
+except ImportError:
+    VideoReader = None
+
+try:
+    import av
+except ImportError:
+    av = None
+
+SAMPLER_BACKENDS = ("auto", "decord", "opencv")
+DECODE_CHUNK     = 32
+MAX_GRAB_GAP     = 250
+
+def frame_indices_for_times(times_ms   : list,
+                            fps        : float,
+                            num_frames : int):
+
+    indices = np.rint(np.asarray(times_ms, dtype = np.float64) * fps / 1000.0).astype(np.int64)
+    return np.where(indices < num_frames, indices, -1) if num_frames > 0 else indices
+
+class FrameSampler:
+    def __init__(self,
+                 video_file : str,
+                 backend    : str  = "auto",
+                 rgb        : bool = False):
+
+        if backend not in SAMPLER_BACKENDS:
+            raise ValueError(f"지원되지 않는 샘플러 백엔드입니다: {backend} ({', '.join(SAMPLER_BACKENDS)} 중 선택하세요)")
+
+        if backend == "decord" and VideoReader is None:
+            raise ImportError("decord 백엔드를 사용하려면 decord 패키지가 필요합니다. (pip install decord)")
+
+        self.video_file = video_file
+        self.backend    = backend if backend != "auto" else ("decord" if VideoReader is not None else "opencv")
+        self.rgb        = rgb
+        self.reader     = None
+        self.fps        = 0.0
+        self.num_frames = 0
+
+    def open(self):
+        if self.backend == "decord":
+            try:
+                self.reader = VideoReader(self.video_file, ctx = cpu(0))
+            except Exception:
+                return False
+
+            self.fps        = float(self.reader.get_avg_fps())
+            self.num_frames = len(self.reader)
+            return True
+
+        self.reader = cv2.VideoCapture(self.video_file)
+
+        if not self.reader.isOpened():
+            return False
+
+        self.fps        = self.reader.get(cv2.CAP_PROP_FPS) or 30.0
+        self.num_frames = int(self.reader.get(cv2.CAP_PROP_FRAME_COUNT))
+        return True
+
+    def close(self):
+        if self.backend == "opencv" and self.reader is not None:
+            self.reader.release()
+        self.reader = None
+
+    def sample(self, times_ms : list):
+        yield from self.__sample(times_ms, frame_indices_for_times(times_ms, self.fps, self.num_frames))
+
+    def sample_indices(self, frame_indices : list):
+        indices = np.asarray(frame_indices, dtype = np.int64)
+        yield from self.__sample(indices.tolist(), np.where((indices >= 0) & (indices < self.num_frames), indices, -1))
+
+    def __sample(self, keys, indices):
+        order = [i for i in np.argsort(indices, kind = "stable") if indices[i] >= 0]
+
+        if self.backend == "decord":
+            yield from self.__sample_decord(keys, indices, order)
+        else:
+            yield from self.__sample_opencv(keys, indices, order)
+
+    def __sample_decord(self, times_ms, indices, order):
+        for start in range(0, len(order), DECODE_CHUNK):
+            chunk  = order[start : start + DECODE_CHUNK]
+            frames = self.reader.get_batch([int(indices[i]) for i in chunk]).asnumpy()
+
+            for i, frame in zip(chunk, frames):
+                yield times_ms[i], frame if self.rgb else np.ascontiguousarray(frame[..., ::-1])
+
+    def __sample_opencv(self, times_ms, indices, order):
+        position   = None
+        last_index = None
+        frame      = None
+
+        for i in order:
+            target = int(indices[i])
+
+            if target != last_index:
+                if position is None or target < position or target - position > MAX_GRAB_GAP:
+                    self.reader.set(cv2.CAP_PROP_POS_FRAMES, target)
+                    position = target
+
+                while position < target:
+                    if not self.reader.grab():
+                        return
+                    position += 1
+
+                ret, frame = self.reader.read()
+
+                if not ret:
+                    return
+
+                position   += 1
+                last_index  = target
+
+                if self.rgb:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+            yield times_ms[i], frame
+
+
+def sample_keyframes(video_file : str,
+                     intervals  : list):
+
+    if av is None:
+        raise ImportError("키프레임 디코딩을 사용하려면 PyAV 패키지가 필요합니다. (pip install av)")
+
+    with av.open(video_file) as container:
+        stream                          = container.streams.video[0]
+        stream.thread_type              = "AUTO"
+        stream.codec_context.skip_frame = "NONKEY"
+        time_base                       = stream.time_base
+        last_time                       = None
+
+        for start, end in merge_intervals(intervals):
+            container.seek(int(start / 1000 / time_base), stream = stream, backward = True)
+
+            for frame in container.decode(stream):
+                if frame.pts is None:
+                    continue
+
+                t = int(round(float(frame.pts * time_base) * 1000))
+
+                if t > end:
+                    break
+
+                if t >= start and t != last_time:
+                    last_time = t
+                    yield t, frame.to_ndarray(format = "bgr24")
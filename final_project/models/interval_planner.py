@@ -0,0 +1,41 @@
+from bisect      import bisect_left
+from collections import OrderedDict
+
+def merge_intervals(intervals : list, max_gap : float = 0):
+    merged = []
+
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + max_gap:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    return [(start, end) for start, end in merged]
+
+def naive_sample_count(intervals : list, sampling_interval : float):
+    return sum(int((end - start) // sampling_interval) + 1 for start, end in intervals if end >= start)
+
+def plan_sample_times(intervals : list, sampling_interval : float):
+    times = []
+
+    for start, end in merge_intervals(intervals, sampling_interval):
+        t = start
+        while t <= end:
+            times.append(t)
+            t += sampling_interval
+
+    for start, end in intervals:
+        pos = bisect_left(times, start)
+
+        if pos == len(times) or times[pos] > end:
+            times.insert(pos, start)
+
+    return times
+
+def group_hits_by_video(hits : list):
+    groups = OrderedDict()
+
+    for hit in hits:
+        groups.setdefault(hit["video_id"], []).append(hit)
+
+    return groups
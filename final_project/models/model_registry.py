@@ -0,0 +1,243 @@
+import gc
+import threading
+import torch
+from   collections import OrderedDict
+from   contextlib  import contextmanager
+from   time        import time
+
+MEMORY_BUDGET_GB = 20
+IDLE_TTL_SEC     = 600
+SWEEP_INTERVAL   = 30
+
+_REGISTRY        = None
+_REGISTRY_LOCK   = threading.Lock()
+
+def estimate_bytes(value):
+    if isinstance(value, torch.nn.Module):
+        tensors = list(value.parameters()) + list(value.buffers())
+        return int(sum(tensor.numel() * tensor.element_size() for tensor in tensors))
+
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_bytes(item) for item in value)
+
+    if isinstance(value, dict):
+        return sum(estimate_bytes(item) for item in value.values())
+
+    return sum(estimate_bytes(attr) for attr in vars(value).values() if isinstance(attr, torch.nn.Module)) if hasattr(value, "__dict__") else 0
+
+def release_device_memory():
+    gc.collect()
+
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+        torch.cuda.empty_cache()
+
+class ModelEntry:
+    def __init__(self, name : str):
+        self.name       = name
+        self.value      = None
+        self.nbytes     = 0
+        self.refcount   = 0
+        self.last_used  = time()
+        self.load_count = 0
+        self.load_time  = 0.0
+        self.pinned     = False
+        self.lock       = threading.Lock()
+
+class ModelRegistry:
+    def __init__(self,
+                 memory_budget_bytes : int   = MEMORY_BUDGET_GB * 2**30,
+                 idle_ttl            : float = IDLE_TTL_SEC,
+                 sweep_interval      : float = SWEEP_INTERVAL):
+
+        self.memory_budget_bytes = memory_budget_bytes
+        self.idle_ttl            = idle_ttl
+        self.sweep_interval      = sweep_interval
+        self.entries             = OrderedDict()
+        self.evict_count         = 0
+        self.lock                = threading.RLock()
+        self.stop_event          = threading.Event()
+        self.sweeper             = None
+
+        if self.idle_ttl is not None and self.sweep_interval:
+            self.sweeper = threading.Thread(target = self.__sweep_loop, daemon = True)
+            self.sweeper.start()
+
+    def configure(self,
+                  memory_budget_bytes : int   = None,
+                  idle_ttl            : float = None):
+
+        with self.lock:
+            if memory_budget_bytes is not None:
+                self.memory_budget_bytes = memory_budget_bytes
+            if idle_ttl is not None:
+                self.idle_ttl = idle_ttl
+
+            evicted = self.__enforce_budget()
+
+        self.__free(evicted)
+        return self
+
+    def __entry(self, name : str):
+        with self.lock:
+            entry = self.entries.get(name)
+
+            if entry is None:
+                entry              = ModelEntry(name)
+                self.entries[name] = entry
+
+            return entry
+
+    def acquire(self, name : str, loader):
+        entry = self.__entry(name)
+
+        with entry.lock:
+            with self.lock:
+                entry.refcount  += 1
+                entry.last_used  = time()
+                self.entries.move_to_end(name)
+
+            if entry.value is None:
+                try:
+                    start_time = time()
+                    value      = loader()
+                except BaseException:
+                    with self.lock:
+                        entry.refcount -= 1
+                    raise
+
+                with self.lock:
+                    entry.value       = value
+                    entry.nbytes      = estimate_bytes(value)
+                    entry.load_time   = time() - start_time
+                    entry.load_count += 1
+
+                print(f"📦 [ModelRegistry] {name} 로드 완료 ({entry.nbytes / 2**20:.1f}MB, {entry.load_time:.2f}초, "
+                      f"누적 로드 {entry.load_count}회, 상주 {self.resident_bytes() / 2**30:.2f}GB)")
+
+                with self.lock:
+                    evicted = self.__enforce_budget()
+
+                self.__free(evicted)
+
+            return entry.value
+
+    def pin(self, name : str, pinned : bool = True):
+        entry = self.__entry(name)
+
+        with self.lock:
+            entry.pinned = pinned
+
+    def release(self, name : str):
+        with self.lock:
+            entry = self.entries.get(name)
+
+            if entry is None or entry.refcount == 0:
+                return
+
+            entry.refcount  -= 1
+            entry.last_used  = time()
+            evicted          = self.__enforce_budget()
+
+        self.__free(evicted)
+
+    @contextmanager
+    def use(self, name : str, loader):
+        value = self.acquire(name, loader)
+
+        try:
+            yield value
+        finally:
+            self.release(name)
+
+    def __unload(self, entry : ModelEntry, reason : str):
+        value            = entry.value
+        nbytes           = entry.nbytes
+        entry.value      = None
+        entry.nbytes     = 0
+        self.evict_count += 1
+        print(f"🧹 [ModelRegistry] {entry.name} 언로드 ({reason}, {nbytes / 2**20:.1f}MB 해제)")
+        return value
+
+    @staticmethod
+    def __free(evicted : list):
+        if evicted:
+            evicted.clear()
+            release_device_memory()
+
+    def __enforce_budget(self):
+        now     = time()
+        evicted = []
+
+        for entry in list(self.entries.values()):
+            if (entry.value is not None and entry.refcount == 0 and not entry.pinned and
+                self.idle_ttl is not None and now - entry.last_used > self.idle_ttl):
+                evicted.append(self.__unload(entry, f"유휴 {now - entry.last_used:.0f}초"))
+
+        if self.memory_budget_bytes is None:
+            return evicted
+
+        for entry in list(self.entries.values()):
+            if self.resident_bytes() <= self.memory_budget_bytes:
+                return evicted
+
+            if entry.value is not None and entry.refcount == 0:
+                evicted.append(self.__unload(entry, "메모리 예산 초과"))
+
+        if self.resident_bytes() > self.memory_budget_bytes:
+            print(f"⚠️ [ModelRegistry] 사용 중인 모델만으로 메모리 예산을 초과했습니다: "
+                  f"{self.resident_bytes() / 2**30:.2f}GB > {self.memory_budget_bytes / 2**30:.2f}GB")
+        return evicted
+
+    def sweep(self):
+        with self.lock:
+            evicted = self.__enforce_budget()
+
+        self.__free(evicted)
+
+    def __sweep_loop(self):
+        while not self.stop_event.wait(self.sweep_interval):
+            self.sweep()
+
+    def evict(self, name : str):
+        with self.lock:
+            entry   = self.entries.get(name)
+            evicted = []
+
+            if entry is not None and entry.value is not None and entry.refcount == 0:
+                evicted.append(self.__unload(entry, "수동 해제"))
+
+        self.__free(evicted)
+
+    def resident_bytes(self):
+        with self.lock:
+            return sum(entry.nbytes for entry in self.entries.values() if entry.value is not None)
+
+    def stats(self):
+        with self.lock:
+            return {
+                    "resident_bytes"      : self.resident_bytes(),
+                    "memory_budget_bytes" : self.memory_budget_bytes,
+                    "idle_ttl"            : self.idle_ttl,
+                    "evict_count"         : self.evict_count,
+                    "models"              : {
+                                             name: {
+                                                    "resident"   : entry.value is not None,
+                                                    "nbytes"     : entry.nbytes,
+                                                    "refcount"   : entry.refcount,
+                                                    "pinned"     : entry.pinned,
+                                                    "load_count" : entry.load_count,
+                                                    "load_time"  : entry.load_time,
+                                                    "idle_time"  : time() - entry.last_used
+                                                   } for name, entry in self.entries.items()
+                                            }
+                   }
+
+def get_model_registry():
+    global _REGISTRY
+
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ModelRegistry()
+
+    return _REGISTRY
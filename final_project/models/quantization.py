@@ -0,0 +1,248 @@
+import os
+import json
+import shutil
+import numpy             as np
+from   time              import time
+from   models.store_lock import (LOCK_FILE,
+                                 file_lock,
+                                 replace_dir)
+
+CODES_DIR   = "codes"
+META_FILE   = "meta.json"
+PQ_MAX_K    = 256
+SCORE_CHUNK = 65536
+
+def chunked_scores(codes : np.ndarray, query : np.ndarray):
+    scores = np.empty(codes.shape[0], dtype = np.float32)
+
+    for start in range(0, codes.shape[0], SCORE_CHUNK):
+        chunk                                  = np.asarray(codes[start : start + SCORE_CHUNK], dtype = np.float32)
+        scores[start : start + chunk.shape[0]] = chunk @ query
+
+    return scores
+
+class Float16Codec:
+    encoding   = "float16"
+    build_keys = ()
+
+    def __init__(self):
+        self.codes = None
+
+    def train(self, embeddings : np.ndarray):
+        return self
+
+    def encode(self, embeddings : np.ndarray):
+        self.codes = np.empty(embeddings.shape, dtype = np.float16)
+
+        for start in range(0, embeddings.shape[0], SCORE_CHUNK):
+            self.codes[start : start + SCORE_CHUNK] = embeddings[start : start + SCORE_CHUNK]
+        return self
+
+    def scores(self, query : np.ndarray):
+        return chunked_scores(self.codes, query)
+
+    def nbytes(self):
+        return int(self.codes.nbytes)
+
+    def save(self, codes_dir : str):
+        np.save(os.path.join(codes_dir, "codes.npy"), self.codes)
+
+    def load(self, codes_dir : str):
+        self.codes = np.load(os.path.join(codes_dir, "codes.npy"))
+        return self
+
+class Int8Codec:
+    encoding   = "int8"
+    build_keys = ()
+
+    def __init__(self):
+        self.scale = None
+        self.codes = None
+
+    def train(self, embeddings : np.ndarray):
+        max_abs = np.zeros(embeddings.shape[1], dtype = np.float32)
+
+        for start in range(0, embeddings.shape[0], SCORE_CHUNK):
+            max_abs = np.maximum(max_abs, np.abs(np.asarray(embeddings[start : start + SCORE_CHUNK])).max(axis = 0))
+
+        max_abs[max_abs == 0] = 1.0
+        self.scale            = (max_abs / 127.0).astype(np.float32)
+        return self
+
+    def encode(self, embeddings : np.ndarray):
+        self.codes = np.empty(embeddings.shape, dtype = np.int8)
+
+        for start in range(0, embeddings.shape[0], SCORE_CHUNK):
+            chunk                                      = np.asarray(embeddings[start : start + SCORE_CHUNK]) / self.scale
+            self.codes[start : start + chunk.shape[0]] = np.clip(np.rint(chunk), -127, 127)
+        return self
+
+    def scores(self, query : np.ndarray):
+        return chunked_scores(self.codes, query * self.scale)
+
+    def nbytes(self):
+        return int(self.codes.nbytes + self.scale.nbytes)
+
+    def save(self, codes_dir : str):
+        np.save(os.path.join(codes_dir, "codes.npy"), self.codes)
+        np.save(os.path.join(codes_dir, "scale.npy"), self.scale)
+
+    def load(self, codes_dir : str):
+        self.codes = np.load(os.path.join(codes_dir, "codes.npy"))
+        self.scale = np.load(os.path.join(codes_dir, "scale.npy"))
+        return self
+
+class ProductQuantizationCodec:
+    encoding   = "pq"
+    build_keys = ("n_subspaces", "n_centroids", "n_iter", "train_size", "seed")
+
+    def __init__(self,
+                 n_subspaces : int = 64,
+                 n_centroids : int = 256,
+                 n_iter      : int = 15,
+                 train_size  : int = 50000,
+                 seed        : int = 0):
+
+        if not 1 <= n_centroids <= PQ_MAX_K:
+            raise ValueError(f"n_centroids는 1 이상 {PQ_MAX_K} 이하여야 합니다 (uint8 코드): {n_centroids}")
+
+        self.n_subspaces = n_subspaces
+        self.n_centroids = n_centroids
+        self.n_iter      = n_iter
+        self.train_size  = train_size
+        self.seed        = seed
+        self.codebooks   = None
+        self.codes       = None
+
+    def __split(self, vectors : np.ndarray):
+        return vectors.reshape(vectors.shape[0], self.n_subspaces, -1)
+
+    def __nearest(self, sub_vectors : np.ndarray, codebook : np.ndarray):
+        distances = (sub_vectors ** 2).sum(1, keepdims = True) - 2 * sub_vectors @ codebook.T + (codebook ** 2).sum(1)
+        return np.argmin(distances, axis = 1)
+
+    def train(self, embeddings : np.ndarray):
+        if embeddings.shape[1] % self.n_subspaces != 0:
+            raise ValueError(f"임베딩 차원({embeddings.shape[1]})이 n_subspaces({self.n_subspaces})로 나누어떨어지지 않습니다.")
+
+        rng            = np.random.default_rng(self.seed)
+        n              = embeddings.shape[0]
+        train_ids      = np.sort(rng.choice(n, size = min(n, self.train_size), replace = False))
+        train          = self.__split(np.asarray(embeddings[train_ids], dtype = np.float32))
+        n_centroids    = min(self.n_centroids, train.shape[0])
+        self.codebooks = np.empty((self.n_subspaces, n_centroids, train.shape[2]), dtype = np.float32)
+
+        for m in range(self.n_subspaces):
+            sub_vectors = train[:, m]
+            codebook    = sub_vectors[rng.choice(sub_vectors.shape[0], size = n_centroids, replace = False)].copy()
+
+            for _ in range(self.n_iter):
+                assignments      = self.__nearest(sub_vectors, codebook)
+                counts           = np.bincount(assignments, minlength = n_centroids)
+                sums             = np.zeros_like(codebook)
+                np.add.at(sums, assignments, sub_vectors)
+                filled           = counts > 0
+                codebook[filled] = sums[filled] / counts[filled, None]
+
+            self.codebooks[m] = codebook
+        return self
+
+    def encode(self, embeddings : np.ndarray):
+        self.codes = np.empty((embeddings.shape[0], self.n_subspaces), dtype = np.uint8)
+
+        for start in range(0, embeddings.shape[0], SCORE_CHUNK):
+            chunk = self.__split(np.asarray(embeddings[start : start + SCORE_CHUNK], dtype = np.float32))
+
+            for m in range(self.n_subspaces):
+                self.codes[start : start + chunk.shape[0], m] = self.__nearest(chunk[:, m], self.codebooks[m])
+        return self
+
+    def scores(self, query : np.ndarray):
+        lookup = np.einsum("mkd,md->mk", self.codebooks, query.reshape(self.n_subspaces, -1))
+        scores = np.empty(self.codes.shape[0], dtype = np.float32)
+        rows   = np.arange(self.n_subspaces)
+
+        for start in range(0, self.codes.shape[0], SCORE_CHUNK):
+            chunk                                  = self.codes[start : start + SCORE_CHUNK]
+            scores[start : start + chunk.shape[0]] = lookup[rows, chunk].sum(axis = 1)
+
+        return scores
+
+    def nbytes(self):
+        return int(self.codes.nbytes + self.codebooks.nbytes)
+
+    def save(self, codes_dir : str):
+        np.save(os.path.join(codes_dir, "codes.npy"),     self.codes)
+        np.save(os.path.join(codes_dir, "codebooks.npy"), self.codebooks)
+
+    def load(self, codes_dir : str):
+        self.codes       = np.load(os.path.join(codes_dir, "codes.npy"))
+        self.codebooks   = np.load(os.path.join(codes_dir, "codebooks.npy"))
+        self.n_subspaces = self.codebooks.shape[0]
+        return self
+
+CODEC_TYPES = {
+               Float16Codec.encoding             : Float16Codec,
+               Int8Codec.encoding                : Int8Codec,
+               ProductQuantizationCodec.encoding : ProductQuantizationCodec
+              }
+
+def create_codec(encoding : str, **params):
+    if encoding not in CODEC_TYPES:
+        raise ValueError(f"지원되지 않는 인코딩입니다: {encoding} ({', '.join(CODEC_TYPES)} 중 선택하세요)")
+    return CODEC_TYPES[encoding](**params)
+
+def split_codec_params(encoding : str, params : dict):
+    build_keys = CODEC_TYPES[encoding].build_keys if encoding in CODEC_TYPES else ()
+    build      = {key: value for key, value in params.items() if key in build_keys}
+    search     = {key: value for key, value in params.items() if key not in build_keys}
+    return build, search
+
+def read_meta(codes_dir : str):
+    meta_path = os.path.join(codes_dir, META_FILE)
+
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, "r", encoding = "utf-8") as f:
+        return json.load(f)
+
+def open_codec(store_dir  : str,
+               embeddings : np.ndarray,
+               encoding   : str,
+               lock_path  : str = None,
+               **params):
+
+    codec = create_codec(encoding, **params)
+
+    if store_dir is None:
+        return codec.train(embeddings).encode(embeddings)
+
+    codes_dir = os.path.join(store_dir, CODES_DIR, encoding)
+    meta      = {"encoding": encoding, "num_vectors": int(embeddings.shape[0]), "params": {key: getattr(codec, key) for key in codec.build_keys}}
+
+    if read_meta(codes_dir) == meta:
+        return codec.load(codes_dir)
+
+    with file_lock(lock_path or os.path.join(store_dir, LOCK_FILE)):
+        if read_meta(codes_dir) == meta:
+            return codec.load(codes_dir)
+
+        start_time = time()
+        codec.train(embeddings).encode(embeddings)
+
+        if not os.path.isdir(store_dir):
+            return codec
+
+        tmp_dir    = f"{codes_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors = True)
+        os.makedirs(tmp_dir)
+        codec.save(tmp_dir)
+
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding = "utf-8") as f:
+            json.dump(meta, f)
+
+        replace_dir(tmp_dir, codes_dir)
+
+    print(f"🗜️ [Quantization] {encoding} 코드 생성 완료: {codes_dir} ({codec.nbytes() / 2**20:.1f}MB, {time() - start_time:.2f}초)")
+    return codec
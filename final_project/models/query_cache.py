@@ -0,0 +1,126 @@
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import numpy       as np
+from   time        import time
+from   collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 4096
+
+_CACHES             = {}
+_CACHES_LOCK        = threading.Lock()
+
+class QueryCache:
+    def __init__(self,
+                 max_entries : int = DEFAULT_MAX_ENTRIES,
+                 db_path     : str = None):
+
+        self.max_entries = max_entries
+        self.db_path     = db_path
+        self.entries     = OrderedDict()
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+        self.lock        = threading.Lock()
+        self.conn        = None
+
+        if self.db_path:
+            self.__open_db()
+
+    def __open_db(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok = True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread = False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+                          CREATE TABLE IF NOT EXISTS query_cache (
+                              key         TEXT PRIMARY KEY,
+                              translation TEXT NOT NULL,
+                              embedding   BLOB NOT NULL,
+                              last_used   REAL NOT NULL
+                          )
+                          """)
+        self.conn.commit()
+
+        rows = self.conn.execute("SELECT key, translation, embedding FROM query_cache "
+                                 "ORDER BY last_used DESC LIMIT ?", (self.max_entries,)).fetchall()
+
+        for key, translation, embedding in reversed(rows):
+            self.entries[key] = (translation, np.frombuffer(embedding, dtype = np.float32))
+
+        print(f"🗃️ [QueryCache] {len(self.entries)}개 쿼리 캐시 로드: {self.db_path}")
+
+    @staticmethod
+    def normalize(text : str):
+        text = unicodedata.normalize("NFC", text)
+        return re.sub(r"\s+", " ", text).strip().lower()
+
+    def make_key(self, text : str, model_id : str):
+        return f"{model_id}\x1f{self.normalize(text)}"
+
+    def get(self, text : str, model_id : str):
+        key = self.make_key(text, model_id)
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+            if self.conn is not None:
+                self.conn.execute("UPDATE query_cache SET last_used = ? WHERE key = ?", (time(), key))
+                self.conn.commit()
+
+        return entry
+
+    def put(self,
+            text        : str,
+            model_id    : str,
+            translation : str,
+            embedding   : np.ndarray):
+
+        key       = self.make_key(text, model_id)
+        embedding = np.ascontiguousarray(embedding, dtype = np.float32).reshape(-1)
+
+        with self.lock:
+            self.entries[key] = (translation, embedding)
+            self.entries.move_to_end(key)
+            evicted           = []
+
+            while len(self.entries) > self.max_entries:
+                evicted_key, _ = self.entries.popitem(last = False)
+                evicted.append((evicted_key,))
+                self.evictions += 1
+
+            if self.conn is not None:
+                self.conn.execute("INSERT OR REPLACE INTO query_cache (key, translation, embedding, last_used) "
+                                  "VALUES (?, ?, ?, ?)", (key, translation, embedding.tobytes(), time()))
+                self.conn.executemany("DELETE FROM query_cache WHERE key = ?", evicted)
+                self.conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+                "entries"   : len(self.entries),
+                "hits"      : self.hits,
+                "misses"    : self.misses,
+                "evictions" : self.evictions,
+                "hit_rate"  : self.hits / total if total else 0.0
+               }
+
+def get_query_cache(db_path     : str = None,
+                    max_entries : int = DEFAULT_MAX_ENTRIES):
+    with _CACHES_LOCK:
+        cache = _CACHES.get(db_path)
+
+        if cache is None:
+            cache            = QueryCache(max_entries = max_entries, db_path = db_path)
+            _CACHES[db_path] = cache
+
+    return cache
@@ -0,0 +1,94 @@
+import threading
+import torch
+import numpy                 as np
+from   contextlib            import contextmanager
+from   time                  import time
+from   angle_emb             import AnglE
+from   models.model_registry import get_model_registry
+from   models.tracing        import get_tracer
+
+MODEL_NAME     = 'WhereIsAI/UAE-Large-V1'
+WARMUP_TEXT    = "A man is walking down the street."
+
+_ENCODERS      = {}
+_ENCODERS_LOCK = threading.Lock()
+
+class QueryEncoder:
+    def __init__(self,
+                 model_name       : str = MODEL_NAME,
+                 pooling_strategy : str = 'cls',
+                 device           : str = 'cuda'):
+
+        self.model_name        = model_name
+        self.pooling_strategy  = pooling_strategy
+        self.device            = device if torch.cuda.is_available() else 'cpu'
+        self.model_key         = f"angle:{model_name}:{pooling_strategy}:{self.device}"
+        self.registry          = get_model_registry()
+        self.load_time         = None
+        self.last_encode_time  = None
+        self.encode_count      = 0
+        self.total_encode_time = 0.0
+        self.lock              = threading.Lock()
+
+    def __build_model(self):
+        start_time = time()
+        angle      = AnglE.from_pretrained(self.model_name, pooling_strategy=self.pooling_strategy)
+
+        if self.device.lower() == 'cuda':
+            angle = angle.cuda()
+
+        angle.encode([WARMUP_TEXT], to_numpy = True)
+
+        self.load_time = time() - start_time
+        print(f"🔥 [QueryEncoder] {self.model_name} 로드 및 워밍업 완료 ({self.device}, {self.load_time:.2f}초)")
+        return angle
+
+    @contextmanager
+    def model(self):
+        with self.registry.use(self.model_key, self.__build_model) as angle:
+            yield angle
+
+    def load(self):
+        with self.model():
+            self.registry.pin(self.model_key)
+        return self
+
+    def encode(self, texts):
+        if isinstance(texts, str):
+            texts = [texts]
+
+        with get_tracer().span("query_encode", texts = len(texts)), self.model() as angle, self.lock:
+            start_time = time()
+            embeddings = angle.encode(list(texts), to_numpy = True)
+            elapsed    = time() - start_time
+
+            self.last_encode_time   = elapsed
+            self.total_encode_time += elapsed
+            self.encode_count      += 1
+
+        return np.asarray(embeddings, dtype = np.float32)
+
+    def stats(self):
+        return {
+                "model_name"       : self.model_name,
+                "device"           : self.device,
+                "load_time"        : self.load_time,
+                "last_encode_time" : self.last_encode_time,
+                "encode_count"     : self.encode_count,
+                "avg_encode_time"  : self.total_encode_time / self.encode_count if self.encode_count else None
+               }
+
+def get_query_encoder(model_name       : str  = MODEL_NAME,
+                      pooling_strategy : str  = 'cls',
+                      device           : str  = 'cuda',
+                      warm             : bool = True):
+    key = (model_name, pooling_strategy, device)
+
+    with _ENCODERS_LOCK:
+        encoder = _ENCODERS.get(key)
+
+        if encoder is None:
+            encoder        = QueryEncoder(model_name, pooling_strategy, device)
+            _ENCODERS[key] = encoder
+
+    return encoder.load() if warm else encoder
@@ -0,0 +1,120 @@
+import torch
+import numpy                as np
+from   models.frame_sampler import FrameSampler
+
+IMAGENET_MEAN = [0.485, 0.456, 0.406]
+IMAGENET_STD  = [0.229, 0.224, 0.225]
+INPUT_SIZE    = 448
+INDEX_MODES   = ("center", "span", "stride")
+
+def default_device():
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def range_frame_indices(ranges     : list,
+                        fps        : float,
+                        num_frames : int,
+                        mode       : str = "center"):
+
+    if mode not in INDEX_MODES:
+        raise ValueError(f"지원되지 않는 인덱스 모드입니다: {mode} ({', '.join(INDEX_MODES)} 중 선택하세요)")
+
+    indices_list = []
+
+    for start, end, num in ranges:
+        start_idx = max(0, round(start * fps))
+
+        if mode == "center":
+            end_idx  = min(round(end * fps), num_frames - 1) if end is not None else num_frames - 1
+            seg_size = (end_idx - start_idx) / num
+            indices  = np.linspace(start_idx + seg_size / 2, end_idx - seg_size / 2, num, dtype = int)
+        elif mode == "span":
+            end_idx  = min(round(end * fps), num_frames) if end is not None else num_frames
+            indices  = np.linspace(start_idx, end_idx - 1, num, dtype = int) if end_idx > start_idx else np.empty(0, dtype = int)
+        else:
+            start_idx = int(start * fps)
+            end_idx   = int(end * fps) if end is not None else num_frames
+            seg_size  = (end_idx - start_idx) / num
+            indices   = np.array([int(start_idx + seg_size / 2 + round(seg_size * idx)) for idx in range(num)], dtype = int)
+
+        indices_list.append(indices)
+
+    return indices_list
+
+def normalize_frames(frames     : torch.Tensor,
+                     input_size : int         = INPUT_SIZE,
+                     device     : str         = None,
+                     dtype      : torch.dtype = torch.float32):
+
+    frames = frames.to(device or default_device(), non_blocking = True).permute(0, 3, 1, 2)
+
+    if frames.device.type != "cpu":
+        frames = frames.to(torch.float32)
+
+    frames = torch.nn.functional.interpolate(frames,
+                                             size          = (input_size, input_size),
+                                             mode          = "bicubic",
+                                             align_corners = False,
+                                             antialias     = True)
+    frames = frames.to(torch.float32).div(255.0)
+
+    mean   = torch.tensor(IMAGENET_MEAN, device = frames.device).view(1, 3, 1, 1)
+    std    = torch.tensor(IMAGENET_STD, device = frames.device).view(1, 3, 1, 1)
+    return ((frames - mean) / std).to(dtype)
+
+class RangeSampler:
+    def __init__(self,
+                 input_size : int         = INPUT_SIZE,
+                 device     : str         = None,
+                 dtype      : torch.dtype = torch.float32,
+                 mode       : str         = "center",
+                 backend    : str         = "auto"):
+
+        if mode not in INDEX_MODES:
+            raise ValueError(f"지원되지 않는 인덱스 모드입니다: {mode} ({', '.join(INDEX_MODES)} 중 선택하세요)")
+
+        self.input_size = input_size
+        self.device     = device or default_device()
+        self.dtype      = dtype
+        self.mode       = mode
+        self.backend    = backend
+
+    def __decode(self,
+                 sampler : FrameSampler,
+                 indices : np.ndarray):
+
+        decoded = {idx: frame for idx, frame in sampler.sample_indices(indices)}
+
+        if not decoded:
+            return {}, None
+
+        order  = sorted(decoded)
+        frames = torch.from_numpy(np.stack([decoded[idx] for idx in order]))
+        frames = normalize_frames(frames.flip(-1), self.input_size, self.device, self.dtype)
+        return {idx: pos for pos, idx in enumerate(order)}, frames
+
+    def sample(self,
+               video_path : str,
+               ranges     : list,
+               mode       : str = None):
+
+        sampler = FrameSampler(video_path, backend = self.backend)
+
+        if not sampler.open():
+            raise ValueError(f"🚨 비디오 파일을 열 수 없습니다: {video_path}")
+
+        try:
+            indices_list    = range_frame_indices(ranges, sampler.fps, sampler.num_frames, mode or self.mode)
+            unique          = np.unique(np.concatenate(indices_list)) if indices_list else np.empty(0, dtype = int)
+            position, batch = self.__decode(sampler, unique)
+        finally:
+            sampler.close()
+
+        frames_list = []
+
+        for i, indices in enumerate(indices_list):
+            indices         = np.array([idx for idx in indices if idx in position], dtype = int)
+            indices_list[i] = indices
+            frames_list.append(batch[torch.as_tensor([position[idx] for idx in indices], dtype = torch.long, device = batch.device)]
+                               if len(indices) else torch.empty(0, 3, self.input_size, self.input_size, dtype = self.dtype, device = self.device))
+
+        return frames_list, indices_list, sampler.fps, sampler.num_frames
@@ -0,0 +1,487 @@
+import os
+import json
+import shutil
+import argparse
+import numpy               as np
+from   time                import time
+from   models.ann_index    import (exact_rerank,
+                                   open_index,
+                                   split_build_params,
+                                   top_k_order)
+from   models.quantization import (open_codec,
+                                   split_codec_params)
+from   models.store_lock   import (LOCK_FILE,
+                                   file_lock)
+
+EMBEDDINGS_FILE = "embeddings.npy"
+VIDEO_IDS_FILE  = "video_ids.npy"
+START_MS_FILE   = "start_ms.npy"
+END_MS_FILE     = "end_ms.npy"
+MANIFEST_FILE   = "manifest.json"
+SHARDS_DIR      = "shards"
+STORE_SUFFIX    = "_store"
+OPEN_RETRIES    = 3
+
+_OPENED_STORES  = {}
+
+def store_path_for(npz_path : str):
+    return os.path.splitext(npz_path)[0] + STORE_SUFFIX
+
+def parse_timestamp_key(ts_key : str):
+    parts = ts_key.split("_")
+    if len(parts) == 2:
+        try:
+            start = float(parts[0])
+            end   = float(parts[1])
+            return start, end
+
+        except ValueError:
+            pass
+    try:
+        ts = float(ts_key)
+        return ts, ts + 2000
+
+    except ValueError:
+        return 0, 2000
+
+def write_json_atomic(path : str, data : dict):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+
+    with open(tmp_path, "w", encoding = "utf-8") as f:
+        json.dump(data, f, indent = 4, ensure_ascii = False)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+def normalize_rows(matrix : np.ndarray):
+    matrix = np.asarray(matrix, dtype = np.float32)
+    norms  = np.linalg.norm(matrix, axis = -1, keepdims = True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class SegmentStore:
+    def __init__(self,
+                 embeddings : np.ndarray,
+                 video_ids  : np.ndarray,
+                 start_ms   : np.ndarray,
+                 end_ms     : np.ndarray):
+
+        self.embeddings = embeddings
+        self.video_ids  = video_ids
+        self.start_ms   = start_ms
+        self.end_ms     = end_ms
+        self.store_dir  = None
+        self.lock_path  = None
+        self.indexes    = {}
+        self.codecs     = {}
+
+    def __len__(self):
+        return int(self.embeddings.shape[0])
+
+    @property
+    def dim(self):
+        return int(self.embeddings.shape[1]) if self.embeddings.ndim == 2 else 0
+
+    def ts_key(self, idx : int):
+        return f"{int(self.start_ms[idx])}_{int(self.end_ms[idx])}"
+
+    def video_id_set(self):
+        return set(np.unique(self.video_ids).tolist())
+
+    @classmethod
+    def from_dicts(cls, embeddings_by_video : dict):
+        vectors   = []
+        video_ids = []
+        start_ms  = []
+        end_ms    = []
+
+        for video_id, timeline_embeddings in embeddings_by_video.items():
+            if isinstance(timeline_embeddings, np.ndarray):
+                timeline_embeddings = timeline_embeddings.item()
+
+            for ts_key, embedding in timeline_embeddings.items():
+                start, end = parse_timestamp_key(ts_key)
+                vectors.append(np.asarray(embedding, dtype = np.float32).reshape(-1))
+                video_ids.append(video_id)
+                start_ms.append(int(start))
+                end_ms.append(int(end))
+
+        if not vectors:
+            return cls(np.zeros((0, 0), dtype = np.float32),
+                       np.array([], dtype = "<U1"),
+                       np.array([], dtype = np.int64),
+                       np.array([], dtype = np.int64))
+
+        return cls(normalize_rows(np.stack(vectors)),
+                   np.array(video_ids),
+                   np.array(start_ms, dtype = np.int64),
+                   np.array(end_ms,   dtype = np.int64))
+
+    @classmethod
+    def from_npz(cls, npz_path : str):
+        npz_data = np.load(npz_path, allow_pickle = True)
+        try:
+            store = cls.from_dicts({video_id: npz_data[video_id].item() for video_id in npz_data.files})
+        finally:
+            npz_data.close()
+        return store
+
+    def save(self, store_dir : str):
+        tmp_dir = store_dir + ".tmp"
+        old_dir = store_dir + ".old"
+
+        shutil.rmtree(tmp_dir, ignore_errors = True)
+        os.makedirs(tmp_dir)
+
+        np.save(os.path.join(tmp_dir, EMBEDDINGS_FILE), np.ascontiguousarray(self.embeddings, dtype = np.float32))
+        np.save(os.path.join(tmp_dir, VIDEO_IDS_FILE),  np.asarray(self.video_ids))
+        np.save(os.path.join(tmp_dir, START_MS_FILE),   np.asarray(self.start_ms, dtype = np.int64))
+        np.save(os.path.join(tmp_dir, END_MS_FILE),     np.asarray(self.end_ms,   dtype = np.int64))
+
+        if os.path.exists(store_dir):
+            shutil.rmtree(old_dir, ignore_errors = True)
+            os.rename(store_dir, old_dir)
+
+        os.rename(tmp_dir, store_dir)
+        shutil.rmtree(old_dir, ignore_errors = True)
+        print(f"💾 [SegmentStore] {len(self)}개 세그먼트 저장 완료: {store_dir}")
+
+    @classmethod
+    def load(cls, store_dir : str, mmap : bool = True):
+        mmap_mode       = "r" if mmap else None
+        store           = cls(np.load(os.path.join(store_dir, EMBEDDINGS_FILE), mmap_mode = mmap_mode),
+                              np.load(os.path.join(store_dir, VIDEO_IDS_FILE),  mmap_mode = mmap_mode),
+                              np.load(os.path.join(store_dir, START_MS_FILE),   mmap_mode = mmap_mode),
+                              np.load(os.path.join(store_dir, END_MS_FILE),     mmap_mode = mmap_mode))
+        store.store_dir = store_dir
+        store.lock_path = os.path.join(store_dir, LOCK_FILE)
+        return store
+
+    @classmethod
+    def open(cls, store_dir : str):
+        mtime  = os.path.getmtime(os.path.join(store_dir, EMBEDDINGS_FILE))
+        cached = _OPENED_STORES.get(store_dir)
+
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, cls.load(store_dir))
+            _OPENED_STORES[store_dir] = cached
+
+        return cached[1]
+
+    @classmethod
+    def concat(cls, stores : list):
+        stores = [store for store in stores if len(store) > 0]
+
+        if not stores:
+            return cls.from_dicts({})
+
+        return cls(np.concatenate([np.asarray(store.embeddings) for store in stores]),
+                   np.concatenate([np.asarray(store.video_ids)  for store in stores]),
+                   np.concatenate([np.asarray(store.start_ms)   for store in stores]),
+                   np.concatenate([np.asarray(store.end_ms)     for store in stores]))
+
+    def select(self, mask : np.ndarray):
+        return SegmentStore(self.embeddings[mask],
+                            self.video_ids[mask],
+                            self.start_ms[mask],
+                            self.end_ms[mask])
+
+    def scores(self, query_embedding : np.ndarray):
+        query = normalize_rows(np.asarray(query_embedding).reshape(1, -1))[0]
+        return self.embeddings @ query
+
+    @staticmethod
+    def top_k_indices(scores : np.ndarray, top_k : int):
+        return top_k_order(scores, top_k)
+
+    def index(self, index_type : str = "brute", **params):
+        key = (index_type, tuple(sorted(params.items())))
+
+        if key not in self.indexes:
+            self.indexes[key] = open_index(self.store_dir, self.embeddings, index_type, self.lock_path, **params)
+        return self.indexes[key]
+
+    def codec(self, encoding : str, **params):
+        key = (encoding, tuple(sorted(params.items())))
+
+        if key not in self.codecs:
+            self.codecs[key] = open_codec(self.store_dir, self.embeddings, encoding, self.lock_path, **params)
+        return self.codecs[key]
+
+    def search(self,
+               query_embedding : np.ndarray,
+               top_k           : int  = 5,
+               index_type      : str  = "brute",
+               encoding        : str  = None,
+               rerank          : bool = True,
+               rerank_factor   : int  = 4,
+               **search_params):
+
+        if len(self) == 0:
+            return []
+
+        if index_type == "brute" and encoding:
+            query           = normalize_rows(np.asarray(query_embedding).reshape(1, -1))[0]
+            codec_params, _ = split_codec_params(encoding, search_params)
+            approx_scores   = self.codec(encoding, **codec_params).scores(query)
+
+            if rerank:
+                candidates      = top_k_order(approx_scores, top_k * rerank_factor)
+                indices, scores = exact_rerank(self.embeddings, query, candidates, top_k)
+            else:
+                indices         = top_k_order(approx_scores, top_k)
+                scores          = approx_scores[indices]
+        elif index_type == "brute":
+            scores  = self.scores(query_embedding)
+            indices = self.top_k_indices(scores, top_k)
+            scores  = scores[indices]
+        else:
+            query                       = normalize_rows(np.asarray(query_embedding).reshape(1, -1))[0]
+            build_params, search_params = split_build_params(index_type, search_params)
+            indices, scores             = self.index(index_type, **build_params).search(query, top_k, rerank_factor = rerank_factor, **search_params)
+
+        return [(str(self.video_ids[i]), self.ts_key(i), float(score))
+                for i, score in zip(indices, scores)]
+
+    def search_batch(self,
+                     query_embeddings : np.ndarray,
+                     top_k            : int = 5,
+                     index_type       : str = "brute",
+                     **search_params):
+
+        queries = normalize_rows(np.asarray(query_embeddings).reshape(len(query_embeddings), -1))
+
+        if len(self) == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        if index_type != "brute" or search_params.get("encoding"):
+            return [self.search(query, top_k, index_type = index_type, **search_params) for query in queries]
+
+        scores  = self.embeddings @ queries.T
+        results = []
+
+        for q in range(queries.shape[0]):
+            indices = self.top_k_indices(scores[:, q], top_k)
+            results.append([(str(self.video_ids[i]), self.ts_key(i), float(scores[i, q])) for i in indices])
+
+        return results
+
+class ShardedSegmentStore:
+    def __init__(self,
+                 root        : str,
+                 shard_names : list,
+                 shards      : list,
+                 version     : int):
+
+        self.root        = root
+        self.shard_names = shard_names
+        self.shards      = shards
+        self.version     = version
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def video_id_set(self):
+        video_ids = set()
+        for shard in self.shards:
+            video_ids |= shard.video_id_set()
+        return video_ids
+
+    @staticmethod
+    def is_sharded(root : str):
+        return os.path.exists(os.path.join(root, MANIFEST_FILE))
+
+    @classmethod
+    def __read_manifest(cls, root : str):
+        with open(os.path.join(root, MANIFEST_FILE), "r", encoding = "utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def __forget_removed_shards(root : str, shard_dirs : list):
+        shards_root = os.path.join(root, SHARDS_DIR)
+
+        for store_dir in list(_OPENED_STORES):
+            if os.path.dirname(store_dir) == shards_root and store_dir not in shard_dirs:
+                del _OPENED_STORES[store_dir]
+
+    @classmethod
+    def __adopt_flat_store(cls, root : str):
+        shard_dir = os.path.join(root, SHARDS_DIR, "shard_000000")
+        os.makedirs(shard_dir)
+
+        for name in os.listdir(root):
+            if name not in (SHARDS_DIR, LOCK_FILE):
+                os.rename(os.path.join(root, name), os.path.join(shard_dir, name))
+
+        write_json_atomic(os.path.join(root, MANIFEST_FILE), {"version": 0, "shards": ["shard_000000"]})
+
+    @classmethod
+    def create(cls, root : str):
+        if cls.is_sharded(root):
+            return cls.load(root)
+
+        os.makedirs(root, exist_ok = True)
+
+        with file_lock(os.path.join(root, LOCK_FILE)):
+            if os.path.exists(os.path.join(root, EMBEDDINGS_FILE)) and not cls.is_sharded(root):
+                cls.__adopt_flat_store(root)
+
+            if not cls.is_sharded(root):
+                os.makedirs(os.path.join(root, SHARDS_DIR), exist_ok = True)
+                write_json_atomic(os.path.join(root, MANIFEST_FILE), {"version": 0, "shards": []})
+
+        return cls.load(root)
+
+    @classmethod
+    def import_npz(cls, root : str, npz_path : str):
+        os.makedirs(root, exist_ok = True)
+
+        with file_lock(os.path.join(root, LOCK_FILE)):
+            if cls.is_sharded(root) or os.path.exists(os.path.join(root, EMBEDDINGS_FILE)):
+                return False
+
+            start_time = time()
+            legacy     = SegmentStore.from_npz(npz_path)
+            store      = cls(root, [], [], 0)
+
+            os.makedirs(os.path.join(root, SHARDS_DIR), exist_ok = True)
+            store.__commit([store.__write_shard(legacy)] if len(legacy) else [])
+
+        print(f"🔄 [SegmentStore] NPZ 변환 완료: {npz_path} ({time() - start_time:.2f}초)")
+        return True
+
+    @classmethod
+    def load(cls, root : str):
+        for attempt in range(OPEN_RETRIES):
+            manifest = cls.__read_manifest(root)
+
+            try:
+                shard_dirs = [os.path.join(root, SHARDS_DIR, name) for name in manifest["shards"]]
+                shards     = [SegmentStore.open(shard_dir) for shard_dir in shard_dirs]
+
+                for shard in shards:
+                    shard.lock_path = os.path.join(root, LOCK_FILE)
+
+                cls.__forget_removed_shards(root, shard_dirs)
+                return cls(root, list(manifest["shards"]), shards, manifest["version"])
+
+            except FileNotFoundError:
+                if attempt == OPEN_RETRIES - 1:
+                    raise
+
+    def __lock(self):
+        return file_lock(os.path.join(self.root, LOCK_FILE))
+
+    def __write_shard(self, store : SegmentStore):
+        name = f"shard_{self.version + 1:06d}"
+        store.save(os.path.join(self.root, SHARDS_DIR, name))
+        return name
+
+    def __commit(self, shard_names : list):
+        write_json_atomic(os.path.join(self.root, MANIFEST_FILE), {"version": self.version + 1, "shards": shard_names})
+
+    def append(self, 
+               store         : SegmentStore, 
+               skip_existing : bool = False):
+
+        if len(store) == 0:
+            return self
+
+        with self.__lock():
+            current = self.load(self.root)
+
+            if skip_existing:
+                existing = current.video_id_set()
+                skipped  = sorted(set(np.unique(store.video_ids).tolist()) & existing)
+                store    = store.select(~np.isin(store.video_ids, list(existing)))
+
+                if skipped:
+                    print(f"⏭️ [ShardedSegmentStore] 이미 존재하는 비디오 {len(skipped)}개를 건너뜁니다: {', '.join(map(str, skipped))}")
+
+                if len(store) == 0:
+                    return current
+
+            name    = current.__write_shard(store)
+            current.__commit(current.shard_names + [name])
+
+        print(f"➕ [ShardedSegmentStore] 샤드 추가: {name} ({len(store)}개 세그먼트)")
+        return self.load(self.root)
+
+    def compact(self):
+        with self.__lock():
+            current = self.load(self.root)
+
+            if len(current.shards) <= 1:
+                print(f"✅ [ShardedSegmentStore] 병합할 샤드가 없습니다: {self.root}")
+                return current
+
+            start_time = time()
+            name       = current.__write_shard(SegmentStore.concat(current.shards))
+            current.__commit([name])
+
+            for old_name in current.shard_names:
+                shutil.rmtree(os.path.join(self.root, SHARDS_DIR, old_name), ignore_errors = True)
+
+        print(f"🧹 [ShardedSegmentStore] {len(current.shard_names)}개 샤드 -> {name} 병합 완료 ({time() - start_time:.2f}초)")
+        return self.load(self.root)
+
+    def search(self,
+               query_embedding : np.ndarray,
+               top_k           : int = 5,
+               index_type      : str = "brute",
+               **search_params):
+
+        results = []
+
+        for shard in self.shards:
+            results.extend(shard.search(query_embedding, top_k, index_type = index_type, **search_params))
+
+        return sorted(results, key = lambda x: x[2], reverse = True)[:top_k]
+
+    def search_batch(self,
+                     query_embeddings : np.ndarray,
+                     top_k            : int = 5,
+                     index_type       : str = "brute",
+                     **search_params):
+
+        results = [[] for _ in range(len(query_embeddings))]
+
+        for shard in self.shards:
+            for q, shard_results in enumerate(shard.search_batch(query_embeddings, top_k, index_type = index_type, **search_params)):
+                results[q].extend(shard_results)
+
+        return [sorted(r, key = lambda x: x[2], reverse = True)[:top_k] for r in results]
+
+def open_store(path : str):
+    if path.endswith(".npz"):
+        root = store_path_for(path)
+
+        if not ShardedSegmentStore.is_sharded(root) and not os.path.exists(os.path.join(root, EMBEDDINGS_FILE)):
+            ShardedSegmentStore.import_npz(root, path)
+    else:
+        root = path
+
+    if ShardedSegmentStore.is_sharded(root):
+        return ShardedSegmentStore.load(root)
+
+    return SegmentStore.open(root)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="세그먼트 임베딩 스토어 관리 (final_project 폴더에서 python -m models.segment_store)")
+
+    parser.add_argument("path",      type=str,
+                        help="스토어 폴더 혹은 기존 NPZ 경로")
+    parser.add_argument("--compact", action="store_true",
+                        help="모든 샤드를 하나로 병합합니다.")
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args  = parse_args()
+    store = open_store(args.path)
+
+    if args.compact:
+        store = ShardedSegmentStore.create(store.root if isinstance(store, ShardedSegmentStore) else args.path).compact()
+
+    print(f"📦 {args.path}: 세그먼트 {len(store)}개 / 비디오 {len(store.video_id_set())}개")
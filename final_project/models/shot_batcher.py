@@ -0,0 +1,63 @@
+import torch
+
+TOKENS_PER_FRAME = 256
+
+class ShotBatcher:
+    def __init__(self,
+                 run_batch,
+                 batch_size       : int = 4,
+                 max_tokens       : int = None,
+                 tokens_per_frame : int = TOKENS_PER_FRAME):
+
+        if not batch_size and not max_tokens:
+            raise ValueError("batch_size 또는 max_tokens 중 하나는 지정해야 합니다.")
+
+        self.run_batch        = run_batch
+        self.batch_size       = batch_size
+        self.max_tokens       = max_tokens
+        self.tokens_per_frame = tokens_per_frame
+        self.pending          = []
+        self.pending_tokens   = 0
+        self.num_batches      = 0
+        self.num_shots        = 0
+
+    def __tokens(self, frames : torch.Tensor):
+        return frames.size(0) * self.tokens_per_frame
+
+    def __is_full(self):
+        return ((self.batch_size and len(self.pending) >= self.batch_size) or
+                (self.max_tokens and self.pending_tokens >= self.max_tokens))
+
+    def add(self,
+            key,
+            frames : torch.Tensor):
+
+        tokens  = self.__tokens(frames)
+        results = []
+
+        if self.pending and self.max_tokens and self.pending_tokens + tokens > self.max_tokens:
+            results += self.flush()
+
+        self.pending.append((key, frames))
+        self.pending_tokens += tokens
+
+        if self.__is_full():
+            results += self.flush()
+
+        return results
+
+    def flush(self):
+        if not self.pending:
+            return []
+
+        keys, frames        = zip(*self.pending)
+        self.pending        = []
+        self.pending_tokens = 0
+
+        responses           = self.run_batch(list(frames))
+        self.num_batches   += 1
+        self.num_shots     += len(keys)
+        return list(zip(keys, responses))
+
+    def mean_batch_size(self):
+        return self.num_shots / max(1, self.num_batches)
@@ -0,0 +1,176 @@
+import re
+import cv2
+import subprocess
+import numpy as np
+
+SHOT_BACKENDS  = ("numpy", "ffmpeg")
+SCENE_METRICS  = ("sad", "hist")
+DETECT_WIDTH   = 64
+HIST_BINS      = 8
+KEEP_SIZE      = 448
+KEEP_PER_SEG   = 4
+
+def probe_duration(video_path : str):
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        video_path
+    ]
+
+    result = subprocess.run(cmd,
+                            stdout = subprocess.PIPE,
+                            stderr = subprocess.PIPE,
+                            text   = True)
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+def ffmpeg_shot_boundaries(video_path : str,
+                           threshold  : float = 0.3):
+
+    cmd            = [
+                      "ffmpeg",
+                      "-nostdin",
+                      "-i", video_path,
+                      "-filter_complex", f"select='gt(scene,{threshold})', showinfo",
+                      "-f", "null", "-"
+                     ]
+
+    proc           = subprocess.run(cmd,
+                                    stderr = subprocess.PIPE,
+                                    stdout = subprocess.PIPE)
+
+    stderr_output  = proc.stderr.decode("utf-8")
+
+    pattern        = re.compile(r"pts_time:(\d+\.\d+)")
+    times          = [float(match.group(1)) for match in pattern.finditer(stderr_output)]
+
+    video_duration = probe_duration(video_path)
+
+    if video_duration is None:
+        raise ValueError(f"🚨 비디오 길이를 가져올 수 없습니다: {video_path}")
+
+    if times and times[0] != 0.0:
+        times = [0.0] + times
+
+    if not times or times[-1] < video_duration:
+        times.append(video_duration)
+
+    return times
+
+class ShotDetector:
+    def __init__(self,
+                 threshold    : float = 0.3,
+                 metric       : str   = "sad",
+                 num_seg      : int   = 8,
+                 keep_size    : int   = KEEP_SIZE,
+                 detect_width : int   = DETECT_WIDTH):
+
+        if metric not in SCENE_METRICS:
+            raise ValueError(f"지원되지 않는 장면 전환 지표입니다: {metric} ({', '.join(SCENE_METRICS)} 중 선택하세요)")
+
+        self.threshold    = threshold
+        self.metric       = metric
+        self.num_seg      = num_seg
+        self.keep_size    = keep_size
+        self.detect_width = detect_width
+        self.max_keep     = max(2, KEEP_PER_SEG * num_seg)
+
+    def __signature(self, small : np.ndarray):
+        if self.metric == "hist":
+            bins = (small.reshape(-1, 3) // (256 // HIST_BINS)).astype(np.int64) @ np.array([HIST_BINS**2, HIST_BINS, 1])
+            return np.bincount(bins, minlength = HIST_BINS**3) / len(bins)
+
+        return small.astype(np.int16)
+
+    def __scene_score(self,
+                      signature      : np.ndarray,
+                      prev_signature : np.ndarray,
+                      prev_mafd      : float):
+
+        if self.metric == "hist":
+            return float(np.abs(signature - prev_signature).sum() / 2), 0.0
+
+        mafd = float(np.abs(signature - prev_signature).mean())
+        return min(1.0, max(0.0, min(mafd, abs(mafd - prev_mafd)) / 100.0)), mafd
+
+    def __pick_frames(self,
+                      start : int,
+                      end   : int,
+                      kept  : list):
+
+        indices = np.array([idx for idx, _ in kept])
+        targets = np.linspace(start, end, self.num_seg).astype(int)
+        nearest = np.abs(indices[None, :] - targets[:, None]).argmin(axis = 1)
+        return np.stack([kept[i][1] for i in nearest])
+
+    def iter_shots(self,
+                   video_path  : str,
+                   keep_frames : bool = True):
+
+        cap = cv2.VideoCapture(video_path)
+
+        if not cap.isOpened():
+            raise ValueError(f"🚨 비디오 파일을 열 수 없습니다: {video_path}")
+
+        fps            = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        keep_frames    = keep_frames and self.num_seg > 0
+        prev_signature = None
+        prev_mafd      = 0.0
+        shot_start     = 0
+        kept           = []
+        stride         = 1
+        idx            = -1
+
+        try:
+            while True:
+                ret, frame = cap.read()
+
+                if not ret:
+                    break
+
+                idx           += 1
+                height, width  = frame.shape[:2]
+                small          = cv2.resize(frame, (self.detect_width, max(1, round(height * self.detect_width / width))), interpolation = cv2.INTER_AREA)
+                signature      = self.__signature(small)
+
+                if prev_signature is not None:
+                    score, prev_mafd = self.__scene_score(signature, prev_signature, prev_mafd)
+
+                    if score > self.threshold:
+                        yield shot_start / fps, idx / fps, self.__pick_frames(shot_start, idx - 1, kept) if keep_frames else None
+
+                        shot_start = idx
+                        kept       = []
+                        stride     = 1
+
+                prev_signature = signature
+
+                if keep_frames and (idx - shot_start) % stride == 0:
+                    rgb = cv2.cvtColor(cv2.resize(frame, (self.keep_size, self.keep_size), interpolation = cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+                    kept.append((idx, rgb))
+
+                    if len(kept) > self.max_keep:
+                        kept    = kept[::2]
+                        stride *= 2
+        finally:
+            cap.release()
+
+        if idx >= 0:
+            yield shot_start / fps, (idx + 1) / fps, self.__pick_frames(shot_start, idx, kept) if keep_frames else None
+
+    def detect(self,
+               video_path  : str,
+               keep_frames : bool = True):
+
+        shots = list(self.iter_shots(video_path, keep_frames))
+
+        if not shots:
+            raise ValueError(f"🚨 비디오 길이를 가져올 수 없습니다: {video_path}")
+
+        shot_times = [start for start, _, _ in shots] + [shots[-1][1]]
+        return shot_times, [frames for _, _, frames in shots]
@@ -0,0 +1,20 @@
+import os
+import fcntl
+import shutil
+
+LOCK_FILE = ".lock"
+
+def file_lock(lock_path : str):
+    lock_file = open(lock_path, "w")
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
+
+def replace_dir(tmp_dir : str, target_dir : str):
+    old_dir = f"{target_dir}.old{os.getpid()}"
+
+    if os.path.exists(target_dir):
+        shutil.rmtree(old_dir, ignore_errors = True)
+        os.rename(target_dir, old_dir)
+
+    os.replace(tmp_dir, target_dir)
+    shutil.rmtree(old_dir, ignore_errors = True)
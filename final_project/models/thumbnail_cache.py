@@ -0,0 +1,173 @@
+import os
+import cv2
+import hashlib
+import threading
+import numpy          as np
+from   collections    import OrderedDict
+from   models.tracing import get_tracer
+
+THUMBNAIL_DIR   = "/data/ephemeral/home/extracted_frames"
+MAX_CACHE_BYTES = 2 * 2**30
+JPEG_QUALITY    = 90
+
+_THUMBNAIL_CACHES      = {}
+_THUMBNAIL_CACHES_LOCK = threading.Lock()
+
+def resize_max_side(frame : np.ndarray, max_side : int = None):
+    if not max_side or max(frame.shape[:2]) <= max_side:
+        return frame
+
+    scale = max_side / max(frame.shape[:2])
+    size  = (max(1, round(frame.shape[1] * scale)), max(1, round(frame.shape[0] * scale)))
+    return cv2.resize(frame, size, interpolation = cv2.INTER_AREA)
+
+class ThumbnailCache:
+    def __init__(self,
+                 cache_dir    : str = THUMBNAIL_DIR,
+                 max_bytes    : int = MAX_CACHE_BYTES,
+                 jpeg_quality : int = JPEG_QUALITY):
+
+        self.cache_dir    = cache_dir
+        self.max_bytes    = max_bytes
+        self.jpeg_quality = jpeg_quality
+        self.entries      = OrderedDict()
+        self.total_bytes  = 0
+        self.hits         = 0
+        self.misses       = 0
+        self.evictions    = 0
+        self.lock         = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok = True)
+        self.__scan()
+
+    def __scan(self):
+        found = []
+
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".jpg"):
+                    stat = os.stat(os.path.join(root, name))
+                    found.append((stat.st_mtime, os.path.join(root, name), stat.st_size))
+
+        for _, path, size in sorted(found):
+            self.entries[path]  = size
+            self.total_bytes   += size
+
+    @staticmethod
+    def make_key(video_id   : str,
+                 timestamp  : int,
+                 resolution : int = None,
+                 video_file : str = None):
+
+        source = ""
+
+        if video_file is not None:
+            stat   = os.stat(video_file)
+            source = f"|{stat.st_size}|{stat.st_mtime}"
+
+        return hashlib.sha1(f"{video_id}|{int(timestamp)}|{resolution or 'orig'}{source}".encode("utf-8")).hexdigest()
+
+    def path_for(self,
+                 video_id   : str,
+                 timestamp  : int,
+                 resolution : int = None,
+                 video_file : str = None):
+
+        key = self.make_key(video_id, timestamp, resolution, video_file)
+        return os.path.join(self.cache_dir, key[:2], f"{key}.jpg")
+
+    def get(self,
+            video_id   : str,
+            timestamp  : int,
+            resolution : int = None,
+            video_file : str = None):
+
+        path = self.path_for(video_id, timestamp, resolution, video_file)
+
+        with self.lock:
+            if not os.path.exists(path):
+                self.total_bytes -= self.entries.pop(path, 0)
+                self.misses      += 1
+                return None
+
+            if path not in self.entries:
+                self.entries[path]  = os.path.getsize(path)
+                self.total_bytes   += self.entries[path]
+
+            self.entries.move_to_end(path)
+            self.hits += 1
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self,
+            video_id   : str,
+            timestamp  : int,
+            frame      : np.ndarray,
+            resolution : int = None,
+            video_file : str = None):
+
+        path = self.path_for(video_id, timestamp, resolution, video_file)
+
+        with get_tracer().span("jpeg_write", video_id = video_id):
+            ok, jpg = cv2.imencode(".jpg", resize_max_side(frame, resolution), [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+
+            if not ok:
+                return None
+
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            tmp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+
+            with open(tmp_path, "wb") as f:
+                f.write(jpg.tobytes())
+
+            os.replace(tmp_path, path)
+
+        with self.lock:
+            self.total_bytes   -= self.entries.pop(path, 0)
+            self.entries[path]  = len(jpg)
+            self.total_bytes   += len(jpg)
+            self.__evict(keep = path)
+
+        return path
+
+    def __evict(self, keep : str):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            path, size = next(iter(self.entries.items()))
+
+            if path == keep:
+                self.entries.move_to_end(path)
+                continue
+
+            del self.entries[path]
+            self.total_bytes -= size
+            self.evictions   += 1
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return {
+                    "entries"     : len(self.entries),
+                    "total_bytes" : self.total_bytes,
+                    "max_bytes"   : self.max_bytes,
+                    "hits"        : self.hits,
+                    "misses"      : self.misses,
+                    "evictions"   : self.evictions
+                   }
+
+def get_thumbnail_cache(cache_dir : str = THUMBNAIL_DIR):
+    with _THUMBNAIL_CACHES_LOCK:
+        cache = _THUMBNAIL_CACHES.get(cache_dir)
+
+        if cache is None:
+            cache                        = ThumbnailCache(cache_dir)
+            _THUMBNAIL_CACHES[cache_dir] = cache
+
+    return cache
@@ -0,0 +1,146 @@
+import json
+import uuid
+import threading
+import numpy       as np
+from   collections import deque
+from   contextlib  import contextmanager
+from   contextvars import ContextVar
+from   time        import (perf_counter,
+                           time)
+
+MAX_SPANS      = 20000
+PERCENTILES    = (50, 95, 99)
+STAGES         = ("translate", "query_encode", "search", "file_lookup", "decode", "clip_score", "jpeg_write")
+
+_REQUEST_ID    = ContextVar("request_id", default = None)
+_TRACER        = None
+_TRACER_LOCK   = threading.Lock()
+
+def current_request_id():
+    return _REQUEST_ID.get()
+
+class Tracer:
+    def __init__(self,
+                 max_spans  : int = MAX_SPANS,
+                 trace_file : str = None):
+
+        self.records    = deque(maxlen = max_spans)
+        self.trace_file = trace_file
+        self.enabled    = True
+        self.lock       = threading.Lock()
+
+    def configure(self,
+                  trace_file : str  = None,
+                  enabled    : bool = None):
+
+        with self.lock:
+            if trace_file is not None:
+                self.trace_file = trace_file or None
+            if enabled is not None:
+                self.enabled = enabled
+        return self
+
+    @contextmanager
+    def request(self, request_id : str = None):
+        request_id = request_id or uuid.uuid4().hex[:12]
+        token      = _REQUEST_ID.set(request_id)
+
+        try:
+            with self.span("request"):
+                yield request_id
+        finally:
+            _REQUEST_ID.reset(token)
+
+    @contextmanager
+    def span(self,
+             name       : str,
+             request_id : str = None,
+             **attrs):
+
+        start = perf_counter()
+
+        try:
+            yield attrs
+        finally:
+            self.record(name, perf_counter() - start, request_id, **attrs)
+
+    def record(self,
+               name       : str,
+               duration   : float,
+               request_id : str = None,
+               **attrs):
+
+        if not self.enabled:
+            return
+
+        span = {
+                "request_id"  : request_id or current_request_id(),
+                "name"        : name,
+                "start"       : time() - duration,
+                "duration_ms" : duration * 1000,
+                "thread"      : threading.current_thread().name,
+                "attrs"       : attrs
+               }
+
+        with self.lock:
+            self.records.append(span)
+
+            if self.trace_file:
+                with open(self.trace_file, "a", encoding = "utf-8") as f:
+                    f.write(json.dumps(span, ensure_ascii = False, default = str) + "\n")
+
+    def spans(self, request_id : str = None):
+        with self.lock:
+            return [span for span in self.records if request_id is None or span["request_id"] == request_id]
+
+    def breakdown(self, request_id : str):
+        stages = {}
+
+        for span in self.spans(request_id):
+            stage              = stages.setdefault(span["name"], {"count": 0, "total_ms": 0.0})
+            stage["count"]    += 1
+            stage["total_ms"] += span["duration_ms"]
+
+        return stages
+
+    def aggregates(self, names : list = None):
+        per_request = {}
+
+        for span in self.spans():
+            if span["request_id"] is not None and (names is None or span["name"] in names):
+                key              = (span["name"], span["request_id"])
+                per_request[key] = per_request.get(key, 0.0) + span["duration_ms"]
+
+        durations = {}
+
+        for (name, _), duration in per_request.items():
+            durations.setdefault(name, []).append(duration)
+
+        return {name: {"count" : len(values),
+                       "mean"  : float(np.mean(values)),
+                       **{f"p{q}": float(np.percentile(values, q)) for q in PERCENTILES}}
+                for name, values in durations.items()}
+
+    def to_jsonl(self, request_id : str = None):
+        return "".join(json.dumps(span, ensure_ascii = False, default = str) + "\n" for span in self.spans(request_id))
+
+    def export_jsonl(self,
+                     path       : str,
+                     request_id : str = None):
+
+        with open(path, "w", encoding = "utf-8") as f:
+            f.write(self.to_jsonl(request_id))
+        return path
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+def get_tracer():
+    global _TRACER
+
+    with _TRACER_LOCK:
+        if _TRACER is None:
+            _TRACER = Tracer()
+
+    return _TRACER
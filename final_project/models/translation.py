@@ -1,9 +1,10 @@
-from   deep_translator import  GoogleTranslator
-from   transformers    import (AutoTokenizer,
-                               AutoModelForCausalLM,
-                               AutoModelForSeq2SeqLM)
-from   time            import  time
-import gc
+from   deep_translator       import  GoogleTranslator
+from   transformers          import (AutoTokenizer,
+                                     AutoModelForCausalLM,
+                                     AutoModelForSeq2SeqLM)
+from   time                  import  time
+from   models.model_registry import  get_model_registry
+from   models.tracing        import  get_tracer
 import torch
 
 KO_EN_MODEL_NAME =  "Helsinki-NLP/opus-mt-ko-en"
@@ -21,6 +22,8 @@ class Translator:
         self.model_name = KO_EN_MODEL_NAME if self.kr2en else EN_KO_MODEL_NAME
         self.model      = None
         self.tokenizer  = None
+        self.model_key  = f"translator:{self.model_name}"
+        self.registry   = get_model_registry()
     
     def __enter__(self):
         self.start_time = time()
@@ -31,29 +34,23 @@ class Translator:
         elapsed_time = time() - self.start_time
         print(f"⏳ [Translator] 전체 실행 시간: {elapsed_time}초")
     
+    def __build_model(self):
+        model_class = AutoModelForSeq2SeqLM if self.kr2en else AutoModelForCausalLM
+        tokenizer   = AutoTokenizer.from_pretrained(self.model_name)
+        model       = model_class.from_pretrained(self.model_name,
+                                                  device_map  = "cuda",
+                                                  torch_dtype = torch.bfloat16)
+        return model, tokenizer
+    
     def __load_model(self):
         if self.model is None or self.tokenizer is None:
-            if self.kr2en:
-                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-                self.model     = AutoModelForSeq2SeqLM.from_pretrained(self.model_name,
-                                                                       device_map  = "cuda",
-                                                                       torch_dtype = torch.bfloat16)            
-            else:
-                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-                self.model     = AutoModelForCausalLM.from_pretrained(self.model_name,
-                                                                      device_map  = "cuda",
-                                                                      torch_dtype = torch.bfloat16)            
-            
+            self.model, self.tokenizer = self.registry.acquire(self.model_key, self.__build_model)
 
     def __unload_model(self):
         if self.model is not None:
-            torch.cuda.synchronize()
-            del self.model
-            del self.tokenizer
             self.model     = None
             self.tokenizer = None
-            gc.collect()
-            torch.cuda.empty_cache()
+            self.registry.release(self.model_key)
     
     def __dl_en2kr_translator(self, response : str):
         self.__load_model()
@@ -106,13 +103,14 @@ class Translator:
     
     def translate(self, 
                   response : str):
-        if self.mode == "API":
-            return self.__api_translator(response = response)
-        elif self.mode == "DL":
-            if self.kr2en:
-                return self.__dl_kr2en_translator(response = response)
+        with get_tracer().span("translate", mode = self.mode, kr2en = self.kr2en):
+            if self.mode == "API":
+                return self.__api_translator(response = response)
+            elif self.mode == "DL":
+                if self.kr2en:
+                    return self.__dl_kr2en_translator(response = response)
+                else:
+                    return self.__dl_en2kr_translator(response = response)
             else:
-                return self.__dl_en2kr_translator(response = response)
-        else:
-            raise ValueError("지원되지 않는 모드입니다. 'API' 혹은 'DL'을 선택하세요")
+                raise ValueError("지원되지 않는 모드입니다. 'API' 혹은 'DL'을 선택하세요")
     
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import threading
+from   time import time
+
+VIDEO_EXTENSIONS = (".mp4",)
+
+_CATALOGS        = {}
+_CATALOGS_LOCK   = threading.Lock()
+
+def video_id_candidates(filename : str):
+    stem       = os.path.splitext(filename)[0]
+    candidates = [stem, stem[-11:], filename[-15:-4]]
+
+    if len(stem) >= 20:
+        candidates.append(stem[-15:-4])
+
+    return list(dict.fromkeys(candidate for candidate in candidates if candidate))
+
+class VideoCatalog:
+    def __init__(self,
+                 video_dirs : list,
+                 extensions : tuple = VIDEO_EXTENSIONS):
+
+        self.video_dirs = [video_dir for video_dir in video_dirs if video_dir]
+        self.extensions = extensions
+        self.dir_mtimes = {}
+        self.dir_files  = {}
+        self.dir_index  = {}
+        self.warned     = set()
+        self.lock       = threading.Lock()
+
+    def __scan(self, video_dir : str):
+        start_time = time()
+        files      = sorted(name for name in os.listdir(video_dir) if name.lower().endswith(self.extensions))
+        index      = {}
+
+        for name in files:
+            for video_id in video_id_candidates(name):
+                index.setdefault(video_id, []).append(os.path.join(video_dir, name))
+
+        self.dir_files[video_dir] = files
+        self.dir_index[video_dir] = index
+        print(f"🗂️ [VideoCatalog] {video_dir} 인덱싱 완료: 영상 {len(files)}개 ({time() - start_time:.3f}초)")
+
+    def refresh(self):
+        with self.lock:
+            for video_dir in self.video_dirs:
+                try:
+                    mtime = os.stat(video_dir).st_mtime
+                except FileNotFoundError:
+                    self.dir_mtimes.pop(video_dir, None)
+                    self.dir_files[video_dir] = []
+                    self.dir_index[video_dir] = {}
+                    continue
+
+                if self.dir_mtimes.get(video_dir) != mtime:
+                    self.__scan(video_dir)
+                    self.dir_mtimes[video_dir] = mtime
+        return self
+
+    def __substring_matches(self, video_dir : str, video_id : str):
+        return [os.path.join(video_dir, name) for name in self.dir_files.get(video_dir, []) if video_id in name]
+
+    def resolve(self, video_id : str):
+        self.refresh()
+
+        for video_dir in self.video_dirs:
+            matches = self.dir_index.get(video_dir, {}).get(video_id) or self.__substring_matches(video_dir, video_id)
+
+            if not matches:
+                continue
+
+            if len(matches) > 1 and (video_dir, video_id) not in self.warned:
+                self.warned.add((video_dir, video_id))
+                print(f"⚠️ [VideoCatalog] Movie ID '{video_id}'에 해당하는 영상이 {len(matches)}개 있습니다: "
+                      f"{[os.path.basename(match) for match in matches]} -> {os.path.basename(matches[0])} 사용")
+
+            return matches[0]
+
+        return None
+
+def get_video_catalog(video_dirs : list):
+    key = tuple(video_dirs)
+
+    with _CATALOGS_LOCK:
+        catalog = _CATALOGS.get(key)
+
+        if catalog is None:
+            catalog        = VideoCatalog(list(video_dirs))
+            _CATALOGS[key] = catalog
+
+    return catalog
@@ -1,18 +1,36 @@
-import subprocess
-import re
+import os
+import queue
+import threading
 import torch
-from   decord             import (VideoReader, 
-                                  cpu)
-import numpy              as      np
-from   concurrent.futures import  ThreadPoolExecutor
-from   time               import  time
+from   decord               import (VideoReader, 
+                                    cpu)
+import numpy                as      np
+from   time                 import  time
+from   models.decode_pool   import  shot_frame_indices
+from   models.shot_detector import (SHOT_BACKENDS,
+                                    ShotDetector,
+                                    ffmpeg_shot_boundaries)
+
+IMAGENET_MEAN      = [0.485, 0.456, 0.406]
+IMAGENET_STD       = [0.229, 0.224, 0.225]
+INPUT_SIZE         = 448
+SHOT_QUEUE_DEPTH   = 16
 
 class VideoProcessor:
     def __init__(self,
                  num_seg        = 8,
-                 shot_threshold = 0.3):
+                 shot_threshold = 0.3,
+                 num_workers    = None,
+                 shot_backend   = "ffmpeg"):
+        
+        if shot_backend not in SHOT_BACKENDS:
+            raise ValueError(f"지원되지 않는 쇼트 검출 백엔드입니다: {shot_backend} ({', '.join(SHOT_BACKENDS)} 중 선택하세요)")
+        
         self.num_seg        = num_seg
         self.shot_threshold = shot_threshold
+        self.num_workers    = num_workers or os.cpu_count() or 1
+        self.shot_backend   = shot_backend
+        self.shot_detector  = ShotDetector(shot_threshold, num_seg = num_seg, keep_size = INPUT_SIZE)
         
     def __enter__(self):
         self.start_time = time()
@@ -23,114 +41,124 @@ class VideoProcessor:
         elapsed_time = time() - self.start_time
         print(f"⏳ [VideoProcessor] 전체 실행 시간: {elapsed_time}초")
     
-    def __get_video_duration(self, video_path: str):
-        cmd = [
-            "ffprobe",
-            "-v", "error",
-            "-select_streams", "v:0",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            video_path
-        ]
-        
-        result = subprocess.run(cmd, 
-                                stdout = subprocess.PIPE, 
-                                stderr = subprocess.PIPE, 
-                                text   = True)
-        try:
-            return float(result.stdout.strip())
-        except ValueError:
-            return None
-    
     def __get_shot_boundaries(self, video_path : str):
         print(f"📸 [시작] 쇼트 추출 중: {video_path}")
         
-        cmd            = [
-                          "ffmpeg",
-                          "-nostdin",
-                          "-i", video_path,
-                          "-filter_complex", f"select='gt(scene,{self.shot_threshold})', showinfo",
-                          "-f", "null", "-"
-                         ]
+        if self.shot_backend == "ffmpeg":
+            times = ffmpeg_shot_boundaries(video_path, self.shot_threshold)
+        else:
+            times = self.shot_detector.detect(video_path, keep_frames = False)[0]
+            
+        print(f"✅ [완료] 쇼트 추출 완료: {video_path} (총 {len(times)}개 쇼트)")
+        return times
+    
+    def __preprocess(self, 
+                     frames : np.ndarray, 
+                     device : str = "cuda"):
         
-        proc           = subprocess.run(cmd,
-                                     stderr = subprocess.PIPE,
-                                     stdout = subprocess.PIPE)
+        frames = torch.from_numpy(frames).to(device).to(torch.float32).div(255.0)
+        frames = frames.permute(0, 3, 1, 2)
+        frames = torch.nn.functional.interpolate(frames, size=(INPUT_SIZE, INPUT_SIZE), mode='bicubic', align_corners=False)
+
+        mean   = torch.tensor(IMAGENET_MEAN, device=frames.device).view(1, 3, 1, 1)
+        std    = torch.tensor(IMAGENET_STD, device=frames.device).view(1, 3, 1, 1)
+        return (frames - mean) / std
+    
+    def __iter_video_shots(self, 
+                           video_idx   : int, 
+                           video_path  : str, 
+                           num_threads : int = 1):
         
-        stderr_output  = proc.stderr.decode("utf-8")
+        if self.shot_backend == "numpy":
+            shots = (((start_time, end_time), shot_frames) for start_time, end_time, shot_frames in self.shot_detector.iter_shots(video_path))
+        else:
+            shot_times = self.__get_shot_boundaries(video_path)
+            vr         = VideoReader(video_path, ctx=cpu(0), num_threads=num_threads)
+            shots      = ((shot_time, vr.get_batch(indices).asnumpy()) 
+                          for indices, shot_time in shot_frame_indices(shot_times, vr.get_avg_fps(), len(vr), self.num_seg))
         
-        pattern        = re.compile(r"pts_time:(\d+\.\d+)")
-        times          = [float(match.group(1)) for match in pattern.finditer(stderr_output)]
+        pin       = torch.cuda.is_available()
+        num_shots = 0
+        duration  = 0.0
         
-        video_duration = self.__get_video_duration(video_path)
+        for shot_idx, (shot_time, shot_frames) in enumerate(shots):
+            frames     = self.__preprocess(shot_frames, device = "cpu").to(torch.bfloat16)
+            num_shots += 1
+            duration   = shot_time[1]
+            yield "shot", video_idx, shot_idx, frames.pin_memory() if pin else frames, shot_time
         
-        if video_duration is None:
-            raise ValueError(f"🚨 비디오 길이를 가져올 수 없습니다: {video_path}")
+        yield "done", video_idx, duration, num_shots
+    
+    @staticmethod
+    def __put(shot_queue : queue.Queue, 
+              item, 
+              stop_event : threading.Event):
         
-        if times and times[0] != 0.0:
-            times = [0.0] + times
-            
-        if not times or times[-1] < video_duration:
-            times.append(video_duration)
-            
-        print(f"✅ [완료] 쇼트 추출 완료: {video_path} (총 {len(times)}개 쇼트)")
-        return times
+        while not stop_event.is_set():
+            try:
+                shot_queue.put(item, timeout = 0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
     
-    def __extract_frames_decord(self, video_path: str, shot_times: list):
-        print(f"📸 [시작] 프레임 추출 중: {video_path}")
-        try:
-            vr = VideoReader(video_path, ctx=cpu(0), num_threads=1)
-        except Exception as e:
-            print(f"🚨 [에러] 비디오 파일을 열 수 없습니다: {video_path}")
-            print(f"🔹 [에러 내용] {e}")
-            return None, None, None
-
-        total_frames   = len(vr)
-        fps            = vr.get_avg_fps()
-        total_duration = total_frames / fps 
-
-        shot_frames    = []
-        timestamps     = []
-
-        for i in range(len(shot_times) - 1):
-            start_time = shot_times[i]
-            end_time   = shot_times[i + 1]
-
-            start_shot = int(start_time * fps)
-            end_shot   = int(end_time * fps)
-
-            start_shot = min(start_shot, total_frames - 1)
-            end_shot   = min(end_shot, total_frames - 1)
-
-            indices    = np.linspace(start_shot, end_shot, self.num_seg).astype(int)
-            indices    = np.clip(indices, 0, total_frames - 1) 
+    def __stream_worker(self, 
+                        video_paths : list, 
+                        video_queue : queue.Queue, 
+                        shot_queue  : queue.Queue, 
+                        stop_event  : threading.Event, 
+                        num_threads : int):
+        
+        while not stop_event.is_set():
+            try:
+                video_idx = video_queue.get_nowait()
+            except queue.Empty:
+                break
             
-            frames     = vr.get_batch(indices).asnumpy()
-            frames     = torch.from_numpy(frames).to(torch.float32).div(255.0).cuda()
-            frames     = frames.permute(0, 3, 1, 2)
-            frames     = torch.nn.functional.interpolate(frames, size=(448, 448), mode='bicubic', align_corners=False)
-
-            mean       = torch.tensor([0.485, 0.456, 0.406], device=frames.device).view(1, 3, 1, 1)
-            std        = torch.tensor([0.229, 0.224, 0.225], device=frames.device).view(1, 3, 1, 1)
-            frames     = (frames - mean) / std
-
-            shot_frames.append(frames)
-            timestamps.append((start_time, end_time))
-
-        print(f"✅ [완료] 프레임 추출 완료: {video_path} (총 {len(shot_frames)}개 프레임)")
-        return shot_frames, timestamps, total_duration
+            try:
+                for item in self.__iter_video_shots(video_idx, video_paths[video_idx], num_threads):
+                    if not self.__put(shot_queue, item, stop_event):
+                        return
+            except Exception as e:
+                if not self.__put(shot_queue, ("error", video_idx, e), stop_event):
+                    return
+        
+        self.__put(shot_queue, None, stop_event)
     
-    def process_videos(self, video_paths : list):
-        with ThreadPoolExecutor() as executor:
-            shot_times_list = list(executor.map(self.__get_shot_boundaries, video_paths))
+    def stream_shots(self, 
+                     video_paths : list, 
+                     num_workers : int = None, 
+                     queue_depth : int = SHOT_QUEUE_DEPTH):
+        
+        video_queue = queue.Queue()
+        shot_queue  = queue.Queue(maxsize = max(1, queue_depth))
+        stop_event  = threading.Event()
+        num_workers = max(1, min(num_workers or self.num_workers, len(video_paths)))
+        num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+        
+        for video_idx in range(len(video_paths)):
+            video_queue.put(video_idx)
+        
+        workers     = [threading.Thread(target = self.__stream_worker, 
+                                        args   = (video_paths, video_queue, shot_queue, stop_event, num_threads), 
+                                        daemon = True) for _ in range(num_workers)]
+        
+        for worker in workers:
+            worker.start()
+        
+        try:
+            finished = 0
             
-        shot_frames_list = []
-        durations = []
-        
-        with ThreadPoolExecutor() as executor:
-            for video_path, shot_times in zip(video_paths, shot_times_list):
-                shot_frames, timestamps, duration = self.__extract_frames_decord(video_path, shot_times)
-                shot_frames_list.append((shot_frames, timestamps))
-                durations.append(duration)
+            while finished < num_workers:
+                item = shot_queue.get()
                 
-        return shot_frames_list, shot_times_list, durations
\ No newline at end of file
+                if item is None:
+                    finished += 1
+                    continue
+                
+                yield item
+        finally:
+            stop_event.set()
+            
+            for worker in workers:
+                worker.join()
@@ -1,13 +1,46 @@
-import streamlit            as     st
-from   models.translation   import Translator
-from   models.frame_extract import FrameExtractor 
+import streamlit             as     st
+from   models.translation    import Translator
+from   models.frame_extract  import FrameExtractor 
+from   models.frame_index    import FRAME_INDEX_DIR
+from   models.query_cache    import get_query_cache
+from   models.model_registry import get_model_registry
+from   models.tracing        import (STAGES,
+                                     get_tracer)
 
 VIDEO_DIR          = "/data/ephemeral/home/videos_movieclips"
 NPZ_FILE           = "/data/ephemeral/home/movie_clip_AnglE_UAE_Large_V1_features.npz"
 OUTPUT_DIR         = "/data/ephemeral/home/extracted_frames"
 VIDEO_STORAGE_PATH = "/data/ephemeral/home/videos"
+QUERY_CACHE_DB     = "/data/ephemeral/home/query_cache.sqlite"
 
 class Text2FramePage:
+    def __show_trace(self, request_id : str):
+        tracer    = get_tracer()
+        breakdown = tracer.breakdown(request_id)
+        
+        if not breakdown:
+            return
+        
+        total      = breakdown.get("request", {"total_ms": 0.0})["total_ms"]
+        aggregates = tracer.aggregates()
+        names      = [name for name in STAGES if name in breakdown] + [name for name in breakdown if name not in STAGES and name != "request"]
+        
+        with st.expander(f"🐞 디버그: 단계별 지연 시간 (요청 {request_id}, 전체 {total:.0f}ms)"):
+            st.table([{
+                       "단계"     : name,
+                       "횟수"     : breakdown[name]["count"],
+                       "시간 (ms)" : round(breakdown[name]["total_ms"], 1),
+                       "비중 (%)"  : round(100 * breakdown[name]["total_ms"] / total, 1) if total else None,
+                       "p50 (ms)" : round(aggregates[name]["p50"], 1),
+                       "p95 (ms)" : round(aggregates[name]["p95"], 1),
+                       "p99 (ms)" : round(aggregates[name]["p99"], 1)
+                      } for name in names + ["request"] if name in breakdown])
+            st.caption(f"p50/p95/p99는 최근 요청 {aggregates.get('request', {}).get('count', 0)}개 기준입니다.")
+            st.download_button("📥 span JSON lines 다운로드", 
+                               tracer.to_jsonl(request_id), 
+                               file_name = f"trace_{request_id}.jsonl", 
+                               mime      = "application/json")
+    
     def run(self):
         st.title("🔎 Text-2-Frame")
         st.write("찾고 싶은 영상의 설명을 입력하고, '프레임 추출 시작' 버튼을 눌러주세요")
@@ -20,20 +53,54 @@ class Text2FramePage:
         if st.button("⏳ 프레임 추출 시작"):
             status_text = st.empty()
             
-            with Translator(kr2en = True, mode  = mode) as t:
-                translated_text = t.translate(input_text)
-            print(translated_text)
+            with get_tracer().request() as request_id:
+                frame_extractor = FrameExtractor(video_dir1        = VIDEO_DIR,
+                                                 video_dir2        = VIDEO_STORAGE_PATH,
+                                                 npz_file          = NPZ_FILE,
+                                                 output_dir        = OUTPUT_DIR,
+                                                 top_k             = 5,
+                                                 sampling_interval = 500,
+                                                 frame_index_dir   = FRAME_INDEX_DIR)
+            
+                query_cache     = get_query_cache(QUERY_CACHE_DB)
+                model_id        = f"{mode}|{frame_extractor.query_encoder.model_name}"
+                cached          = query_cache.get(input_text, model_id)
+            
+                if cached is not None:
+                    translated_text, query_embedding = cached
+                else:
+                    with Translator(kr2en = True, mode  = mode) as t:
+                        translated_text = t.translate(input_text)
+                    
+                    query_embedding = frame_extractor.query_encoder.encode([translated_text])[0]
+                    query_cache.put(input_text, model_id, translated_text, query_embedding)
+                print(translated_text)
             
-            frame_extractor = FrameExtractor(video_dir1        = VIDEO_DIR,
-                                             video_dir2        = VIDEO_STORAGE_PATH,
-                                             npz_file          = NPZ_FILE,
-                                             output_dir        = OUTPUT_DIR,
-                                             top_k             = 5,
-                                             sampling_interval = 500)
+                status_text.text("🔍 프레임 추출 중...")
+                final_results = frame_extractor.extract_frames(translated_text,
+                                                               query_embedding = query_embedding)
             
-            status_text.text("🔍 프레임 추출 중...")
-            final_results = frame_extractor.extract_frames(translated_text)
+            st.session_state.last_request_id = request_id
             status_text.text("✅ 추천 장면 추출 완료!")
+            
+            encoder_stats = frame_extractor.query_encoder.stats()
+            cache_stats   = query_cache.stats()
+            model_stats   = get_model_registry().stats()
+            thumb_stats   = frame_extractor.thumbnails.stats()
+            
+            if cached is not None:
+                st.caption("⚡ 쿼리 캐시 적중: 번역과 쿼리 인코딩을 건너뛰었습니다.")
+            else:
+                st.caption(f"⏱️ 쿼리 인코더 로드: {encoder_stats['load_time']:.2f}초 (프로세스당 1회) / "
+                           f"쿼리 인코딩: {encoder_stats['last_encode_time']:.3f}초")
+            st.caption(f"🗃️ 쿼리 캐시: {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+                       f"({cache_stats['entries']}개 저장)")
+            st.caption(f"📦 상주 모델: {model_stats['resident_bytes'] / 2**30:.2f}GB / "
+                       f"{model_stats['memory_budget_bytes'] / 2**30:.0f}GB, "
+                       f"로드 {sum(model['load_count'] for model in model_stats['models'].values())}회 / "
+                       f"언로드 {model_stats['evict_count']}회")
+            st.caption(f"🖼️ 썸네일 캐시: {thumb_stats['hits']} hit / {thumb_stats['misses']} miss "
+                       f"({thumb_stats['entries']}개, {thumb_stats['total_bytes'] / 2**20:.1f}MB)")
             st.success("🎉 프레임 추출이 완료되었습니다!")
         
             if final_results:
@@ -47,4 +114,6 @@ class Text2FramePage:
                     st.markdown("---")
             else:
                 st.write("추출된 결과가 없습니다.")
-            
+        
+        if "last_request_id" in st.session_state:
+            self.__show_trace(st.session_state.last_request_id)
@@ -3,6 +3,7 @@ import time
 import streamlit            as     st
 from   models.analyze       import AnalyzeVideo
 from   models.add_embedding import EmbeddingProcessor
+from   models.frame_index   import get_frame_index
 
 VIDEO_STORAGE_PATH = "/data/ephemeral/home/videos"
 
@@ -60,14 +61,20 @@ class VideoPreprocessingPage:
                 status_text.text("추론 중... 잠시만 기다려 주세요!")
                 
                 with AnalyzeVideo(use_audio  = False, num_seg    = 3, batch_size = 11) as av:
-                    for idx, video_path in enumerate(video_paths):
-                        status_text.text(f"📊 분석 진행 중: {idx+1}/{len(video_paths)} - {original_filenames[video_path]}")
-                        
-                        av.fast_batch_analyze(video_paths = [video_path],
-                                              output_path = "/data/ephemeral/home/json_output")
+                    status_text.text(f"📊 분석 진행 중: {len(video_paths)}개 비디오 - {', '.join(original_filenames[video_path] for video_path in video_paths)}")
+
+                    av.fast_batch_analyze(video_paths = video_paths,
+                                          output_path = "/data/ephemeral/home/json_output")
                         
                 status_text.text("✅ 모든 비디오가 처리되었습니다!")
                 
+                status_text.text("🖼️ CLIP 프레임 인덱스 생성 중")
+                get_frame_index().build(video_paths,
+                                        video_ids         = [os.path.splitext(original_filenames[video_path])[0] for video_path in video_paths],
+                                        sampling_interval = 500,
+                                        overwrite         = True)
+                status_text.text("✅ CLIP 프레임 인덱스 생성 완료")
+                
                 status_text.text("📜 NPZ 파일 병합 시작")
                 embedding = EmbeddingProcessor(existing_npz_path = "/data/ephemeral/home/movie_clip_AnglE_UAE_Large_V1_features.npz", 
                                                json_folder       = "/data/ephemeral/home/json_output", 
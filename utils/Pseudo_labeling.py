@@ -9,14 +9,15 @@ import shutil
 import logging
 import warnings
 import argparse
-import torchvision.transforms as T
 from   tqdm                              import tqdm
-from   PIL                               import Image
 from   decord                            import VideoReader, cpu
 from   scenedetect                       import VideoManager, SceneManager
 from   scenedetect.detectors             import ContentDetector
 from   transformers                      import AutoTokenizer, AutoModel
-from   torchvision.transforms.functional import InterpolationMode
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final_project"))
+
+from   models.range_sampler              import RangeSampler
 
 logging.basicConfig(
     level    = logging.INFO,
@@ -24,9 +25,6 @@ logging.basicConfig(
     handlers = [logging.StreamHandler(sys.stdout)]
 )
 
-IMAGENET_MEAN = (0.485, 0.456, 0.406)
-IMAGENET_STD  = (0.229, 0.224, 0.225)
-
 def parse_args():
     parser = argparse.ArgumentParser(description="Pseudo Labeling & Outlier Re-Inference Script")
 
@@ -165,64 +163,20 @@ def detect_scenes(video_path,
         logging.error(f"Error detecting scenes: {e}")
         return [], 0.0
 
-def build_transform(input_size = 448):
-    return T.Compose([
-        T.Lambda(lambda img: img.convert('RGB') if img.mode != 'RGB' else img),
-        T.Resize((input_size, input_size), interpolation=InterpolationMode.BICUBIC),
-        T.ToTensor(),
-
-        T.Normalize(mean = IMAGENET_MEAN, std = IMAGENET_STD),
-        T.ConvertImageDtype(torch.bfloat16)
-    ])
-
-def get_index(start_sec, 
-              end_sec, 
-              fps, 
-              num_segments = 8):
-    
-    start_frame = int(start_sec * fps)
-    end_frame   = int(end_sec * fps)
-    seg_size    = float(end_frame - start_frame) / num_segments
-    indices     = [
-        int(start_frame + (seg_size / 2) + round(seg_size * idx))
-        for idx in range(num_segments)
-    ]
-    return indices
-
 def load_frames(video_path, 
-                start_sec, 
-                end_sec, 
-                fps, 
-                num_segments = 8, 
-                input_size   = 448):
+                scenes, 
+                sampler, 
+                num_segments = 8):
     try:
-        vr                = VideoReader(video_path, 
-                                        ctx         = cpu(0),
-                                        num_threads = 1)
-        transform         = build_transform(input_size)
-        frame_indices     = get_index(start_sec, 
-                                      end_sec, 
-                                      fps, 
-                                      num_segments)
-
-        pixel_values_list = []
-
-        for idx in frame_indices:
-            if idx < 0 or idx >= len(vr):
-                continue
-
-            frame = Image.fromarray(vr[idx].asnumpy())
-            frame = transform(frame)
-            pixel_values_list.append(frame)
-
-        if not pixel_values_list:
-            return None
-        
-        return torch.stack(pixel_values_list, dim=0)
+        frames_list, _, _, _ = sampler.sample(video_path, 
+                                              [(start_sec, end_sec, num_segments) for start_sec, end_sec in scenes],
+                                              mode = "stride")
+
+        return [frames if len(frames) else None for frames in frames_list]
     
     except Exception as e:
         logging.error(f"Error loading frames: {e}")
-        return None
+        return [None] * len(scenes)
 
 def load_model(model_path="/data/ephemeral/home/lora_weight/checkpoint-2456"):
     base_model    = "OpenGVLab/InternVL2_5-1B-MPO"
@@ -365,10 +319,8 @@ def pseudo_label_video(
     scenes, total_duration = detect_scenes(video_path,
                                            threshold=pyscene_threshold,
                                            exclude_last_seconds=exclude_last_seconds)
-    vr                     = VideoReader(video_path, 
-                                         ctx         = cpu(0), 
-                                         num_threads = 1)
-    fps                    = float(vr.get_avg_fps())
+    sampler                = RangeSampler(input_size = input_size, 
+                                          dtype      = torch.bfloat16)
 
     captions               = [None] * len(scenes)
 
@@ -379,16 +331,14 @@ def pseudo_label_video(
         valid_indices      = []       
 
         batch_slice        = list(enumerate(scenes[batch_start:batch_start + batch_size], start=batch_start))
+        batch_frames       = load_frames(
+            video_path, 
+            [scene for _, scene in batch_slice],
+            sampler, 
+            num_segments = num_segments
+        )
 
-        for idx, (start_sec, end_sec) in batch_slice:
-            pixel_values = load_frames(
-                video_path, 
-                start_sec, 
-                end_sec,
-                fps, 
-                num_segments = num_segments, 
-                input_size   = input_size
-            )
+        for (idx, _), pixel_values in zip(batch_slice, batch_frames):
             if pixel_values is None:
                 captions.append("")
             else: